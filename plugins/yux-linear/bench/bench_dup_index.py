@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Duplicate index benchmark: build time, lookup latency and recall.
+
+Builds a synthetic backlog of English and Chinese issue titles and
+descriptions in a throwaway mirror, then looks up inbox items that are
+reworded copies of backlog issues (words dropped, reordered, a suffix
+changed, a phrase appended) plus unrelated ones. Reports the full build
+time, the incremental update time per issue, the lookup p50/p95, how many
+planted duplicates were found at the threshold (recall), and how many
+unrelated items matched anything (false alarms). The linear scan over all
+signatures is timed alongside for comparison.
+
+Usage:
+  python3 bench/bench_dup_index.py [--sizes 1000,5000] [--inbox 200] [--seed 0]
+                                   [--threshold 0.5] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(os.path.dirname(BENCH_DIR), 'scripts')
+
+sys.path.insert(0, SCRIPTS_DIR)
+from _dup_index import signatures, similarity
+from _issue_mirror import IssueMirror
+
+EN_WORDS = """
+    login logout session token refresh retry timeout crash error fails broken page
+    button modal dialog settings profile avatar upload download export import csv pdf
+    search filter sort pagination cache offline sync notification email push badge
+    dark mode theme layout mobile ios android desktop safari chrome slow memory leak
+    api webhook payment invoice billing subscription plan team invite role permission
+""".split()
+ZH_WORDS = """
+    登录 退出 会话 令牌 刷新 重试 超时 崩溃 错误 失败 页面 按钮 弹窗 设置 头像 上传 下载
+    导出 导入 搜索 筛选 排序 分页 缓存 离线 同步 通知 邮件 推送 暗黑 模式 主题 布局 手机
+    内存 泄漏 支付 发票 账单 订阅 团队 邀请 角色 权限
+""".split()
+EN_SYLLABLES = 'ba co de fi go ka lu me no pi ra si tu ve wo xa yo ze'.split()
+ZH_CHARS = '的一是在不了有和人这中大为上个国我以要他时来用们生到作地于出就分对成会可主发年动同工也能下过子说产种面而方后多定行学法所民得经'
+
+
+def vocabulary(base: list[str], extra: list[str]) -> tuple[list[str], list[float]]:
+    """Base words plus generated ones, with Zipf weights (frequent words first)."""
+    words = base + [w for w in extra if w not in base]
+    return words, [1 / (rank + 1) for rank in range(len(words))]
+
+
+EN_VOCAB = vocabulary(EN_WORDS, [a + b + c for a in EN_SYLLABLES for b in EN_SYLLABLES
+                                 for c in EN_SYLLABLES[:6]])
+ZH_VOCAB = vocabulary(ZH_WORDS, [a + b for a in ZH_CHARS for b in ZH_CHARS[:30]])
+
+
+def synthetic_issue(i: int, rng: random.Random) -> dict:
+    chinese = rng.random() < 0.3
+    words, weights = ZH_VOCAB if chinese else EN_VOCAB
+    title_words = list(dict.fromkeys(rng.choices(words, weights, k=rng.randint(4, 7))))
+    body_words = rng.choices(words, weights, k=rng.randint(8, 20))
+    joiner = '' if chinese else ' '
+    return {
+        "id": f"id-{i}", "identifier": f"LIN-{i + 1}",
+        "title": joiner.join(title_words), "description": joiner.join(body_words),
+        "state": {"name": "Backlog", "type": "backlog"},
+        "updatedAt": f"2026-01-01T00:00:{i % 60:02d}.{i:06d}Z",
+    }
+
+
+def reword(issue: dict, rng: random.Random) -> dict:
+    """A near-duplicate report of issue: same topic, different wording."""
+    chinese = not issue['title'].isascii()
+    # Every Chinese vocabulary word is two characters long
+    words = ([issue['title'][k:k + 2] for k in range(0, len(issue['title']), 2)] if chinese
+             else issue['title'].split())
+    if len(words) > 4 and rng.random() < 0.5:
+        words.pop(rng.randrange(len(words)))
+    if rng.random() < 0.5:
+        k = rng.randrange(len(words) - 1)
+        words[k], words[k + 1] = words[k + 1], words[k]
+    if not chinese and rng.random() < 0.5:
+        k = rng.randrange(len(words))
+        words[k] += 's'
+    title = ('' if chinese else ' ').join(words)
+    title += rng.choice(['', ' again', ' 问题', ' on prod'])
+    return {"identifier": "NEW", "title": title, "description": issue['description']}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(pct / 100 * len(values)))] if values else 0.0
+
+
+def run_case(size: int, inbox: int, threshold: float, seed: int) -> dict:
+    rng = random.Random(seed * 7919 + size)
+    issues = [synthetic_issue(i, rng) for i in range(size)]
+    with tempfile.TemporaryDirectory() as tmp:
+        mirror = IssueMirror(os.path.join(tmp, 'mirror.db'))
+        start = time.perf_counter()
+        mirror.upsert(issues)
+        upsert_s = time.perf_counter() - start
+        start = time.perf_counter()
+        mirror.rebuild_dups()
+        build_s = time.perf_counter() - start
+
+        planted = [(reword(issue, rng), issue['identifier'])
+                   for issue in rng.sample(issues, inbox // 2)]
+        unrelated = [(synthetic_issue(size + k, rng), None) for k in range(inbox - len(planted))]
+        found = alarms = 0
+        lookups = []
+        for item, original in planted + unrelated:
+            begin = time.perf_counter()
+            matches = mirror.dups.similar_to(item, threshold=threshold, limit=3)
+            lookups.append((time.perf_counter() - begin) * 1000)
+            if original is None:
+                alarms += bool(matches)
+            else:
+                found += any(m['key'] == original for m in matches)
+
+        # Baseline: score every stored signature for one item
+        sigs = [array('I', blob) for (blob,) in mirror.conn.execute('SELECT sig FROM dup_sigs')]
+        probe = signatures(planted[0][0]['title'], planted[0][0]['description'])[0]
+        begin = time.perf_counter()
+        for sig in sigs:
+            similarity(probe, sig)
+        scan_ms = (time.perf_counter() - begin) * 1000
+        mirror.close()
+
+    return {
+        "issues": size, "inbox": inbox,
+        "upsert_ms_per_issue": round(upsert_s * 1000 / size, 3),
+        "rebuild_ms": round(build_s * 1000, 1),
+        "lookup_p50_ms": round(percentile(lookups, 50), 3),
+        "lookup_p95_ms": round(percentile(lookups, 95), 3),
+        "scan_ms": round(scan_ms, 2),
+        "recall": round(found / max(1, len(planted)), 3),
+        "false_alarms": alarms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Duplicate index build/lookup benchmark")
+    parser.add_argument('--sizes', default='1000,5000')
+    parser.add_argument('--inbox', type=int, default=200)
+    parser.add_argument('--threshold', type=float, default=0.5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write results as JSON")
+    args = parser.parse_args()
+
+    rows = []
+    print(f"{'issues':>7s} {'upsert/issue':>12s} {'rebuild':>9s} {'p50':>7s} {'p95':>7s} "
+          f"{'scan':>8s} {'recall':>7s} {'alarms':>6s}")
+    for size in map(int, args.sizes.split(',')):
+        row = run_case(size, args.inbox, args.threshold, args.seed)
+        rows.append(row)
+        print(f"{size:>7d} {row['upsert_ms_per_issue']:>10.3f}ms {row['rebuild_ms']:>7.0f}ms "
+              f"{row['lookup_p50_ms']:>5.2f}ms {row['lookup_p95_ms']:>5.2f}ms "
+              f"{row['scan_ms']:>6.1f}ms {row['recall']:>7.1%} {row['false_alarms']:>6d}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"threshold": args.threshold, "rows": rows}, f, indent=2)
+            f.write('\n')
+
+
+if __name__ == "__main__":
+    main()
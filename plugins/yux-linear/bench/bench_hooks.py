@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Hook latency benchmark: replay recorded payloads through every hook.
+
+Each payload in bench/corpus/ is replayed against synthetic repositories
+through the standalone hook scripts registered for its event and through
+the hooks.json entry point (`python3 -I -S scripts/hook_entry.py <Event>`).
+Per (repo, payload, hook) it reports p50/p95/p99 wall time, git forks per
+run (counted through a `git` shim on PATH) and peak RSS of the hook process.
+
+Synthetic repos:
+  plain         Linear project on a LIN branch in the main checkout
+  worktree      same, but the hook runs inside .claude/worktrees/<name>
+  huge-registry linear-tasks.json with --registry-size tasks, no config file
+  non-linear    plain git repo on main, no Linear files
+
+Usage:
+  python3 bench/bench_hooks.py [--runs N] [--output results.json]
+                               [--compare baseline.json] [--max-regression 0.2]
+                               [--repos plain,worktree] [--payloads pre_tool_use_write]
+                               [--large-mb N] [--daemon]
+
+A corpus case may also carry `files` (written into the directory the hook
+runs in, which then becomes the payload's cwd), `subdir` (run the hook
+from this subdirectory of it instead) and `expect_exit` (exit code of the
+hooks.json entry point in a Linear repo; 0 is expected elsewhere). A case
+that exits otherwise is reported and fails the run.
+
+--compare prints per-row p95 deltas against a previous results file and
+exits 1 if any row regressed by more than --max-regression.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PLUGIN_DIR = os.path.dirname(BENCH_DIR)
+SCRIPTS_DIR = os.path.join(PLUGIN_DIR, 'scripts')
+CORPUS_DIR = os.path.join(BENCH_DIR, 'corpus')
+
+sys.path.insert(0, SCRIPTS_DIR)
+from linear_hook import CHECKS
+
+REPO_KINDS = ['plain', 'worktree', 'huge-registry', 'non-linear']
+ENTRY_HOOK = 'hook_entry'
+
+GIT_ENV = {
+    'GIT_AUTHOR_NAME': 'bench', 'GIT_AUTHOR_EMAIL': 'bench@example.com',
+    'GIT_COMMITTER_NAME': 'bench', 'GIT_COMMITTER_EMAIL': 'bench@example.com',
+}
+
+
+def git(cwd: str, *args: str) -> None:
+    subprocess.run(['git', *args], cwd=cwd, check=True, capture_output=True,
+                   env={**os.environ, **GIT_ENV})
+
+
+def write_json(path: str, data: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def make_registry(size: int) -> dict:
+    """A linear-tasks.json with `size` tasks."""
+    now = '2026-01-01T00:00:00Z'
+    tasks = {}
+    for i in range(1, size + 1):
+        issue_id = f'LIN-{i}'
+        tasks[issue_id] = {
+            'issue_id': issue_id,
+            'issue_uuid': f'00000000-0000-4000-8000-{i:012d}',
+            'title': f'Synthetic task {i}',
+            'branch': f'feat/{issue_id}-synthetic-task',
+            'status': 'in_progress',
+            'linear_status': 'In Progress',
+            'pr_number': i if i % 3 == 0 else None,
+            'started_at': now,
+            'last_active_at': now,
+        }
+    return {'version': 1, 'active_task': 'LIN-1', 'tasks': tasks}
+
+
+def make_repo(base: str, kind: str, commits: int, registry_size: int) -> str:
+    """Create one synthetic repo; returns the directory hooks run in."""
+    root = os.path.join(base, kind)
+    os.makedirs(root)
+    git(root, 'init', '-q', '-b', 'main')
+    git(root, 'commit', '-q', '--allow-empty', '-m', 'chore: init')
+    if kind == 'non-linear':
+        return root
+
+    config = {'version': '1.0.0', 'team': {'id': 't', 'name': 'Bench'},
+              'project': {'id': 'p', 'name': 'Bench'}, 'mode': 'solo'}
+    if kind == 'huge-registry':
+        write_json(os.path.join(root, '.claude', 'linear-tasks.json'), make_registry(registry_size))
+    else:
+        write_json(os.path.join(root, '.claude', 'linear-config.json'), config)
+        write_json(os.path.join(root, '.claude', 'linear-tasks.json'), make_registry(3))
+
+    branch = 'feat/LIN-1-synthetic-task'
+    if kind == 'worktree':
+        path = os.path.join(root, '.claude', 'worktrees', 'feat-LIN-1-synthetic-task')
+        git(root, 'worktree', 'add', '-q', '-b', branch, path)
+    else:
+        git(root, 'checkout', '-q', '-b', branch)
+        path = root
+    for i in range(commits):
+        git(path, 'commit', '-q', '--allow-empty', '-m', f'feat(bench): synthetic change {i}')
+    return path
+
+
+def make_git_shim(base: str) -> tuple[str, str]:
+    """A PATH dir whose `git` logs each invocation, then runs the real git."""
+    real_git = shutil.which('git')
+    shim_dir = os.path.join(base, 'shim')
+    os.makedirs(shim_dir)
+    log = os.path.join(base, 'forks.log')
+    with open(os.path.join(shim_dir, 'git'), 'w') as f:
+        f.write(f'#!/bin/sh\necho git >> "{log}"\nexec "{real_git}" "$@"\n')
+    os.chmod(os.path.join(shim_dir, 'git'), 0o755)
+    return shim_dir, log
+
+
+def load_corpus(names: set[str] | None, large_mb: int) -> dict[str, dict]:
+    """Corpus payloads by name, plus synthetic large ones when requested."""
+    corpus = {}
+    for filename in sorted(os.listdir(CORPUS_DIR)):
+        name, ext = os.path.splitext(filename)
+        if ext == '.json':
+            with open(os.path.join(CORPUS_DIR, filename)) as f:
+                corpus[name] = json.load(f)
+
+    if large_mb:
+        blob = ('x' * 79 + '\n') * (large_mb * 1024 * 1024 // 80)
+        write = json.loads(json.dumps(corpus['pre_tool_use_write']))
+        write['payload']['tool_input']['content'] = blob
+        corpus[f'pre_tool_use_write_{large_mb}mb'] = write
+        build = json.loads(json.dumps(corpus['post_tool_use_pr_create']))
+        build['payload']['tool_output']['stdout'] = blob + build['payload']['tool_output']['stdout']
+        corpus[f'post_tool_use_pr_create_{large_mb}mb'] = build
+
+    if names:
+        corpus = {k: v for k, v in corpus.items() if k in names}
+    return corpus
+
+
+def stage_case(case: dict, cwd: str) -> tuple[dict, str]:
+    """Write a case's files into cwd; returns (payload, directory to run in)."""
+    if not case.get('files'):
+        return case['payload'], cwd
+    for path, text in case['files'].items():
+        with open(os.path.join(cwd, path), 'w') as f:
+            f.write(text)
+    run_cwd = os.path.join(cwd, case.get('subdir', ''))
+    os.makedirs(run_cwd, exist_ok=True)
+    return {**case['payload'], 'cwd': cwd}, run_cwd
+
+
+def hook_command(hook: str, event: str) -> list[str]:
+    if hook == ENTRY_HOOK:
+        return [sys.executable, '-I', '-S', os.path.join(SCRIPTS_DIR, 'hook_entry.py'), event]
+    return [sys.executable, os.path.join(SCRIPTS_DIR, f'{hook}.py')]
+
+
+# Linux carries ru_maxrss across fork+exec, so hooks spawned straight from
+# this (large) process would all report our RSS. A small launcher process
+# spawns them instead and reports each child's own wait4() usage.
+LAUNCHER = r"""
+import json, os, subprocess, sys, time
+for line in sys.stdin:
+    req = json.loads(line)
+    with open(req['stdin']) as stdin:
+        start = time.perf_counter()
+        proc = subprocess.Popen(req['cmd'], cwd=req['cwd'], env=req['env'], stdin=stdin,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        _, status, usage = os.wait4(proc.pid, 0)
+        elapsed = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    print(json.dumps([elapsed, proc.returncode, usage.ru_maxrss]), flush=True)
+"""
+
+
+class Launcher:
+    """Runs hook commands from a small helper process (see LAUNCHER)."""
+
+    def __init__(self):
+        self.proc = subprocess.Popen([sys.executable, '-I', '-S', '-c', LAUNCHER],
+                                     stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+
+    def run(self, cmd: list[str], cwd: str, stdin_path: str, env: dict) -> tuple[float, int, int]:
+        """Run a hook once. Returns (wall seconds, exit code, peak RSS in KB)."""
+        request = {'cmd': cmd, 'cwd': cwd, 'stdin': stdin_path, 'env': env}
+        self.proc.stdin.write(json.dumps(request) + '\n')
+        self.proc.stdin.flush()
+        elapsed, code, rss = json.loads(self.proc.stdout.readline())
+        return elapsed, code, rss
+
+    def close(self) -> None:
+        self.proc.stdin.close()
+        self.proc.wait()
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def count_lines(path: str) -> int:
+    try:
+        with open(path) as f:
+            return sum(1 for _ in f)
+    except FileNotFoundError:
+        return 0
+
+
+def bench(args) -> dict:
+    names = set(args.payloads.split(',')) if args.payloads else None
+    corpus = load_corpus(names, args.large_mb)
+    kinds = args.repos.split(',') if args.repos else REPO_KINDS
+
+    results, failures = [], []
+    launcher = Launcher()
+    with tempfile.TemporaryDirectory() as base:
+        shim_dir, fork_log = make_git_shim(base)
+        stdin_path = os.path.join(base, 'payload.json')
+        env = {**os.environ, 'PATH': shim_dir + os.pathsep + os.environ.get('PATH', '')}
+        env.pop('YUX_LINEAR_HOOK_DAEMON', None)
+
+        for kind in kinds:
+            cwd = make_repo(base, kind, args.commits, args.registry_size)
+            if args.daemon:
+                # Same PATH shim, so git forks made by the daemon are counted too
+                subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, 'linear_daemon.py'), 'start'],
+                               cwd=cwd, env=env, capture_output=True)
+            try:
+                for name, case in corpus.items():
+                    event = case['event']
+                    payload, run_cwd = stage_case(case, cwd)
+                    with open(stdin_path, 'w') as f:
+                        json.dump(payload, f)
+                    hooks = [check.module for check in CHECKS.get(event, [])
+                             if check.entry == 'check'] + [ENTRY_HOOK]
+                    for hook in hooks:
+                        cmd = hook_command(hook, event)
+                        launcher.run(cmd, run_cwd, stdin_path, env)  # warm page cache / __pycache__
+                        open(fork_log, 'w').close()
+
+                        times, codes, rss = [], set(), 0
+                        for _ in range(args.runs):
+                            elapsed, code, peak = launcher.run(cmd, run_cwd, stdin_path, env)
+                            times.append(elapsed * 1000)
+                            codes.add(code)
+                            rss = max(rss, peak)
+                        times.sort()
+                        row = {
+                            'repo': kind,
+                            'payload': name,
+                            'event': event,
+                            'hook': hook + ('+daemon' if args.daemon and hook == ENTRY_HOOK else ''),
+                            'runs': args.runs,
+                            'p50_ms': round(percentile(times, 50), 3),
+                            'p95_ms': round(percentile(times, 95), 3),
+                            'p99_ms': round(percentile(times, 99), 3),
+                            'mean_ms': round(sum(times) / len(times), 3),
+                            'git_forks': round(count_lines(fork_log) / args.runs, 2),
+                            'peak_rss_kb': rss,
+                            'exit_codes': sorted(codes),
+                        }
+                        if hook == ENTRY_HOOK and 'expect_exit' in case:
+                            expected = case['expect_exit'] if kind != 'non-linear' else 0
+                            if codes != {expected}:
+                                failures.append(f"{kind} {name}: exit {sorted(codes)}, expected {expected}")
+                        results.append(row)
+                        print(f"{kind:14s} {name:38s} {row['hook']:22s} "
+                              f"p50 {row['p50_ms']:7.2f}  p95 {row['p95_ms']:7.2f}  "
+                              f"p99 {row['p99_ms']:7.2f} ms  forks {row['git_forks']:4.1f}  "
+                              f"rss {rss / 1024:6.1f} MB", flush=True)
+            finally:
+                if args.daemon:
+                    subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, 'linear_daemon.py'), 'stop'],
+                                   cwd=cwd, capture_output=True)
+
+        launcher.close()
+        git_version = subprocess.run(['git', '--version'], capture_output=True, text=True).stdout.strip()
+
+    return {
+        'meta': {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'git': git_version,
+            'runs': args.runs,
+            'commits': args.commits,
+            'registry_size': args.registry_size,
+            'daemon': args.daemon,
+        },
+        'results': results,
+        'failures': failures,
+    }
+
+
+def compare(current: dict, baseline_path: str, max_regression: float) -> bool:
+    """Print p95 deltas against a baseline; False if anything regressed."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    key = lambda r: (r['repo'], r['payload'], r['hook'])
+    before = {key(r): r for r in baseline.get('results', [])}
+
+    ok = True
+    print(f"\nComparison with {baseline_path} (p95):")
+    for row in current['results']:
+        old = before.get(key(row))
+        if not old or not old['p95_ms']:
+            continue
+        delta = (row['p95_ms'] - old['p95_ms']) / old['p95_ms']
+        flag = ''
+        if delta > max_regression:
+            flag = '  REGRESSION'
+            ok = False
+        forks = ''
+        if row['git_forks'] != old.get('git_forks'):
+            forks = f"  forks {old.get('git_forks')} -> {row['git_forks']}"
+        print(f"  {row['repo']:14s} {row['payload']:38s} {row['hook']:22s} "
+              f"{old['p95_ms']:7.2f} -> {row['p95_ms']:7.2f} ms ({delta:+.0%}){forks}{flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--runs', type=int, default=30)
+    parser.add_argument('--output', help='write results JSON here')
+    parser.add_argument('--compare', help='previous results JSON to diff against')
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help='allowed p95 slowdown per row for --compare (default 0.2 = 20%%)')
+    parser.add_argument('--repos', help=f'comma-separated subset of {",".join(REPO_KINDS)}')
+    parser.add_argument('--payloads', help='comma-separated corpus names')
+    parser.add_argument('--commits', type=int, default=20, help='commits on the task branch')
+    parser.add_argument('--registry-size', type=int, default=5000)
+    parser.add_argument('--large-mb', type=int, default=0,
+                        help='also replay Write/PostToolUse payloads of this many MB')
+    parser.add_argument('--daemon', action='store_true', help='run the entry point against a hook daemon')
+    args = parser.parse_args()
+
+    report = bench(args)
+    if args.output:
+        write_json(os.path.abspath(args.output), report)
+        print(f"\nResults written to {args.output}")
+
+    for failure in report['failures']:
+        print(f"[yux-linear] unexpected exit code: {failure}", file=sys.stderr)
+    if args.compare and not compare(report, args.compare, args.max_regression):
+        sys.exit(1)
+    if report['failures']:
+        sys.exit(1)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Correctness, fuzz and scaling checks for scripts/_shell_tokens.py.
+
+Three passes, any failure makes the exit code 1:
+- cases: commands the hooks see (heredoc commits, `&&` chains, `git -C`,
+  quoted look-alikes) against the commit subjects validate_commit.py
+  extracts and the gh/git runs post_command.py detects
+- fuzz: random commands from a shell-heavy alphabet must tokenize without
+  raising, and commands built from shlex.quote()d words joined by `&&`
+  must come back as the same words and segments
+- scaling: pathological inputs (unbalanced quotes, `$(` towers, thousands
+  of heredocs, backslash runs, ...) at --mb and a quarter of it; each must
+  finish, the larger must not take more than --max-ratio times four times
+  the smaller (linear, with slack for noise), and no input may take more
+  than --max-ms-per-mb per megabyte. The default ceiling is the PreToolUse
+  budget (0.6 x 5 s) for the two passes timed here (split_commands() and
+  extract_commit_messages()), so one pass over a megabyte, as a hook makes,
+  fits in half the budget. Garbage collection is off while timing, as in
+  a hook process (see linear_hook.dispatch()); --gc keeps it on, as in
+  the daemon
+
+Usage:
+  python3 bench/bench_shell_tokens.py [--mb 1] [--fuzz 2000] [--seed 0]
+                                      [--max-ratio 2.5] [--max-ms-per-mb 3000]
+                                      [--gc] [--output results.json]
+
+Exit codes:
+  0 - All checks passed
+  1 - A case, fuzz or scaling check failed (details on stderr)
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import shlex
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(os.path.dirname(BENCH_DIR), 'scripts')
+
+sys.path.insert(0, SCRIPTS_DIR)
+from _shell_tokens import split_commands
+from post_command import ran
+from validate_commit import extract_commit_messages
+
+HEREDOC_COMMIT = ("git add -A && git commit -m \"$(cat <<'EOF'\n"
+                  "feat(auth): don't drop the (retry) token\n\nBody with \"quotes\" and )\nEOF\n)\"")
+
+# (command, commit subjects, detected runs out of gh pr create / gh pr merge / git push)
+CASES = [
+    ('git commit -m "feat: add x"', ['feat: add x'], []),
+    ("git commit -m 'fix(api): y' && git push -u origin HEAD", ['fix(api): y'], ['git push']),
+    (HEREDOC_COMMIT, ["feat(auth): don't drop the (retry) token"], []),
+    ("git -C ../wt -c core.hooksPath=/dev/null commit -am 'docs: z' 2>&1 | tail -3",
+     ['docs: z'], []),
+    ('git commit --message="chore: a" -m "second paragraph"', ['chore: a'], []),
+    ('git commit -m"style: q"', ['style: q'], []),
+    ("echo 'git commit -m \"bad\" && gh pr create'", [], []),
+    ('git commit --amend --no-edit && git push --force-with-lease', [], ['git push']),
+    ('gh pr create --title "feat: x" --body "$(cat <<\'EOF\'\n## Summary\nEOF\n)"',
+     [], ['gh pr create']),
+    ('cd repo && gh pr merge 12 --squash --delete-branch # then git push', [], ['gh pr merge']),
+    ('git log --grep "git push" --oneline', [], []),
+    ('git commit -m "feat: one" && git commit -m "oops"', ['feat: one', 'oops'], []),
+    ('FOO=1 command git commit -m \\"perf:\\ fast\\"', ['"perf: fast"'], []),
+]
+
+RUNS = (('gh', 'pr', 'create'), ('gh', 'pr', 'merge'), ('git', 'push'))
+
+FUZZ_ALPHABET = list("ab -=/.\n\t'\"\\$`(){};&|<>#!*") + [
+    'git ', 'commit ', '-m ', '<<EOF\n', '\nEOF\n', '$(', '${', "$'", '&&', '||', '2>&1',
+    '<<-', 'cat ', 'gh pr create ']
+
+# name -> unit repeated to the target size (each is a worst case for some state)
+PATHOLOGICAL = {
+    'plain': 'a',
+    'spaces': 'a ',
+    'single-quotes': "'",
+    'double-quotes': '"',
+    'unterminated-double': '"$x\\"',
+    'backslashes': '\\',
+    'subst-tower': '$(',
+    'subst-in-quotes': '"$(',
+    'parens': '(',
+    'braces': '${',
+    'backticks': '`\\`',
+    'operators': 'a&&b||c;d|e&',
+    'redirections': '2>&1 <x >>y ',
+    'heredoc-starts': '<<a ',
+    'heredocs': 'cat <<EOF\nx\nEOF\n',
+    'comments': '#(\n',
+    'ansi-c': "$'\\",
+    'commit-chain': 'git commit -m "feat: x" && ',
+}
+
+
+def check_cases() -> list[str]:
+    failures = []
+    for command, subjects, runs in CASES:
+        segments = split_commands(command)
+        got_runs = [' '.join(words) for words in RUNS if ran(segments, *words)]
+        got_subjects = extract_commit_messages(command)
+        if got_subjects != subjects or got_runs != runs:
+            failures.append(f"case {command!r}: subjects {got_subjects!r} runs {got_runs!r}, "
+                            f"expected {subjects!r} {runs!r}")
+    return failures
+
+
+def check_fuzz(count: int, rng: random.Random) -> list[str]:
+    failures = []
+    for _ in range(count):
+        command = ''.join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(1, 80)))
+        try:
+            segments = split_commands(command)
+            extract_commit_messages(command)
+            for words in RUNS:
+                ran(segments, *words)
+        except Exception as e:  # noqa: BLE001 - any exception is the finding
+            failures.append(f"fuzz {command!r}: {type(e).__name__}: {e}")
+            continue
+        if any(not isinstance(word, str) for seg in segments for word in seg.argv):
+            failures.append(f"fuzz {command!r}: non-str argv")
+
+        pieces = [[''.join(rng.choice(FUZZ_ALPHABET[:30]) for _ in range(rng.randint(0, 8)))
+                   for _ in range(rng.randint(1, 4))] for _ in range(rng.randint(1, 3))]
+        quoted = ' && '.join(' '.join(shlex.quote(w) for w in words) for words in pieces)
+        argvs = [seg.argv for seg in split_commands(quoted)]
+        if argvs != pieces:
+            failures.append(f"round trip {quoted!r}: {argvs!r} != {pieces!r}")
+    return failures
+
+
+def time_input(text: str) -> float:
+    start = time.perf_counter()
+    split_commands(text)
+    extract_commit_messages(text)
+    return time.perf_counter() - start
+
+
+def check_scaling(mb: float, max_ratio: float,
+                  max_ms_per_mb: float) -> tuple[list[dict], list[str]]:
+    rows, failures = [], []
+    size = int(mb * (1 << 20))
+    for name, unit in PATHOLOGICAL.items():
+        small = unit * max(1, size // 4 // len(unit))
+        large = unit * max(1, size // len(unit))
+        try:
+            small_s = min(time_input(small) for _ in range(2))
+            large_s = min(time_input(large) for _ in range(2))
+        except Exception as e:  # noqa: BLE001
+            failures.append(f"scaling {name}: {type(e).__name__}: {e}")
+            continue
+        ratio = large_s / max(small_s, 1e-6) / 4
+        rows.append({"input": name, "bytes": len(large), "ms": round(large_s * 1000, 1),
+                     "mb_per_s": round(len(large) / (1 << 20) / max(large_s, 1e-9), 2),
+                     "linear_ratio": round(ratio, 2)})
+        if ratio > max_ratio:
+            failures.append(f"scaling {name}: {len(large)} bytes took {ratio:.2f}x the "
+                            f"linear extrapolation from {len(small)} bytes")
+        ms_per_mb = large_s * 1000 / (len(large) / (1 << 20))
+        if ms_per_mb > max_ms_per_mb:
+            failures.append(f"scaling {name}: {ms_per_mb:.0f} ms per MB, "
+                            f"over the {max_ms_per_mb:g} ms ceiling")
+    return rows, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shell tokenizer cases, fuzz and scaling")
+    parser.add_argument('--mb', type=float, default=1.0, help="pathological input size")
+    parser.add_argument('--fuzz', type=int, default=2000, help="random commands to try")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-ratio', type=float, default=2.5,
+                        help="allowed time over linear extrapolation (default 2.5)")
+    parser.add_argument('--max-ms-per-mb', type=float, default=3000,
+                        help="absolute ceiling per MB of input (default 3000)")
+    parser.add_argument('--gc', action='store_true',
+                        help="keep garbage collection on while timing (as in the daemon)")
+    parser.add_argument('--output', help="write results as JSON")
+    args = parser.parse_args()
+    if not args.gc:
+        gc.disable()
+
+    failures = check_cases()
+    print(f"cases: {len(CASES)} checked")
+    failures += check_fuzz(args.fuzz, random.Random(args.seed))
+    print(f"fuzz:  {args.fuzz} random commands + round trips")
+    rows, scaling_failures = check_scaling(args.mb, args.max_ratio, args.max_ms_per_mb)
+    failures += scaling_failures
+
+    print(f"\n{'input':<22s} {'bytes':>9s} {'ms':>9s} {'MB/s':>7s} {'vs linear':>9s}")
+    for row in rows:
+        print(f"{row['input']:<22s} {row['bytes']:>9d} {row['ms']:>9.1f} "
+              f"{row['mb_per_s']:>7.2f} {row['linear_ratio']:>8.2f}x")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"mb": args.mb, "rows": rows, "failures": failures}, f, indent=2)
+            f.write('\n')
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
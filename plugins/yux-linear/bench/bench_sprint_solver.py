@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Sprint solver benchmark: the knapsack solver against the greedy fill.
+
+The greedy fill is what yux-pm-plan did before scripts/plan_sprint.py:
+walk the backlog by score, best first, and take every issue that still
+fits (first up to the must share of capacity, then up to full capacity),
+ignoring blocks / blocked-by. For each synthetic backlog it reports the
+total score of both plans, how many greedy picks have a blocker that was
+not picked, the greedy score with those picks removed (the part of the
+plan that can actually be worked), and the solver's time and exactness.
+
+Synthetic backlogs draw sizes from the yux-pm-plan effort map (weighted
+towards S/M with a few L/XL), scores like issue-scoring.md produces, and
+blocked-by edges to earlier issues with probability --dep-rate.
+
+Usage:
+  python3 bench/bench_sprint_solver.py [--sizes 50,200,1000,5000] [--capacity 8,40]
+                                       [--seeds 3] [--dep-rate 0.05] [--deadline 2]
+                                       [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(os.path.dirname(BENCH_DIR), 'scripts')
+
+sys.path.insert(0, SCRIPTS_DIR)
+from _sprint_solver import EFFORT_DAYS, Item, days_to_units, solve
+
+SIZE_WEIGHTS = {'XS': 2, 'S': 4, 'M': 4, 'L': 2, 'XL': 1}
+MUST_FRACTION = 0.6
+
+
+def synthetic_backlog(n: int, dep_rate: float, rng: random.Random) -> list[Item]:
+    sizes = list(SIZE_WEIGHTS)
+    weights = list(SIZE_WEIGHTS.values())
+    items = []
+    for i in range(n):
+        size = rng.choices(sizes, weights)[0]
+        score = rng.choice([0, 20, 40, 70, 100]) + rng.choice([0, 0, 0, 40, 60, 80])
+        score += rng.choice([0, 30]) + rng.choice([0, 0, 50]) + rng.choice([0, 15])
+        requires = [f"B-{j}" for j in rng.sample(range(i), min(i, 3)) if rng.random() < dep_rate]
+        items.append(Item(f"B-{i}", days_to_units(EFFORT_DAYS[size]), score, requires))
+    return items
+
+
+def greedy_fill(items: list[Item], capacity: int) -> list[str]:
+    """Top-down fill by score, must share first, dependencies ignored."""
+    ranked = sorted(items, key=lambda item: (-item.value, item.key))
+    picked, used = [], 0
+    for limit in (int(capacity * MUST_FRACTION), capacity):
+        for item in ranked:
+            if item.key not in picked and item.value > 0 and used + item.units <= limit:
+                picked.append(item.key)
+                used += item.units
+    return picked
+
+
+def workable(items: list[Item], keys: list[str]) -> set[str]:
+    """Picks whose blockers are all picked too (transitively)."""
+    by_key = {item.key: item for item in items}
+    ok = set(keys)
+    changed = True
+    while changed:
+        changed = False
+        for key in list(ok):
+            if any(r not in ok for r in by_key[key].requires):
+                ok.discard(key)
+                changed = True
+    return ok
+
+
+def run_case(n: int, capacity_days: float, seed: int, dep_rate: float, deadline: float) -> dict:
+    rng = random.Random(seed * 1_000_003 + n)
+    items = synthetic_backlog(n, dep_rate, rng)
+    by_key = {item.key: item for item in items}
+    capacity = days_to_units(capacity_days)
+
+    start = time.perf_counter()
+    greedy = greedy_fill(items, capacity)
+    greedy_ms = (time.perf_counter() - start) * 1000
+    ok = workable(items, greedy)
+
+    start = time.perf_counter()
+    plan = solve(items, capacity, deadline=deadline)
+    solver_ms = (time.perf_counter() - start) * 1000
+
+    greedy_score = sum(by_key[k].value for k in greedy)
+    return {
+        "issues": n, "capacity_days": capacity_days, "seed": seed,
+        "greedy_score": greedy_score,
+        "greedy_violations": len(greedy) - len(ok),
+        "greedy_workable_score": sum(by_key[k].value for k in ok),
+        "greedy_ms": round(greedy_ms, 2),
+        "solver_score": plan.value,
+        "solver_exact": plan.exact,
+        "solver_ms": round(solver_ms, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sprint solver vs greedy fill")
+    parser.add_argument('--sizes', default='50,200,1000,5000')
+    parser.add_argument('--capacity', default='8,40', help="effective days, comma-separated")
+    parser.add_argument('--seeds', type=int, default=3)
+    parser.add_argument('--dep-rate', type=float, default=0.05)
+    parser.add_argument('--deadline', type=float, default=2.0)
+    parser.add_argument('--output', help="write results as JSON")
+    args = parser.parse_args()
+
+    rows = []
+    print(f"{'issues':>6s} {'days':>5s} {'seed':>4s}  {'greedy':>7s} {'viol':>4s} "
+          f"{'workable':>8s}  {'solver':>7s} {'exact':>5s} {'ms':>8s}  {'gain':>6s}")
+    for n in map(int, args.sizes.split(',')):
+        for capacity_days in map(float, args.capacity.split(',')):
+            for seed in range(args.seeds):
+                row = run_case(n, capacity_days, seed, args.dep_rate, args.deadline)
+                rows.append(row)
+                base = row['greedy_workable_score'] or 1
+                gain = (row['solver_score'] - row['greedy_workable_score']) / base
+                print(f"{n:>6d} {capacity_days:>5g} {seed:>4d}  {row['greedy_score']:>7d} "
+                      f"{row['greedy_violations']:>4d} {row['greedy_workable_score']:>8d}  "
+                      f"{row['solver_score']:>7d} {str(row['solver_exact']):>5s} "
+                      f"{row['solver_ms']:>8.1f}  {gain:>+6.1%}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"dep_rate": args.dep_rate, "rows": rows}, f, indent=2)
+            f.write('\n')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+End-to-end workflow benchmark against the local Linear stand-in
+(bench/linear_standin.py): the Linear calls and local scripts of each
+skill, replayed in the order the skills make them.
+
+Per round, one Todo issue goes through
+  start   list_teams, get_issue, update_issue, create_comment, linear_deps set-state
+  commit  get_issue, list_comments, linear_outbox add (--commits times)
+  pr      get_issue, linear_outbox add/flush, update_issue, create_comment, ack
+  merge   get_issue, list_comments, linear_deps set-state, linear_outbox add/flush,
+          update_issue, create_comment, ack
+and then the dashboards run:
+  status  get_issue, list_issues delta, linear_mirror ingest/query, score_issues
+  plan    list_cycles x2, list_issues delta, ingest/query, score_issues, plan_sprint
+  triage  list_issue_labels, list_issues(Triage), delta, ingest, triage_issues check
+
+--mode mirror fetches only what changed since the mirror watermark (what
+the skills do); --mode direct re-fetches every open issue on each dashboard
+run, the way they worked before the mirror. Both is the default, so the
+two can be compared. Reported per step and mode: Linear calls, bytes sent
+and received, time waiting on the API, time in local scripts, wall time.
+
+The first dashboard run of a mirror fills an empty mirror; it is reported
+separately as `bootstrap` and left out of the step rows.
+
+Usage:
+  python3 bench/bench_workflow.py [--issues 5000] [--rounds 3] [--commits 3]
+                                  [--mode both|mirror|direct] [--latency-ms 0]
+                                  [--jitter-ms 0] [--seed 0] [--output results.json]
+  python3 bench/bench_workflow.py --url http://127.0.0.1:8765   (a running stand-in)
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.request import Request, urlopen
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(os.path.dirname(BENCH_DIR), 'scripts')
+
+sys.path.insert(0, BENCH_DIR)
+from linear_standin import Dataset, serve
+
+PAGE = 250
+STEPS = ('start', 'commit', 'pr', 'merge', 'status', 'plan', 'triage')
+
+
+class Meter:
+    """Counters of one step."""
+
+    def __init__(self):
+        self.calls = self.sent = self.received = 0
+        self.api_s = self.local_s = self.wall_s = 0.0
+        self.tools = {}
+
+    def row(self) -> dict:
+        return {"calls": self.calls, "bytes_sent": self.sent, "bytes_received": self.received,
+                "api_ms": round(self.api_s * 1000, 1), "local_ms": round(self.local_s * 1000, 1),
+                "wall_ms": round(self.wall_s * 1000, 1), "tools": dict(sorted(self.tools.items()))}
+
+
+class Client:
+    """MCP tool calls over HTTP, counted into the current meter."""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip('/') + '/mcp'
+        self.meter = Meter()
+        self.ids = 0
+
+    def call(self, tool: str, **arguments):
+        self.ids += 1
+        body = json.dumps({"jsonrpc": "2.0", "id": self.ids, "method": "tools/call",
+                           "params": {"name": tool, "arguments": arguments}}).encode()
+        start = time.perf_counter()
+        with urlopen(Request(self.url, data=body,
+                             headers={'Content-Type': 'application/json'}), timeout=60) as resp:
+            raw = resp.read()
+        meter = self.meter
+        meter.api_s += time.perf_counter() - start
+        meter.calls += 1
+        meter.sent += len(body)
+        meter.received += len(raw)
+        meter.tools[tool] = meter.tools.get(tool, 0) + 1
+        result = json.loads(raw)['result']
+        text = result['content'][0]['text']
+        if result.get('isError'):
+            raise RuntimeError(f"{tool}: {text}")
+        return json.loads(text)
+
+    def list_all(self, **arguments) -> list[dict]:
+        """Every page of a list_issues query."""
+        issues, cursor = [], None
+        while True:
+            page = self.call('list_issues', limit=PAGE, **arguments,
+                             **({'cursor': cursor} if cursor else {}))
+            issues.extend(page['issues'])
+            cursor = (page.get('pageInfo') or {}).get('endCursor')
+            if not cursor:
+                return issues
+
+
+class Workflow:
+    """Replays the skills in one throwaway repo."""
+
+    def __init__(self, client: Client, repo: str, mode: str, commits: int):
+        self.client, self.repo, self.mode, self.commits = client, repo, mode, commits
+        self.meters = {}
+        self.team = client.call('list_teams')[0]
+        self.project = client.call('list_projects')[0]
+        with open(os.path.join(repo, '.claude', 'linear-config.json'), 'w') as f:
+            json.dump({"team": self.team, "project": self.project}, f)
+
+    def script(self, name: str, *args) -> str:
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, name), *args],
+                              cwd=self.repo, capture_output=True, text=True)
+        self.client.meter.local_s += time.perf_counter() - start
+        return proc.stdout
+
+    def dump(self, name: str, data) -> str:
+        path = os.path.join(self.repo, '.claude', name)
+        with open(path, 'w') as f:
+            json.dump(data, f, ensure_ascii=False)
+        return path
+
+    def step(self, name: str, fn, *args):
+        meter = self.client.meter = self.meters.setdefault(name, Meter())
+        start = time.perf_counter()
+        fn(*args)
+        meter.wall_s += time.perf_counter() - start
+
+    # Issue lifecycle
+
+    def start(self, key: str) -> None:
+        self.client.call('list_teams')
+        issue = self.client.call('get_issue', id=key)
+        self.client.call('update_issue', id=issue['id'], state='In Progress')
+        self.client.call('create_comment', issueId=issue['id'],
+                         body=f"Started working.\nBranch: `feat/{key.lower()}`")
+        self.script('linear_deps.py', 'set-state', key, '--open', '--in-progress')
+
+    def flush(self, key: str, uuid: str) -> None:
+        """Post the issue's outbox batches and acknowledge them."""
+        for batch in json.loads(self.script('linear_outbox.py', 'flush', '--issue', key,
+                                            '--json') or '[]'):
+            if batch['state']:
+                self.client.call('update_issue', id=uuid, state=batch['state'])
+            if batch['comment']:
+                self.client.call('create_comment', issueId=uuid, body=batch['comment'])
+            self.script('linear_outbox.py', 'ack', batch['key'])
+
+    def commit(self, key: str, n: int) -> None:
+        issue = self.client.call('get_issue', id=key)
+        self.client.call('list_comments', issueId=issue['id'])
+        self.script('linear_outbox.py', 'add', key, '--key', f'commit:{key}:{n}',
+                    '--note', f"**Commit**: `feat({key}): step {n}`")
+
+    def pr(self, key: str) -> None:
+        issue = self.client.call('get_issue', id=key)
+        self.script('linear_outbox.py', 'add', key, '--key', f'pr-created:{key}:1',
+                    '--state', 'In Review', '--note', "PR created: #1")
+        self.flush(key, issue['id'])
+
+    def merge(self, key: str) -> None:
+        issue = self.client.call('get_issue', id=key)
+        self.client.call('list_comments', issueId=issue['id'])
+        self.script('linear_deps.py', 'set-state', key, '--done')
+        self.script('linear_outbox.py', 'add', key, '--key', f'merged:{key}:1',
+                    '--state', 'Done', '--note', "Task completed!")
+        self.flush(key, issue['id'])
+
+    # Dashboards
+
+    def sync(self) -> None:
+        """Bring the mirror up to date: fetch and ingest what changed since its watermark."""
+        since = self.script('linear_mirror.py', 'watermark').strip()
+        delta = self.client.list_all(project=self.project['id'], includeArchived=True,
+                                     **({'updatedAt': since} if since else {}))
+        self.script('linear_mirror.py', 'ingest', self.dump('yux-delta.json', delta))
+
+    def fetch(self, states: str) -> str:
+        """Issues for a dashboard, as a file: a mirror sync + query, or a full fetch."""
+        if self.mode == 'direct':
+            return self.dump('yux-issues.json',
+                             self.client.list_all(project=self.project['id'], state=states))
+        self.sync()
+        return self.dump('yux-issues.json', json.loads(
+            self.script('linear_mirror.py', 'query', '--state', states, '--json')))
+
+    def status(self, key: str) -> None:
+        self.client.call('get_issue', id=key)
+        self.script('score_issues.py', self.fetch('backlog,unstarted,started'),
+                    '--top', '5', '--explain')
+
+    def plan(self) -> None:
+        cycle = self.client.call('list_cycles', teamId=self.team['id'], type='next')[0]
+        current = self.client.call('list_cycles', teamId=self.team['id'], type='current')[0]
+        path = self.fetch('backlog,unstarted')
+        cycles = ['--current-cycle', cycle['id'], '--previous-cycle', current['id'],
+                  '--cycle-end', cycle['endsAt'][:10]]
+        deps = ['--deps'] if self.mode == 'mirror' else []
+        self.script('score_issues.py', path, '--plan', *deps, *cycles, '--all', '--json')
+        self.script('plan_sprint.py', path, '--days', '10', '--buffer', '0.2', *deps, *cycles)
+
+    def triage(self) -> None:
+        self.client.call('list_issue_labels', team=self.team['id'])
+        inbox = self.client.call('list_issues', project=self.project['id'], state='Triage',
+                                 limit=20, orderBy='createdAt')
+        path = self.dump('yux-inbox.json', inbox)
+        if self.mode == 'mirror':
+            self.sync()
+        self.script('triage_issues.py', '--json', 'check', path)
+
+    def run(self, keys: list[str]) -> dict:
+        if self.mode == 'mirror':
+            self.step('bootstrap', self.sync)
+        for key in keys:
+            self.step('start', self.start, key)
+            for n in range(1, self.commits + 1):
+                self.step('commit', self.commit, key, n)
+            self.step('pr', self.pr, key)
+            self.step('merge', self.merge, key)
+            self.step('status', self.status, key)
+            self.step('plan', self.plan)
+            self.step('triage', self.triage)
+        return {name: meter.row() for name, meter in self.meters.items()}
+
+
+def run_mode(url: str, mode: str, rounds: int, commits: int) -> dict:
+    client = Client(url)
+    # Pick the issues to work on outside the meters
+    keys = [i['identifier'] for i in
+            client.call('list_issues', state='Todo', limit=rounds, orderBy='createdAt')['issues']]
+    with tempfile.TemporaryDirectory() as repo:
+        subprocess.run(['git', 'init', '-q', repo], check=True)
+        os.makedirs(os.path.join(repo, '.claude'))
+        return Workflow(client, repo, mode, commits).run(keys)
+
+
+def print_rows(mode: str, steps: dict, rounds: int) -> None:
+    print(f"\n{mode} ({rounds} rounds, totals per step)")
+    print(f"{'step':<10s} {'calls':>6s} {'sent':>9s} {'received':>10s} "
+          f"{'api':>9s} {'local':>9s} {'wall':>9s}")
+    names = [n for n in ('bootstrap',) + STEPS if n in steps]
+    for name in names + ['total']:
+        if name == 'total':
+            rows = [steps[n] for n in STEPS if n in steps]
+            row = {k: sum(r[k] for r in rows) for k in
+                   ('calls', 'bytes_sent', 'bytes_received', 'api_ms', 'local_ms', 'wall_ms')}
+        else:
+            row = steps[name]
+        print(f"{name:<10s} {row['calls']:>6d} {row['bytes_sent'] / 1024:>7.1f}KB "
+              f"{row['bytes_received'] / 1024:>8.1f}KB {row['api_ms']:>7.0f}ms "
+              f"{row['local_ms']:>7.0f}ms {row['wall_ms']:>7.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end workflow benchmark")
+    parser.add_argument('--issues', type=int, default=5000)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--commits', type=int, default=3, help="commits per issue")
+    parser.add_argument('--mode', choices=('both', 'mirror', 'direct'), default='both')
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--per-kb-ms', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--url', help="use a running stand-in instead of starting one")
+    parser.add_argument('--output', help="write results as JSON")
+    args = parser.parse_args()
+
+    modes = ('mirror', 'direct') if args.mode == 'both' else (args.mode,)
+    results = {}
+    for mode in modes:
+        server = None
+        url = args.url
+        if not url:
+            # A fresh dataset per mode, so both replay the same history
+            start = time.perf_counter()
+            dataset = Dataset(args.issues, args.seed)
+            server, _, url = serve(dataset, latency_ms=args.latency_ms,
+                                   jitter_ms=args.jitter_ms, per_kb_ms=args.per_kb_ms)
+            print(f"{mode}: {args.issues} issues generated in "
+                  f"{time.perf_counter() - start:.1f}s", file=sys.stderr)
+        try:
+            results[mode] = run_mode(url, mode, args.rounds, args.commits)
+        finally:
+            if server:
+                server.shutdown()
+                server.server_close()
+        print_rows(mode, results[mode], args.rounds)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"issues": args.issues, "rounds": args.rounds, "commits": args.commits,
+                       "latency_ms": args.latency_ms, "results": results}, f, indent=2)
+            f.write('\n')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Check that the closed-cycle history does not depend on how issues arrive.
+
+Serves a generated workspace with the local Linear stand-in and fills two
+throwaway mirrors from it: one by a paged GraphQL sync (PAGE_SIZE issues
+per page, newest first), one by ingesting the same issues as a single
+dump. Both must end with the same cycle_history() and velocity; a cycle
+closed from the first page alone would keep that page's totals.
+
+Usage:
+  python3 bench/check_cycle_history.py [--issues 600] [--seed 0]
+
+Exit codes:
+  0 - Paged sync and one-shot ingest agree
+  1 - They differ (both histories on stderr)
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(os.path.dirname(BENCH_DIR), 'scripts')
+
+sys.path.insert(0, SCRIPTS_DIR)
+sys.path.insert(0, BENCH_DIR)
+from _issue_mirror import IssueMirror
+from linear_standin import Dataset, serve
+
+
+def metrics(mirror: IssueMirror) -> dict:
+    return {"history": mirror.cycles.history(), "velocity": mirror.cycles.velocity(3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paged sync vs one-shot ingest cycle history")
+    parser.add_argument('--issues', type=int, default=600)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    dataset = Dataset(args.issues, args.seed)
+    server, _, url = serve(dataset)
+    with tempfile.TemporaryDirectory(prefix='yux-cycles-') as tmp:
+        paged = IssueMirror(os.path.join(tmp, 'paged.db'))
+        one_shot = IssueMirror(os.path.join(tmp, 'one-shot.db'))
+        try:
+            paged.sync_graphql(f"{url}/graphql", None)
+            one_shot.ingest(list(dataset.issues.values()))
+            results = metrics(paged), metrics(one_shot)
+        finally:
+            paged.close()
+            one_shot.close()
+            server.shutdown()
+
+    closed = len(results[0]['history'])
+    if results[0] != results[1] or not closed:
+        print("[yux-linear] paged sync and one-shot ingest disagree:", file=sys.stderr)
+        for name, result in zip(('paged', 'one-shot'), results):
+            print(f"{name}: {json.dumps(result, ensure_ascii=False)}", file=sys.stderr)
+        sys.exit(1)
+    velocity = results[0]['velocity']
+    print(f"ok  {args.issues} issues, {closed} closed cycles, "
+          f"velocity {velocity['per_business_day']:g} days per business day")
+
+
+if __name__ == "__main__":
+    main()
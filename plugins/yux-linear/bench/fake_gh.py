@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Scripted stand-in for the `gh` CLI, for exercising scripts/ci_watch.py
+without GitHub.
+
+Supports the calls ci_watch.py and collect_tasks.py make:
+  gh api -i [-H 'If-None-Match: <etag>'] repos/{owner}/{repo}/pulls/<n>
+  gh api -i [...] repos/{owner}/{repo}/commits/<sha>/check-runs?per_page=100
+  gh api -i [...] repos/{owner}/{repo}/commits/<sha>/status?per_page=100
+  gh api -i [...] <next page URL from a Link header>
+  gh run view --job <id> --log-failed
+  gh pr list --state open [...] --json <fields>
+  gh pr view <n> --json <fields>
+
+Responses come from a scenario file (FAKE_GH_SCENARIO). Check states are a
+function of the seconds since the first call (remembered in
+FAKE_GH_STATE), so a scenario plays out in real time:
+
+  {
+    "pulls": {
+      "12": {"sha": "abc123", "ref": "feat/LIN-1-x", "state": "open",
+             "checks": [{"name": "test", "id": 101, "start": 0, "duration": 6,
+                         "conclusion": "failure"}],
+             "statuses": [{"context": "ci/legacy", "start": 0, "duration": 2,
+                           "state": "success"}],
+             "closed_at": null}
+    },
+    "logs": {"101": "step 3 failed\\n..."}
+  }
+
+"closed_at" (seconds) turns the PR into a merged one at that time. Bodies
+carry an ETag; a matching If-None-Match gets a 304. Check runs and
+statuses are paged by ?per_page= (default 30) and &page=, with a Link
+rel="next" header while more remain. Every call is appended
+to FAKE_GH_LOG (one JSON line: args and status) when that is set.
+
+Example:
+  FAKE_GH_SCENARIO=scenario.json FAKE_GH_STATE=/tmp/fake-gh.state \\
+    python3 scripts/ci_watch.py 12 14 --gh bench/fake_gh.py
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+BASE_RE = re.compile(r'(?:https://[^/]+/)?repos/[^/]+/[^/]+/')
+API_URL = 'https://api.github.com/repos/o/r/'
+DEFAULT_PER_PAGE = 30
+ISO = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def elapsed() -> tuple[float, float]:
+    """(seconds since the first call, wall time of the first call)."""
+    path = os.environ.get('FAKE_GH_STATE', '/tmp/fake-gh.state')
+    try:
+        with open(path) as f:
+            start = float(f.read())
+    except (OSError, ValueError):
+        start = time.time()
+        with open(path, 'w') as f:
+            f.write(repr(start))
+    return time.time() - start, start
+
+
+def stamp(start: float, offset: float) -> str:
+    return time.strftime(ISO, time.gmtime(start + offset))
+
+
+def check_run(spec: dict, t: float, start: float) -> dict:
+    begin, end = spec.get('start', 0), spec.get('start', 0) + spec.get('duration', 0)
+    status = 'queued' if t < begin else 'in_progress' if t < end else 'completed'
+    return {
+        "id": spec['id'],
+        "name": spec['name'],
+        "status": status,
+        "conclusion": spec.get('conclusion', 'success') if status == 'completed' else None,
+        "started_at": stamp(start, begin) if status != 'queued' else None,
+        "completed_at": stamp(start, end) if status == 'completed' else None,
+        "details_url": f"https://github.com/o/r/actions/runs/{spec.get('run', 1)}/job/{spec['id']}",
+    }
+
+
+def commit_status(spec: dict, t: float, start: float) -> dict:
+    end = spec.get('start', 0) + spec.get('duration', 0)
+    done = t >= end
+    return {
+        "context": spec['context'],
+        "state": spec.get('state', 'success') if done else 'pending',
+        "created_at": stamp(start, spec.get('start', 0)),
+        "updated_at": stamp(start, end if done else t),
+        "target_url": spec.get('url', ''),
+    }
+
+
+def respond(status: int, body, if_none_match: str | None, link: str = '') -> int:
+    text = json.dumps(body, sort_keys=True)
+    etag = 'W/"' + hashlib.sha1(text.encode()).hexdigest() + '"'
+    link = f"Link: {link}\r\n" if link else ''
+    if status == 200 and if_none_match == etag:
+        sys.stdout.write(f"HTTP/2.0 304 Not Modified\r\nEtag: {etag}\r\n{link}\r\n")
+        return 304
+    reason = {200: 'OK', 404: 'Not Found'}.get(status, '')
+    sys.stdout.write(f"HTTP/2.0 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Etag: {etag}\r\n{link}X-Ratelimit-Remaining: 4999\r\n\r\n{text}")
+    return status
+
+
+def page_of(items: list, rel: str, query: str) -> tuple[list, str]:
+    """(the items on the requested page, Link header for the next one)."""
+    params = dict(p.partition('=')[::2] for p in query.lstrip('?').split('&') if p)
+    per_page = int(params.get('per_page') or DEFAULT_PER_PAGE)
+    page = int(params.get('page') or 1)
+    if page * per_page >= len(items):
+        return items[(page - 1) * per_page:], ''
+    return (items[(page - 1) * per_page:page * per_page],
+            f'<{API_URL}{rel}?per_page={per_page}&page={page + 1}>; rel="next"')
+
+
+def api(args: list[str], scenario: dict) -> int:
+    if_none_match = None
+    path = None
+    i = 0
+    while i < len(args):
+        if args[i] == '-H':
+            name, _, value = args[i + 1].partition(':')
+            if name.strip().lower() == 'if-none-match':
+                if_none_match = value.strip()
+            i += 2
+            continue
+        if not args[i].startswith('-'):
+            path = args[i]
+        i += 1
+    t, start = elapsed()
+    pulls = scenario.get('pulls', {})
+    rel = BASE_RE.sub('', path or '', count=1)
+
+    match = re.fullmatch(r'pulls/(\d+)', rel)
+    if match and match.group(1) in pulls:
+        pr = pulls[match.group(1)]
+        closed = pr.get('closed_at') is not None and t >= pr['closed_at']
+        return respond(200, {
+            "number": int(match.group(1)),
+            "state": 'closed' if closed else pr.get('state', 'open'),
+            "merged": closed,
+            "head": {"sha": pr['sha'], "ref": pr.get('ref', '')},
+        }, if_none_match)
+
+    match = re.fullmatch(r'commits/([^/]+)/(check-runs|status)(\?.*)?', rel)
+    if match:
+        specs = [pr for pr in pulls.values() if pr['sha'] == match.group(1)]
+        if specs:
+            pr = specs[0]
+            endpoint = f'commits/{match.group(1)}/{match.group(2)}'
+            if match.group(2) == 'check-runs':
+                runs = [check_run(c, t, start) for c in pr.get('checks', [])]
+                page, link = page_of(runs, endpoint, match.group(3) or '')
+                return respond(200, {"total_count": len(runs), "check_runs": page},
+                               if_none_match, link)
+            statuses = [commit_status(s, t, start) for s in pr.get('statuses', [])]
+            page, link = page_of(statuses, endpoint, match.group(3) or '')
+            return respond(200, {"sha": pr['sha'], "total_count": len(statuses),
+                                 "statuses": page}, if_none_match, link)
+
+    respond(404, {"message": "Not Found"}, None)
+    print("gh: Not Found (HTTP 404)", file=sys.stderr)
+    return 404
+
+
+def pr_summary(number: str, pr: dict, t: float, start: float) -> dict:
+    """A PR as `gh pr list/view --json` shows it, checks as statusCheckRollup."""
+    closed = pr.get('closed_at') is not None and t >= pr['closed_at']
+    rollup = [dict(check_run(c, t, start), __typename='CheckRun') for c in pr.get('checks', [])]
+    for run in rollup:
+        run['status'] = run['status'].upper()
+        run['conclusion'] = (run['conclusion'] or '').upper()
+    rollup += [dict(commit_status(s, t, start), __typename='StatusContext',
+                    state=commit_status(s, t, start)['state'].upper())
+               for s in pr.get('statuses', [])]
+    return {
+        "number": int(number),
+        "headRefName": pr.get('ref', ''),
+        "state": 'MERGED' if closed else pr.get('state', 'open').upper(),
+        "url": f"https://github.com/o/r/pull/{number}",
+        "isDraft": False,
+        "reviewDecision": pr.get('review', ''),
+        "statusCheckRollup": rollup,
+    }
+
+
+def pr_command(args: list[str], scenario: dict) -> int:
+    t, start = elapsed()
+    pulls = scenario.get('pulls', {})
+    if args[:1] == ['list']:
+        prs = [pr_summary(n, pr, t, start) for n, pr in pulls.items()]
+        print(json.dumps([pr for pr in prs if pr['state'] == 'OPEN']))
+        return 200
+    if args[:1] == ['view'] and len(args) > 1 and args[1] in pulls:
+        print(json.dumps(pr_summary(args[1], pulls[args[1]], t, start)))
+        return 200
+    print("no pull requests found", file=sys.stderr)
+    return 404
+
+
+def main():
+    with open(os.environ['FAKE_GH_SCENARIO']) as f:
+        scenario = json.load(f)
+    args = sys.argv[1:]
+    code = 0
+    if args[:1] == ['api']:
+        status = api(args[1:], scenario)
+        code = 0 if status < 400 else 1
+    elif args[:1] == ['pr']:
+        status = pr_command(args[1:], scenario)
+        code = 0 if status < 400 else 1
+    elif args[:2] == ['run', 'view'] and '--job' in args:
+        job = args[args.index('--job') + 1]
+        log = scenario.get('logs', {}).get(job)
+        if log is None:
+            print(f"no logs for job {job}", file=sys.stderr)
+            code = 1
+        else:
+            sys.stdout.write(log if log.endswith('\n') else log + '\n')
+        status = 200 if code == 0 else 404
+    else:
+        print(f"fake gh: unsupported command {' '.join(args)}", file=sys.stderr)
+        status, code = 400, 1
+
+    log_path = os.environ.get('FAKE_GH_LOG')
+    if log_path:
+        with open(log_path, 'a') as f:
+            f.write(json.dumps({"args": args, "status": status}) + '\n')
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
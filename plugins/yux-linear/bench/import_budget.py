@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Enforce the cold-start import budget of the Linear hook entry point.
+
+Runs hooks/hooks.json's entry point (`python3 -I -S scripts/hook_entry.py`)
+under `-X importtime` against throwaway repos and checks, per scenario:
+- modules that must not be imported on that path (e.g. json/re/subprocess
+  for non-Linear projects, which should exit after a few stat calls)
+- how many modules are imported beyond the bare interpreter
+- their summed self import time, best of several runs, against a fixed
+  millisecond budget
+
+The first two are deterministic and catch a new import the moment it
+lands; the time budget is deliberately loose so that machine noise does
+not fail it, but a heavy new dependency still will.
+
+Usage:
+  python3 bench/import_budget.py [--runs N] [--verbose]
+
+Exit codes:
+  0 - All scenarios within budget
+  1 - A forbidden import or a budget overrun (details on stderr)
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+PLUGIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY = os.path.join(PLUGIN_DIR, 'scripts', 'hook_entry.py')
+PYTHON_FLAGS = ['-I', '-S']
+
+GIT_ENV = {
+    'GIT_AUTHOR_NAME': 'bench', 'GIT_AUTHOR_EMAIL': 'bench@example.com',
+    'GIT_COMMITTER_NAME': 'bench', 'GIT_COMMITTER_EMAIL': 'bench@example.com',
+}
+
+# Never needed before the guard says "Linear project"
+COLD_FORBIDDEN = {
+    'json', 're', 'pathlib', 'subprocess', 'socket', 'hashlib',
+    'contextlib', 'importlib', 'dataclasses', 'datetime', 'typing',
+}
+
+WARM_FORBIDDEN = {'subprocess', 'socket', 'hashlib', 'pathlib'}
+
+# (name, repo kind, event, payload, budget in ms, max modules, forbidden modules)
+SCENARIOS = [
+    ('non-linear PreToolUse Write', 'plain', 'PreToolUse',
+     '{"tool_name": "Write", "tool_input": {"file_path": "a.txt"}}', 8.0, 14, COLD_FORBIDDEN),
+    ('non-linear UserPromptSubmit', 'plain', 'UserPromptSubmit',
+     '{"prompt": "hello"}', 8.0, 14, COLD_FORBIDDEN),
+    ('non-linear PostToolUse Bash', 'plain', 'PostToolUse',
+     '{"tool_name": "Bash", "tool_input": {"command": "ls"}}', 8.0, 14, COLD_FORBIDDEN),
+    ('linear PreToolUse Write', 'linear', 'PreToolUse',
+     '{"tool_name": "Write", "tool_input": {"file_path": "a.txt"}}', 30.0, 40, WARM_FORBIDDEN),
+    ('linear UserPromptSubmit', 'linear', 'UserPromptSubmit',
+     '{"prompt": "hello"}', 30.0, 40, WARM_FORBIDDEN),
+]
+
+
+def git(cwd: str, *args: str) -> None:
+    subprocess.run(['git', *args], cwd=cwd, check=True, capture_output=True,
+                   env={**os.environ, **GIT_ENV})
+
+
+def make_repo(base: str, kind: str) -> str:
+    """Create a plain repo on main, or a Linear repo on a LIN branch."""
+    path = os.path.join(base, kind)
+    os.makedirs(path)
+    git(path, 'init', '-q', '-b', 'main')
+    git(path, 'commit', '-q', '--allow-empty', '-m', 'chore: init')
+    if kind == 'linear':
+        os.makedirs(os.path.join(path, '.claude'))
+        with open(os.path.join(path, '.claude', 'linear-config.json'), 'w') as f:
+            f.write('{"version": "1.0.0"}\n')
+        git(path, 'checkout', '-q', '-b', 'feat/LIN-1-budget')
+    return path
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """Map module -> self import time (us) from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        modules[parts[2].strip()] = int(parts[0])
+    return modules
+
+
+def importtime(cwd: str, args: list[str], stdin: str = '') -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *PYTHON_FLAGS, *args],
+        cwd=cwd, input=stdin, capture_output=True, text=True
+    )
+    return parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    # Warm __pycache__ so the budget measures imports, not compilation
+    subprocess.run([sys.executable, '-m', 'compileall', '-q',
+                    os.path.join(PLUGIN_DIR, 'scripts')], capture_output=True)
+
+    failures = []
+    with tempfile.TemporaryDirectory() as base:
+        repos = {kind: make_repo(base, kind) for kind in ('plain', 'linear')}
+        baseline = set(importtime(base, ['-c', 'pass']))
+
+        for name, kind, event, payload, budget_ms, max_modules, forbidden in SCENARIOS:
+            totals = []
+            extra: dict[str, int] = {}
+            for _ in range(args.runs):
+                modules = importtime(repos[kind], [ENTRY, event], payload)
+                extra = {m: t for m, t in modules.items() if m not in baseline}
+                totals.append(sum(extra.values()) / 1000)
+            best_ms = min(totals)
+
+            hits = sorted(forbidden & set(extra))
+            status = 'ok'
+            if hits:
+                status = 'FAIL'
+                failures.append(f"{name}: imports {', '.join(hits)}")
+            if len(extra) > max_modules:
+                status = 'FAIL'
+                failures.append(f"{name}: {len(extra)} modules imported > {max_modules} allowed")
+            if best_ms > budget_ms:
+                status = 'FAIL'
+                failures.append(f"{name}: {best_ms:.2f} ms of imports > {budget_ms:.1f} ms budget")
+
+            print(f"{status:4s}  {name:32s} {best_ms:6.2f} ms / {budget_ms:.1f} ms  "
+                  f"{len(extra):3d} / {max_modules} modules")
+            if args.verbose:
+                for module, us in sorted(extra.items(), key=lambda kv: -kv[1]):
+                    print(f"        {us / 1000:6.2f} ms  {module}")
+
+    if failures:
+        print("\nImport budget exceeded:", file=sys.stderr)
+        for failure in failures:
+            print(f"  - {failure}", file=sys.stderr)
+        sys.exit(1)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
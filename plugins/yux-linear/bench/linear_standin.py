@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Linear API surface the yux-linear skills and
+scripts use, so workflows can be run and timed without the live service.
+
+Serves, on one port:
+  POST /mcp       MCP over HTTP (JSON-RPC 2.0: initialize, tools/list,
+                  tools/call) with the tools the skills call:
+                  list_issues, get_issue, update_issue, create_comment,
+                  list_comments, list_cycles, list_issue_labels,
+                  list_teams, list_projects
+  POST /graphql   the paged `issues(filter, first, after)` query that
+                  scripts/_issue_mirror.py sync_graphql() sends
+  GET  /stats     calls, request/response bytes and server time per tool
+  POST /reset     zero the counters
+
+The dataset is generated from --seed: one team and project, three cycles,
+type and area labels, and --issues issues (100 to 100k) with a realistic
+state mix, estimates, assignees, due dates, parent epics and blocks
+relations, titles in English and Chinese. Writes (update_issue,
+create_comment) change it in memory and move updatedAt forward, so
+watermark syncs see them.
+
+Every response is held back by --latency-ms, plus up to --jitter-ms,
+plus --per-kb-ms for each KiB of body, to mimic a remote service.
+
+Usage:
+  python3 bench/linear_standin.py [--issues 5000] [--seed 0] [--port 8765]
+                                  [--latency-ms 0] [--jitter-ms 0] [--per-kb-ms 0]
+  python3 bench/linear_standin.py --issues 1000 --dump issues.json
+
+Point the scripts at it with LINEAR_API_URL=http://127.0.0.1:8765/graphql
+(linear_mirror.py sync); bench/bench_workflow.py drives the MCP side.
+"""
+
+import argparse
+import bisect
+import json
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 250
+
+STATES = [  # name, type, share of issues
+    ('Triage', 'triage', 0.03), ('Backlog', 'backlog', 0.40), ('Todo', 'unstarted', 0.15),
+    ('In Progress', 'started', 0.10), ('In Review', 'started', 0.05),
+    ('Done', 'completed', 0.25), ('Canceled', 'canceled', 0.02),
+]
+TYPE_LABELS = ['Feature', 'Bug', 'Improvement', 'Chore', 'Epic']
+AREA_LABELS = ['Frontend', 'Backend', 'API', 'Extension', 'ML']
+USERS = ['Ada Park', 'Ben Ortiz', 'Chen Wei', 'Dana Ito', 'Eli Novak', 'Fay Lund']
+EN_WORDS = """
+    login session token refresh retry timeout crash error page button modal settings
+    profile avatar upload export import csv search filter sort pagination cache offline
+    sync notification email push dark mode theme layout mobile ios android desktop slow
+    memory leak api webhook payment invoice billing subscription team invite role
+    permission dashboard chart report audit log editor draft share link preview
+""".split()
+ZH_WORDS = """
+    登录 会话 令牌 刷新 重试 超时 崩溃 错误 页面 按钮 设置 头像 上传 导出 导入 搜索 筛选
+    排序 缓存 离线 同步 通知 邮件 推送 暗黑 模式 主题 布局 内存 支付 发票 账单 订阅 团队
+""".split()
+
+
+def iso(moment: datetime) -> str:
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.') + f'{moment.microsecond // 1000:03d}Z'
+
+
+def parse_since(value: str, now: datetime) -> str:
+    """updatedAt argument: an ISO timestamp, or an ISO duration like -P7D."""
+    if value.startswith(('-P', 'P')):
+        amount = value.lstrip('-P')
+        days = int(amount[:-1]) if amount[-1:].upper() == 'D' else 0
+        weeks = int(amount[:-1]) if amount[-1:].upper() == 'W' else 0
+        return iso(now - timedelta(days=days, weeks=weeks))
+    return value
+
+
+class Dataset:
+    """Issues, comments and metadata of one generated workspace."""
+
+    def __init__(self, size: int, seed: int = 0):
+        rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.team = {"id": "team-1", "key": "LIN", "name": "Core"}
+        self.project = {"id": "project-1", "name": "App"}
+        self.states = {name.lower(): {"id": f"state-{i}", "name": name, "type": kind}
+                       for i, (name, kind, _) in enumerate(STATES)}
+        self.labels = [{"id": f"label-{i}", "name": name}
+                       for i, name in enumerate(TYPE_LABELS + AREA_LABELS)]
+        self.users = [{"id": f"user-{i}", "name": name,
+                       "email": name.split()[0].lower() + '@example.com'}
+                      for i, name in enumerate(USERS)]
+        now = EPOCH + timedelta(days=90)
+        self.cycles = []
+        for offset, kind in ((-1, 'previous'), (0, 'current'), (1, 'next')):
+            starts = now + timedelta(weeks=2 * offset - 1)
+            self.cycles.append({"id": f"cycle-{offset + 2}", "number": 20 + offset,
+                                "startsAt": iso(starts), "endsAt": iso(starts + timedelta(weeks=2)),
+                                "kind": kind})
+        self.issues: dict[str, dict] = {}
+        self.by_identifier: dict[str, str] = {}
+        self.by_updated: list[tuple[str, str]] = []
+        self.comments: dict[str, list[dict]] = {}
+        self.clock = now
+        self._matches: dict[str, list[dict]] = {}  # filtered lists, reused across pages
+        self._generate(size, rng, now)
+
+    def _generate(self, size: int, rng: random.Random, now: datetime) -> None:
+        state_list = [self.states[name.lower()] for name, _, _ in STATES]
+        shares = [share for _, _, share in STATES]
+        label_refs = [{"name": label['name']} for label in self.labels]
+        cycle_refs = [{k: v for k, v in cycle.items() if k != 'kind'} for cycle in self.cycles]
+        span = (now - EPOCH).total_seconds()
+        epics = []
+        for i in range(size):
+            chinese = rng.random() < 0.2
+            words = rng.sample(ZH_WORDS if chinese else EN_WORDS, rng.randint(3, 6))
+            title = ('' if chinese else ' ').join(words)
+            state = rng.choices(state_list, shares)[0]
+            created = EPOCH + timedelta(seconds=rng.random() * span * 0.9)
+            updated = created + timedelta(seconds=rng.random() * (now - created).total_seconds())
+            labels = [label_refs[rng.randrange(4)], label_refs[5 + rng.randrange(5)]]
+            issue = {
+                "id": f"issue-{i + 1}", "identifier": f"LIN-{i + 1}", "title": title,
+                "description": f"{title}\n\n" + ' '.join(rng.choices(EN_WORDS, k=rng.randint(10, 40))),
+                "priority": rng.choice([0, 1, 2, 2, 3, 3, 3, 4, 4]),
+                "estimate": rng.choice([None, 1, 2, 3, 5, 8]),
+                "dueDate": (now + timedelta(days=rng.randint(-10, 40))).date().isoformat()
+                if rng.random() < 0.1 else None,
+                "createdAt": iso(created), "updatedAt": iso(updated), "archivedAt": None,
+                "url": f"https://linear.app/example/issue/LIN-{i + 1}",
+                "state": {"name": state['name'], "type": state['type']},
+                "assignee": rng.choice(self.users + [None, None])
+                if state['type'] != 'triage' else None,
+                "cycle": rng.choice(cycle_refs[:2])
+                if state['type'] in ('unstarted', 'started', 'completed') and rng.random() < 0.7
+                else None,
+                "project": self.project, "parent": None,
+                "labels": {"nodes": labels},
+                "relations": {"nodes": []}, "inverseRelations": {"nodes": []},
+            }
+            if rng.random() < 0.02:
+                issue['labels'] = {"nodes": [label_refs[4]]}
+                epics.append(issue)
+            elif epics and rng.random() < 0.1:
+                epic = rng.choice(epics)
+                issue['parent'] = {"id": epic['id'], "identifier": epic['identifier']}
+            if i and rng.random() < 0.05:
+                blocked = self.issues[f"issue-{rng.randrange(1, i + 1)}"]
+                issue['relations']['nodes'].append(
+                    {"type": "blocks", "relatedIssue": {"id": blocked['id'],
+                                                        "identifier": blocked['identifier']}})
+                blocked['inverseRelations']['nodes'].append(
+                    {"type": "blocks", "issue": {"id": issue['id'],
+                                                 "identifier": issue['identifier']}})
+            self.issues[issue['id']] = issue
+            self.by_identifier[issue['identifier']] = issue['id']
+        self.by_updated = sorted((issue['updatedAt'], issue['id'])
+                                 for issue in self.issues.values())
+
+    # Lookups
+
+    def find(self, ref: str | None) -> dict | None:
+        if not ref:
+            return None
+        issue_id = self.by_identifier.get(str(ref).upper(), ref)
+        return self.issues.get(issue_id)
+
+    def _touch(self, issue: dict) -> None:
+        """Move updatedAt past every earlier write (keeps watermarks exact)."""
+        old = (issue['updatedAt'], issue['id'])
+        index = bisect.bisect_left(self.by_updated, old)
+        if index < len(self.by_updated) and self.by_updated[index] == old:
+            del self.by_updated[index]
+        latest = datetime.now(timezone.utc)
+        self.clock = max(self.clock + timedelta(milliseconds=1), latest)
+        issue['updatedAt'] = iso(self.clock)
+        self.by_updated.append((issue['updatedAt'], issue['id']))
+        self._matches.clear()
+
+    def cycle(self, ref) -> dict | None:
+        for cycle in self.cycles:
+            if ref in (cycle['id'], cycle['number'], str(cycle['number']), cycle['kind']):
+                return cycle
+        return None
+
+    # Tools
+
+    def list_issues(self, args: dict) -> dict:
+        limit = min(int(args.get('limit') or DEFAULT_LIMIT), MAX_LIMIT)
+        offset = int(args.get('cursor') or 0)
+        query_key = json.dumps({k: v for k, v in args.items() if k not in ('limit', 'cursor')},
+                               sort_keys=True)
+        matched = self._matches.get(query_key)
+        if matched is None:
+            matched = self._matches[query_key] = self._filter(args)
+        page = matched[offset:offset + limit]
+        more = offset + limit < len(matched)
+        return {"issues": page, "pageInfo": {"hasNextPage": more,
+                                             "endCursor": str(offset + limit) if more else None}}
+
+    def _filter(self, args: dict) -> list[dict]:
+        since = parse_since(args['updatedAt'], self.clock) if args.get('updatedAt') else None
+        start = bisect.bisect_left(self.by_updated, (since, '')) if since else 0
+        candidates = (self.issues[i] for _, i in self.by_updated[start:])
+        states = {s.strip().lower() for s in str(args.get('state') or '').split(',') if s.strip()}
+        assignee = str(args.get('assignee') or '').lower()
+        label = str(args.get('label') or '').lower()
+        cycle = self.cycle(args['cycle']) if args.get('cycle') else None
+        query = str(args.get('query') or '').lower()
+        project = args.get('project')
+
+        def wanted(issue: dict) -> bool:
+            if issue['archivedAt'] and not args.get('includeArchived'):
+                return False
+            if project and project not in (self.project['id'], self.project['name']):
+                return False
+            if states and issue['state']['name'].lower() not in states \
+                    and issue['state']['type'] not in states:
+                return False
+            if assignee:
+                person = issue['assignee'] or {}
+                if assignee not in (person.get('name', '').lower(), person.get('email', ''),
+                                    person.get('id')) and not (assignee == 'me' and person):
+                    return False
+            if label and label not in (n['name'].lower() for n in issue['labels']['nodes']):
+                return False
+            if cycle and (issue['cycle'] or {}).get('id') != cycle['id']:
+                return False
+            return not query or query in issue['title'].lower() or query == issue['identifier'].lower()
+
+        matched = [issue for issue in candidates if wanted(issue)]
+        if args.get('orderBy') == 'createdAt':
+            matched.sort(key=lambda issue: issue['createdAt'], reverse=True)
+        else:
+            matched.reverse()  # newest update first
+        return matched
+
+    def get_issue(self, args: dict) -> dict:
+        issue = self.find(args.get('id'))
+        if issue is None:
+            raise KeyError(f"issue {args.get('id')} not found")
+        return issue
+
+    def update_issue(self, args: dict) -> dict:
+        issue = self.get_issue(args)
+        if 'state' in args:
+            state = self.states.get(str(args['state']).lower())
+            if state is None:
+                raise KeyError(f"unknown state {args['state']}")
+            issue['state'] = {"name": state['name'], "type": state['type']}
+        for field in ('title', 'description', 'priority', 'estimate', 'dueDate'):
+            if field in args:
+                issue[field] = args[field]
+        if 'assignee' in args:
+            issue['assignee'] = next((u for u in self.users if args['assignee'] in
+                                      (u['id'], u['name'], u['email'])), None)
+        if 'labels' in args:
+            names = {label['id']: label['name'] for label in self.labels}
+            issue['labels'] = {"nodes": [{"name": names.get(ref, ref)} for ref in args['labels']]}
+        if 'cycle' in args:
+            cycle = self.cycle(args['cycle'])
+            issue['cycle'] = {k: v for k, v in cycle.items() if k != 'kind'} if cycle else None
+        self._touch(issue)
+        return issue
+
+    def create_comment(self, args: dict) -> dict:
+        issue = self.find(args.get('issueId'))
+        if issue is None:
+            raise KeyError(f"issue {args.get('issueId')} not found")
+        comments = self.comments.setdefault(issue['id'], [])
+        comment = {"id": f"comment-{issue['id']}-{len(comments) + 1}", "body": args.get('body', ''),
+                   "createdAt": iso(datetime.now(timezone.utc)),
+                   "issue": {"id": issue['id'], "identifier": issue['identifier']}}
+        comments.append(comment)
+        return comment
+
+    def list_comments(self, args: dict) -> dict:
+        issue = self.find(args.get('issueId'))
+        if issue is None:
+            raise KeyError(f"issue {args.get('issueId')} not found")
+        return {"comments": self.comments.get(issue['id'], [])}
+
+    def list_cycles(self, args: dict) -> list[dict]:
+        kind = args.get('type')
+        return [{k: v for k, v in c.items() if k != 'kind'}
+                for c in self.cycles if not kind or c['kind'] == kind]
+
+    def list_issue_labels(self, args: dict) -> list[dict]:
+        return self.labels
+
+    def list_teams(self, args: dict) -> list[dict]:
+        return [self.team]
+
+    def list_projects(self, args: dict) -> list[dict]:
+        return [self.project]
+
+    TOOLS = ('list_issues', 'get_issue', 'update_issue', 'create_comment', 'list_comments',
+             'list_cycles', 'list_issue_labels', 'list_teams', 'list_projects')
+
+    def call(self, tool: str, args: dict):
+        if tool not in self.TOOLS:
+            raise KeyError(f"unknown tool {tool}")
+        with self.lock:
+            return getattr(self, tool)(args)
+
+    # GraphQL subset
+
+    def graphql(self, query: str, variables: dict) -> dict:
+        if 'issues(' not in query:
+            raise KeyError("only the issues(filter, first, after) query is served")
+        filter_ = variables.get('filter') or {}
+        args = {"limit": variables.get('first') or DEFAULT_LIMIT, "cursor": variables.get('after'),
+                "includeArchived": True,
+                "updatedAt": (filter_.get('updatedAt') or {}).get('gte'),
+                "project": ((filter_.get('project') or {}).get('id') or {}).get('eq')}
+        with self.lock:
+            page = self.list_issues({k: v for k, v in args.items() if v is not None})
+        return {"issues": {"nodes": page['issues'], "pageInfo": page['pageInfo']}}
+
+
+class Stats:
+    """Per-tool call counters."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.rows = {}
+
+    def add(self, name: str, sent: int, received: int, seconds: float) -> None:
+        with self.lock:
+            row = self.rows.setdefault(name, {"calls": 0, "request_bytes": 0,
+                                              "response_bytes": 0, "server_ms": 0.0})
+            row['calls'] += 1
+            row['request_bytes'] += received
+            row['response_bytes'] += sent
+            row['server_ms'] = round(row['server_ms'] + seconds * 1000, 3)
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return json.loads(json.dumps(self.rows))
+
+    def reset(self) -> None:
+        with self.lock:
+            self.rows.clear()
+
+
+def make_handler(dataset: Dataset, stats: Stats, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, per_kb_ms: float = 0.0):
+    rng = random.Random()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, payload, name: str | None = None,
+                  received: int = 0, started: float = 0.0) -> None:
+            body = b'' if payload is None else json.dumps(payload, ensure_ascii=False).encode()
+            delay = latency_ms + rng.random() * jitter_ms + per_kb_ms * len(body) / 1024
+            if name:
+                stats.add(name, len(body), received, time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay / 1000)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/stats':
+                self._send(200, stats.snapshot())
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            started = time.perf_counter()
+            raw = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            if self.path == '/reset':
+                stats.reset()
+                self._send(200, {"ok": True})
+                return
+            try:
+                request = json.loads(raw or b'{}')
+            except ValueError:
+                self._send(400, {"error": "invalid JSON"})
+                return
+            if self.path == '/graphql':
+                try:
+                    data = dataset.graphql(request.get('query') or '', request.get('variables') or {})
+                    reply = {"data": data}
+                except (KeyError, ValueError, TypeError) as e:
+                    reply = {"errors": [{"message": str(e).strip("'\"")}]}
+                self._send(200, reply, 'graphql:issues', len(raw), started)
+            elif self.path == '/mcp':
+                self._mcp(request, raw, started)
+            else:
+                self._send(404, {"error": "not found"})
+
+        def _mcp(self, request: dict, raw: bytes, started: float) -> None:
+            method, rid = request.get('method'), request.get('id')
+            if rid is None:
+                self._send(202, None)  # notification
+                return
+            name = method
+            if method == 'initialize':
+                result = {"protocolVersion": "2025-03-26", "capabilities": {"tools": {}},
+                          "serverInfo": {"name": "linear-standin", "version": "1.0"}}
+            elif method == 'tools/list':
+                result = {"tools": [{"name": tool, "inputSchema": {"type": "object"}}
+                                    for tool in Dataset.TOOLS]}
+            elif method == 'tools/call':
+                params = request.get('params') or {}
+                name = params.get('name')
+                try:
+                    value = dataset.call(name, params.get('arguments') or {})
+                    result = {"content": [{"type": "text",
+                                           "text": json.dumps(value, ensure_ascii=False)}]}
+                except (KeyError, ValueError, TypeError) as e:
+                    result = {"content": [{"type": "text", "text": str(e).strip("'\"")}],
+                              "isError": True}
+            else:
+                self._send(200, {"jsonrpc": "2.0", "id": rid,
+                                 "error": {"code": -32601, "message": f"unknown method {method}"}})
+                return
+            self._send(200, {"jsonrpc": "2.0", "id": rid, "result": result},
+                       name, len(raw), started)
+
+    return Handler
+
+
+def serve(dataset: Dataset, port: int = 0, host: str = '127.0.0.1', **latency):
+    """Start the stand-in on a daemon thread; returns (server, stats, base url)."""
+    stats = Stats()
+    server = ThreadingHTTPServer((host, port), make_handler(dataset, stats, **latency))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stats, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Linear MCP/GraphQL stand-in")
+    parser.add_argument('--issues', type=int, default=5000, help="dataset size (100-100000)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765, help="0 picks a free port")
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--per-kb-ms', type=float, default=0.0)
+    parser.add_argument('--dump', help="write the generated issues as JSON and exit")
+    args = parser.parse_args()
+
+    dataset = Dataset(max(1, args.issues), args.seed)
+    if args.dump:
+        with open(args.dump, 'w') as f:
+            json.dump(list(dataset.issues.values()), f, ensure_ascii=False)
+        print(f"Wrote {len(dataset.issues)} issues to {args.dump}")
+        return
+    server, _, url = serve(dataset, args.port, args.host, latency_ms=args.latency_ms,
+                           jitter_ms=args.jitter_ms, per_kb_ms=args.per_kb_ms)
+    print(f"Linear stand-in: {url}/mcp (MCP), {url}/graphql, {url}/stats "
+          f"- {len(dataset.issues)} issues", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Cycle metrics kept next to the issue mirror (same SQLite file): per-cycle
+effort totals, daily burndown snapshots and closed-cycle velocity.
+
+Effort is the effort map of yux-pm-plan (_sprint_solver.size_of(), issues
+without an estimate count as DEFAULT_SIZE), stored in integer units of
+UNITS_PER_DAY per day. Canceled and archived issues are out of scope.
+
+Tables:
+  cycle_info     number and start/end dates per cycle
+  cycle_issues   each mirrored issue's current contribution (cycle, units, done)
+  cycle_totals   running scope / done totals per cycle
+  cycle_days     one row per cycle and day the totals changed (or a
+                 snapshot was taken); burndown fills the days between
+  cycle_history  cycles whose end date has passed, frozen at close, in end
+                 order (seq) with prefix sums of done effort and business
+                 days
+
+Every stored issue moves its contribution between totals (subtract the
+old row, add the new), so keeping the metrics costs O(1) per issue; the
+totals of a changed open cycle are then written as today's row. A cycle
+is closed the first time a snapshot sees its end date in the past, so a
+velocity over the last N cycles is the difference of two prefix-sum rows,
+whatever the history length. The mirror takes the snapshot once per
+complete change set (after the last page of a sync), since a cycle closed
+from a partial set would keep the partial totals.
+
+Velocity of a cycle is the effort completed in it (issues still in the
+cycle and done); carried-over issues count in the cycle they finish in.
+Cycles closed from an initial backfill get their velocity this way too,
+but no daily history.
+"""
+
+import math
+from datetime import date, datetime, timedelta, timezone
+
+from _issue_scoring import cycle_id, issue_key, parse_date, state_of
+from _sprint_solver import EFFORT_DAYS, UNITS_PER_DAY, days_to_units, effort_days, size_of
+
+DEFAULT_SIZE = 'M'
+DEFAULT_CYCLES = 3
+DEFAULT_BUFFER = 0.2
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS cycle_info (
+        cycle TEXT PRIMARY KEY,
+        number INTEGER,
+        starts TEXT,
+        ends TEXT
+    );
+    CREATE TABLE IF NOT EXISTS cycle_issues (
+        issue TEXT PRIMARY KEY,
+        cycle TEXT NOT NULL,
+        units INTEGER NOT NULL,
+        done INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS cycle_totals (
+        cycle TEXT PRIMARY KEY,
+        scope_units INTEGER NOT NULL DEFAULT 0,
+        done_units INTEGER NOT NULL DEFAULT 0,
+        issues INTEGER NOT NULL DEFAULT 0,
+        done_issues INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS cycle_days (
+        cycle TEXT NOT NULL,
+        day TEXT NOT NULL,
+        scope_units INTEGER NOT NULL,
+        done_units INTEGER NOT NULL,
+        issues INTEGER NOT NULL,
+        done_issues INTEGER NOT NULL,
+        PRIMARY KEY (cycle, day)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS cycle_history (
+        cycle TEXT PRIMARY KEY,
+        seq INTEGER NOT NULL UNIQUE,
+        ends TEXT NOT NULL,
+        business_days INTEGER NOT NULL,
+        scope_units INTEGER NOT NULL,
+        done_units INTEGER NOT NULL,
+        done_prefix INTEGER NOT NULL,
+        days_prefix INTEGER NOT NULL
+    );
+"""
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def business_days(start: date, end: date) -> int:
+    """Weekdays in [start, end)."""
+    days = (end - start).days
+    if days <= 0:
+        return 0
+    weeks, rest = divmod(days, 7)
+    weekday = start.weekday()
+    return weeks * 5 + sum(1 for i in range(rest) if (weekday + i) % 7 < 5)
+
+
+def contribution(issue: dict, default: str = DEFAULT_SIZE) -> tuple[str, int, int] | None:
+    """(cycle, effort units, done) of an issue, None when it counts for no cycle."""
+    cid = cycle_id(issue.get('cycle') or issue.get('cycleId'))
+    if not cid or issue.get('archivedAt'):
+        return None
+    name, kind = state_of(issue)
+    if kind in ('canceled', 'cancelled') or name in ('canceled', 'cancelled', 'duplicate'):
+        return None
+    done = kind == 'completed' or name in ('done', 'merged', 'closed')
+    return cid, days_to_units(effort_days(size_of(issue, default))), int(done)
+
+
+def _days(units: int) -> float:
+    return units / UNITS_PER_DAY
+
+
+class CycleMetrics:
+    """Cycle metrics on an open SQLite connection (autocommit mode)."""
+
+    def __init__(self, conn, default_size: str = DEFAULT_SIZE):
+        self.conn = conn
+        self.default_size = default_size if default_size in EFFORT_DAYS else DEFAULT_SIZE
+        self.touched: set[str] = set()
+        conn.executescript(SCHEMA)
+
+    def _run(self, fn, *args):
+        owned = not self.conn.in_transaction
+        if owned:
+            self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = fn(*args)
+        except BaseException:
+            if owned:
+                self.conn.execute('ROLLBACK')
+            raise
+        if owned:
+            self.conn.execute('COMMIT')
+        return result
+
+    # Low-level updates (inside a transaction)
+
+    def _set_info(self, cycle: dict) -> None:
+        cid = cycle_id(cycle)
+        starts, ends = cycle.get('startsAt'), cycle.get('endsAt')
+        if not cid:
+            return
+        number = cycle.get('number') if isinstance(cycle.get('number'), int) else None
+        self.conn.execute(
+            'INSERT INTO cycle_info (cycle, number, starts, ends) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT(cycle) DO UPDATE SET number = coalesce(excluded.number, number), '
+            'starts = coalesce(excluded.starts, starts), ends = coalesce(excluded.ends, ends)',
+            (cid, number, starts[:10] if isinstance(starts, str) else None,
+             ends[:10] if isinstance(ends, str) else None))
+
+    def _add(self, cycle: str, units: int, done: int, sign: int) -> None:
+        self.conn.execute(
+            'INSERT INTO cycle_totals (cycle, scope_units, done_units, issues, done_issues) '
+            'VALUES (?, ?, ?, ?, ?) ON CONFLICT(cycle) DO UPDATE SET '
+            'scope_units = scope_units + excluded.scope_units, '
+            'done_units = done_units + excluded.done_units, '
+            'issues = issues + excluded.issues, done_issues = done_issues + excluded.done_issues',
+            (cycle, sign * units, sign * units * done, sign, sign * done))
+        self.touched.add(cycle)
+
+    def _update_issue(self, issue: dict) -> None:
+        key = str(issue.get('id') or issue_key(issue))
+        if not key:
+            return
+        if isinstance(issue.get('cycle'), dict):
+            self._set_info(issue['cycle'])
+        new = contribution(issue, self.default_size)
+        row = self.conn.execute('SELECT cycle, units, done FROM cycle_issues WHERE issue = ?',
+                                (key,)).fetchone()
+        old = tuple(row) if row else None
+        if old == new:
+            return
+        if old:
+            self._add(*old, -1)
+        if new:
+            self._add(*new, 1)
+            self.conn.execute('INSERT OR REPLACE INTO cycle_issues VALUES (?, ?, ?, ?)',
+                              (key, *new))
+        else:
+            self.conn.execute('DELETE FROM cycle_issues WHERE issue = ?', (key,))
+
+    def _record(self, cycle: str, day: str) -> None:
+        self.conn.execute(
+            'INSERT OR REPLACE INTO cycle_days SELECT cycle, ?, scope_units, done_units, '
+            'issues, done_issues FROM cycle_totals WHERE cycle = ?', (day, cycle))
+
+    def _close_ended(self, today: date) -> None:
+        """Freeze the cycles that ended before today into cycle_history."""
+        ended = self.conn.execute(
+            'SELECT i.cycle, i.starts, i.ends, t.scope_units, t.done_units '
+            'FROM cycle_info i JOIN cycle_totals t ON t.cycle = i.cycle '
+            'WHERE i.ends IS NOT NULL AND i.ends < ? '
+            'AND i.cycle NOT IN (SELECT cycle FROM cycle_history) ORDER BY i.ends',
+            (today.isoformat(),)).fetchall()
+        if not ended:
+            return
+        last = self.conn.execute('SELECT seq, ends, done_prefix, days_prefix FROM cycle_history '
+                                 'ORDER BY seq DESC LIMIT 1').fetchone()
+        seq, last_end, done_prefix, days_prefix = last or (0, '', 0, 0)
+        renumber = False
+        for cycle, starts, ends, scope, done in ended:
+            start = parse_date(starts) or parse_date(ends) - timedelta(days=14)
+            bdays = business_days(start, parse_date(ends))
+            renumber = renumber or ends < last_end
+            seq += 1
+            done_prefix += done
+            days_prefix += bdays
+            self.conn.execute('INSERT INTO cycle_history VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                              (cycle, seq, ends, bdays, scope, done, done_prefix, days_prefix))
+        if renumber:
+            # A cycle older than the newest closed one arrived late: redo the order
+            rows = self.conn.execute('SELECT cycle, business_days, done_units FROM cycle_history '
+                                     'ORDER BY ends, cycle').fetchall()
+            self.conn.execute('UPDATE cycle_history SET seq = -seq')
+            done_prefix = days_prefix = 0
+            for seq, (cycle, bdays, done) in enumerate(rows, 1):
+                done_prefix += done
+                days_prefix += bdays
+                self.conn.execute('UPDATE cycle_history SET seq = ?, done_prefix = ?, '
+                                  'days_prefix = ? WHERE cycle = ?',
+                                  (seq, done_prefix, days_prefix, cycle))
+
+    def _snapshot(self, today: date) -> None:
+        day = today.isoformat()
+        open_cycles = {c for (c,) in self.conn.execute(
+            'SELECT cycle FROM cycle_info WHERE starts <= ? AND ends > ?', (day, day))}
+        for cycle in sorted(self.touched & open_cycles) if self.touched else ():
+            self._record(cycle, day)
+        self.touched.clear()
+        self._close_ended(today)
+
+    # Updates
+
+    def update_issue(self, issue: dict) -> None:
+        """Move one issue's effort to its current cycle."""
+        self._run(self._update_issue, issue)
+
+    def set_cycles(self, cycles: list[dict]) -> None:
+        """Store numbers and dates (e.g. from list_cycles)."""
+        def apply():
+            for cycle in cycles:
+                if isinstance(cycle, dict):
+                    self._set_info(cycle)
+        self._run(apply)
+
+    def snapshot(self, today: date | None = None, everything: bool = False) -> None:
+        """Write today's row for the open cycles changed since the last
+        snapshot (every open cycle with everything) and close ended cycles."""
+        def apply():
+            if everything:
+                self.touched.update(c for (c,) in self.conn.execute(
+                    'SELECT cycle FROM cycle_totals'))
+            self._snapshot(today or utc_today())
+        self._run(apply)
+
+    def rebuild(self, issues) -> None:
+        """Recompute the running totals from an iterable of issues; daily rows
+        and closed history are kept."""
+        def apply():
+            self.conn.execute('DELETE FROM cycle_issues')
+            self.conn.execute('DELETE FROM cycle_totals')
+            for issue in issues:
+                self._update_issue(issue)
+            self.touched.clear()
+        self._run(apply)
+
+    # Queries
+
+    def current(self, today: date | None = None) -> str | None:
+        """The cycle running today, else the one that started most recently."""
+        day = (today or utc_today()).isoformat()
+        row = self.conn.execute(
+            'SELECT cycle FROM cycle_info WHERE starts <= ? AND ends > ? '
+            'ORDER BY starts DESC LIMIT 1', (day, day)).fetchone() or self.conn.execute(
+            'SELECT cycle FROM cycle_info WHERE starts <= ? ORDER BY starts DESC LIMIT 1',
+            (day,)).fetchone()
+        return row[0] if row else None
+
+    def progress(self, cycle: str) -> dict | None:
+        """Current totals of a cycle."""
+        row = self.conn.execute(
+            'SELECT i.number, i.starts, i.ends, t.scope_units, t.done_units, t.issues, '
+            't.done_issues FROM cycle_totals t LEFT JOIN cycle_info i ON i.cycle = t.cycle '
+            'WHERE t.cycle = ?', (cycle,)).fetchone()
+        if row is None:
+            return None
+        number, starts, ends, scope, done, issues, done_issues = row
+        return {
+            "cycle": cycle, "number": number, "starts": starts, "ends": ends,
+            "issues": issues, "done_issues": done_issues,
+            "scope_days": _days(scope), "done_days": _days(done),
+            "remaining_days": _days(scope - done),
+            "progress": round(done / scope, 3) if scope else 0.0,
+        }
+
+    def burndown(self, cycle: str, today: date | None = None) -> list[dict]:
+        """One point per business day from the cycle start to today (or its
+        end), each day carrying the last snapshot taken on or before it."""
+        info = self.conn.execute('SELECT starts, ends FROM cycle_info WHERE cycle = ?',
+                                 (cycle,)).fetchone()
+        rows = self.conn.execute('SELECT day, scope_units, done_units FROM cycle_days '
+                                 'WHERE cycle = ? ORDER BY day', (cycle,)).fetchall()
+        if not info or not info[0] or not info[1] or not rows:
+            return []
+        start, end = parse_date(info[0]), parse_date(info[1])
+        stop = min(today or utc_today(), end - timedelta(days=1))
+        total = business_days(start, end) or 1
+        committed = rows[0][1]
+        points, index, last = [], 0, None
+        day, elapsed = start, 0
+        while day <= stop:
+            while index < len(rows) and rows[index][0] <= day.isoformat():
+                last = rows[index]
+                index += 1
+            if day.weekday() < 5:
+                if last:
+                    scope, done = last[1], last[2]
+                    points.append({
+                        "day": day.isoformat(), "scope_days": _days(scope),
+                        "done_days": _days(done), "remaining_days": _days(scope - done),
+                        "ideal_days": round(_days(committed) * max(0.0, 1 - elapsed / total), 2),
+                    })
+                elapsed += 1
+            day += timedelta(days=1)
+        return points
+
+    def velocity(self, cycles: int = DEFAULT_CYCLES) -> dict:
+        """Done effort over the last `cycles` closed cycles, from two prefix rows."""
+        last = self.conn.execute('SELECT seq, done_prefix, days_prefix FROM cycle_history '
+                                 'ORDER BY seq DESC LIMIT 1').fetchone()
+        if not last or cycles < 1:
+            return {"cycles": 0, "done_days": 0.0, "per_cycle_days": None,
+                    "business_days": 0, "per_business_day": None}
+        seq, done_prefix, days_prefix = last
+        count = min(cycles, seq)
+        before = self.conn.execute('SELECT done_prefix, days_prefix FROM cycle_history '
+                                   'WHERE seq = ?', (seq - count,)).fetchone() or (0, 0)
+        done = done_prefix - before[0]
+        bdays = days_prefix - before[1]
+        return {
+            "cycles": count, "done_days": _days(done),
+            "per_cycle_days": round(_days(done) / count, 2),
+            "business_days": bdays,
+            "per_business_day": round(_days(done) / bdays, 3) if bdays else None,
+        }
+
+    def suggest_capacity(self, days: float, cycles: int = DEFAULT_CYCLES,
+                         buffer: float = DEFAULT_BUFFER) -> dict:
+        """Effective days for a cycle of `days` business days: measured
+        throughput when closed cycles exist, else days minus the buffer."""
+        measured = self.velocity(cycles)
+        rate = measured['per_business_day']
+        if rate:
+            capacity = math.floor(rate * days * UNITS_PER_DAY + 1e-9) / UNITS_PER_DAY
+            return {"capacity_days": capacity, "source": "measured", **measured}
+        return {"capacity_days": days * (1 - buffer), "source": "buffer", "buffer": buffer,
+                **measured}
+
+    def history(self, limit: int | None = None) -> list[dict]:
+        sql = ('SELECT h.cycle, i.number, h.ends, h.business_days, h.scope_units, h.done_units '
+               'FROM cycle_history h LEFT JOIN cycle_info i ON i.cycle = h.cycle '
+               'ORDER BY h.seq DESC')
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        return [{"cycle": cycle, "number": number, "ends": ends, "business_days": bdays,
+                 "scope_days": _days(scope), "done_days": _days(done)}
+                for cycle, number, ends, bdays, scope, done in self.conn.execute(sql)]
+
+    def stats(self) -> dict:
+        count = lambda sql: self.conn.execute(sql).fetchone()[0]
+        return {
+            "cycles": count('SELECT COUNT(*) FROM cycle_totals'),
+            "issues": count('SELECT COUNT(*) FROM cycle_issues'),
+            "snapshots": count('SELECT COUNT(*) FROM cycle_days'),
+            "closed": count('SELECT COUNT(*) FROM cycle_history'),
+        }
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Issue dependency index kept next to the issue mirror (same SQLite file).
+
+Tables:
+  dep_nodes    one row per issue seen as an issue, blocker or parent:
+               done / in_progress flags, parent key, and open_blockers,
+               the number of direct blockers that are not done
+  dep_edges    direct "blocker blocks blocked" relations, indexed both ways
+  dep_closure  every (issue, transitive blocker) pair
+
+Every change is applied incrementally: a state flip adjusts open_blockers
+of the issue's direct dependents, adding a relation extends the closure by
+(ancestors x descendants) of the new edge, and removing one recomputes the
+closure of the edge's descendants only. So the scoring terms (blocked,
+blocks_others, blockers_done, epic_in_progress) and "what does closing
+LIN-123 unblock" are index lookups over an issue's own relations.
+
+Issues are keyed by identifier (issue_key()); blockers that were never
+seen as issues count as open, as in references/issue-scoring.md.
+"""
+
+from _issue_scoring import blocked_ids_of, blockers_of, is_done, issue_key, parent_of, state_of
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS dep_nodes (
+        key TEXT PRIMARY KEY,
+        done INTEGER NOT NULL DEFAULT 0,
+        in_progress INTEGER NOT NULL DEFAULT 0,
+        known INTEGER NOT NULL DEFAULT 0,
+        open_blockers INTEGER NOT NULL DEFAULT 0,
+        parent TEXT
+    );
+    CREATE INDEX IF NOT EXISTS dep_nodes_parent ON dep_nodes(parent);
+    CREATE TABLE IF NOT EXISTS dep_edges (
+        blocker TEXT NOT NULL,
+        blocked TEXT NOT NULL,
+        PRIMARY KEY (blocker, blocked)
+    );
+    CREATE INDEX IF NOT EXISTS dep_edges_blocked ON dep_edges(blocked, blocker);
+    CREATE TABLE IF NOT EXISTS dep_closure (
+        issue TEXT NOT NULL,
+        blocker TEXT NOT NULL,
+        PRIMARY KEY (issue, blocker)
+    );
+    CREATE INDEX IF NOT EXISTS dep_closure_blocker ON dep_closure(blocker, issue);
+"""
+
+# Fields whose presence means the payload lists all of an issue's blockers
+# (or all the issues it blocks); otherwise relations are only added.
+BLOCKER_FIELDS = ('blockedBy', 'blocked_by', 'inverseRelations')
+DEPENDENT_FIELDS = ('blocks', 'relations')
+
+_BATCH = 500
+
+
+class DepGraph:
+    """Dependency index on an open SQLite connection (autocommit mode)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        conn.executescript(SCHEMA)
+
+    def _begin(self) -> bool:
+        """Start a transaction unless the caller already holds one."""
+        if self.conn.in_transaction:
+            return False
+        self.conn.execute('BEGIN IMMEDIATE')
+        return True
+
+    def _end(self, owned: bool, ok: bool) -> None:
+        if owned:
+            self.conn.execute('COMMIT' if ok else 'ROLLBACK')
+
+    def _run(self, fn, *args):
+        owned = self._begin()
+        try:
+            result = fn(*args)
+        except BaseException:
+            self._end(owned, False)
+            raise
+        self._end(owned, True)
+        return result
+
+    # Low-level updates (inside a transaction)
+
+    def _node(self, key: str) -> tuple[int, int, int]:
+        """(done, in_progress, known), creating an open node if needed."""
+        row = self.conn.execute(
+            'SELECT done, in_progress, known FROM dep_nodes WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            self.conn.execute('INSERT INTO dep_nodes (key) VALUES (?)', (key,))
+            return 0, 0, 0
+        return row
+
+    def _set_state(self, key: str, done: bool, in_progress: bool, known: bool = True) -> None:
+        was_done, _, was_known = self._node(key)
+        if was_known and not known:
+            # An embedded copy inside another issue never overrides the issue itself
+            return
+        if bool(was_done) != done:
+            self.conn.execute(
+                'UPDATE dep_nodes SET open_blockers = open_blockers + ? '
+                'WHERE key IN (SELECT blocked FROM dep_edges WHERE blocker = ?)',
+                (-1 if done else 1, key))
+        self.conn.execute(
+            'UPDATE dep_nodes SET done = ?, in_progress = ?, known = MAX(known, ?) WHERE key = ?',
+            (int(done), int(in_progress), int(known), key))
+
+    def _add_edge(self, blocker: str, blocked: str) -> None:
+        if blocker == blocked:
+            return
+        conn = self.conn
+        blocker_done = self._node(blocker)[0]
+        self._node(blocked)
+        if conn.execute('INSERT OR IGNORE INTO dep_edges VALUES (?, ?)',
+                        (blocker, blocked)).rowcount == 0:
+            return
+        if not blocker_done:
+            conn.execute('UPDATE dep_nodes SET open_blockers = open_blockers + 1 WHERE key = ?',
+                         (blocked,))
+        ancestors = [blocker] + [r[0] for r in conn.execute(
+            'SELECT blocker FROM dep_closure WHERE issue = ?', (blocker,))]
+        descendants = [blocked] + [r[0] for r in conn.execute(
+            'SELECT issue FROM dep_closure WHERE blocker = ?', (blocked,))]
+        conn.executemany('INSERT OR IGNORE INTO dep_closure VALUES (?, ?)',
+                         [(d, a) for d in descendants for a in ancestors if d != a])
+
+    def _remove_edge(self, blocker: str, blocked: str) -> None:
+        conn = self.conn
+        if conn.execute('DELETE FROM dep_edges WHERE blocker = ? AND blocked = ?',
+                        (blocker, blocked)).rowcount == 0:
+            return
+        if not self._node(blocker)[0]:
+            conn.execute('UPDATE dep_nodes SET open_blockers = open_blockers - 1 WHERE key = ?',
+                         (blocked,))
+        # Only issues downstream of the removed edge can lose closure rows
+        affected = [blocked] + [r[0] for r in conn.execute(
+            'SELECT issue FROM dep_closure WHERE blocker = ?', (blocked,))]
+        for issue in affected:
+            conn.execute('DELETE FROM dep_closure WHERE issue = ?', (issue,))
+            conn.executemany('INSERT OR IGNORE INTO dep_closure VALUES (?, ?)',
+                             [(issue, b) for b in self._walk_blockers(issue)])
+
+    def _walk_blockers(self, key: str) -> set[str]:
+        seen: set[str] = set()
+        stack = [key]
+        while stack:
+            for (blocker,) in self.conn.execute(
+                    'SELECT blocker FROM dep_edges WHERE blocked = ?', (stack.pop(),)):
+                if blocker not in seen and blocker != key:
+                    seen.add(blocker)
+                    stack.append(blocker)
+        return seen
+
+    def _replace_edges(self, key: str, column: str, wanted: set[str]) -> None:
+        """Make `wanted` the full set of blockers (column 'blocker') or dependents."""
+        other = 'blocked' if column == 'blocker' else 'blocker'
+        current = {r[0] for r in self.conn.execute(
+            f'SELECT {column} FROM dep_edges WHERE {other} = ?', (key,))}
+        for ref in current - wanted:
+            if column == 'blocker':
+                self._remove_edge(ref, key)
+            else:
+                self._remove_edge(key, ref)
+        self._add_edges(key, column, wanted - current)
+
+    def _add_edges(self, key: str, column: str, refs) -> None:
+        for ref in refs:
+            if column == 'blocker':
+                self._add_edge(ref, key)
+            else:
+                self._add_edge(key, ref)
+
+    def _update_issue(self, issue: dict) -> None:
+        key = issue_key(issue)
+        if not key:
+            return
+        self._set_state(key, is_done(issue), state_of(issue)[0] == 'in progress')
+
+        parent = parent_of(issue)
+        if parent is not None:
+            self._node(parent[0])
+            if parent[1] and (parent[1].get('state') or parent[1].get('status')):
+                self._set_state(parent[0], is_done(parent[1]),
+                                state_of(parent[1])[0] == 'in progress', known=False)
+        if parent is not None or 'parent' in issue or 'parentId' in issue:
+            self.conn.execute('UPDATE dep_nodes SET parent = ? WHERE key = ?',
+                              (parent[0] if parent else None, key))
+
+        blockers = blockers_of(issue)
+        for ref, embedded in blockers:
+            if embedded and (embedded.get('state') or embedded.get('status')):
+                self._set_state(ref, is_done(embedded),
+                                state_of(embedded)[0] == 'in progress', known=False)
+        refs = {ref for ref, _ in blockers}
+        if any(field in issue for field in BLOCKER_FIELDS):
+            self._replace_edges(key, 'blocker', refs)
+        else:
+            self._add_edges(key, 'blocker', refs)
+
+        dependents = set(blocked_ids_of(issue))
+        if any(field in issue for field in DEPENDENT_FIELDS):
+            self._replace_edges(key, 'blocked', dependents)
+        else:
+            self._add_edges(key, 'blocked', dependents)
+
+    # Updates
+
+    def update_issue(self, issue: dict) -> None:
+        """Apply one issue's state, parent and relations from its payload."""
+        self._run(self._update_issue, issue)
+
+    def set_state(self, key: str, done: bool, in_progress: bool = False) -> None:
+        self._run(self._set_state, key, done, in_progress)
+
+    def add_relation(self, blocker: str, blocked: str) -> None:
+        self._run(self._add_edge, blocker, blocked)
+
+    def remove_relation(self, blocker: str, blocked: str) -> None:
+        self._run(self._remove_edge, blocker, blocked)
+
+    def set_parent(self, key: str, parent: str | None) -> None:
+        def apply():
+            self._node(key)
+            if parent:
+                self._node(parent)
+            self.conn.execute('UPDATE dep_nodes SET parent = ? WHERE key = ?', (parent, key))
+        self._run(apply)
+
+    def rebuild(self, issues) -> None:
+        """Drop the index and rebuild it from an iterable of issues."""
+        def apply():
+            for table in ('dep_closure', 'dep_edges', 'dep_nodes'):
+                self.conn.execute(f'DELETE FROM {table}')
+            for issue in issues:
+                self._update_issue(issue)
+        self._run(apply)
+
+    # Queries
+
+    def state(self, key: str) -> dict | None:
+        row = self.conn.execute(
+            'SELECT done, in_progress, known, open_blockers, parent FROM dep_nodes WHERE key = ?',
+            (key,)).fetchone()
+        if row is None:
+            return None
+        return {"done": bool(row[0]), "in_progress": bool(row[1]), "known": bool(row[2]),
+                "open_blockers": row[3], "parent": row[4]}
+
+    def blockers(self, key: str) -> list[tuple[str, bool]]:
+        """Direct blockers as (key, done)."""
+        return [(k, bool(d)) for k, d in self.conn.execute(
+            'SELECT e.blocker, n.done FROM dep_edges e JOIN dep_nodes n ON n.key = e.blocker '
+            'WHERE e.blocked = ? ORDER BY e.blocker', (key,))]
+
+    def dependents(self, key: str) -> list[tuple[str, bool]]:
+        """Issues this one blocks directly, as (key, done)."""
+        return [(k, bool(d)) for k, d in self.conn.execute(
+            'SELECT e.blocked, n.done FROM dep_edges e JOIN dep_nodes n ON n.key = e.blocked '
+            'WHERE e.blocker = ? ORDER BY e.blocked', (key,))]
+
+    def transitive_blockers(self, key: str, open_only: bool = False) -> list[str]:
+        sql = ('SELECT c.blocker FROM dep_closure c JOIN dep_nodes n ON n.key = c.blocker '
+               'WHERE c.issue = ?')
+        if open_only:
+            sql += ' AND n.done = 0'
+        return [r[0] for r in self.conn.execute(sql + ' ORDER BY c.blocker', (key,))]
+
+    def waiting_on(self, key: str) -> list[str]:
+        """Open issues downstream of key, directly or transitively."""
+        return [r[0] for r in self.conn.execute(
+            'SELECT c.issue FROM dep_closure c JOIN dep_nodes n ON n.key = c.issue '
+            'WHERE c.blocker = ? AND n.done = 0 ORDER BY c.issue', (key,))]
+
+    def unblocks(self, key: str) -> list[str]:
+        """Open issues whose only open blocker is key, i.e. freed by closing it."""
+        node = self.state(key)
+        if node is None or node['done']:
+            return []
+        return [r[0] for r in self.conn.execute(
+            'SELECT n.key FROM dep_edges e JOIN dep_nodes n ON n.key = e.blocked '
+            'WHERE e.blocker = ? AND n.done = 0 AND n.open_blockers = 1 ORDER BY n.key', (key,))]
+
+    def relation_terms(self, keys: list[str]) -> dict[str, tuple[int, bool, bool, bool]]:
+        """key -> (open blockers, has blockers, blocks others, parent in progress).
+
+        The relation inputs of the scoring terms, for every key the index knows.
+        """
+        terms = {}
+        for start in range(0, len(keys), _BATCH):
+            batch = keys[start:start + _BATCH]
+            marks = ','.join('?' * len(batch))
+            for key, open_count, has_blockers, blocks, epic in self.conn.execute(
+                    'SELECT n.key, n.open_blockers, '
+                    'EXISTS (SELECT 1 FROM dep_edges WHERE blocked = n.key), '
+                    'EXISTS (SELECT 1 FROM dep_edges WHERE blocker = n.key), '
+                    'COALESCE(p.in_progress, 0) '
+                    'FROM dep_nodes n LEFT JOIN dep_nodes p ON p.key = n.parent '
+                    f'WHERE n.key IN ({marks})', batch):
+                terms[key] = (open_count, bool(has_blockers), bool(blocks), bool(epic))
+        return terms
+
+    def stats(self) -> dict:
+        count = lambda sql: self.conn.execute(sql).fetchone()[0]
+        return {
+            "nodes": count('SELECT COUNT(*) FROM dep_nodes'),
+            "relations": count('SELECT COUNT(*) FROM dep_edges'),
+            "closure_pairs": count('SELECT COUNT(*) FROM dep_closure'),
+            "blocked_open": count('SELECT COUNT(*) FROM dep_nodes WHERE done = 0 AND open_blockers > 0'),
+        }
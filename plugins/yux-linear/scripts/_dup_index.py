@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate index over issue titles and descriptions (MinHash + LSH),
+kept next to the issue mirror (same SQLite file).
+
+Text becomes a set of shingles: lower-cased English words (lightly
+stemmed, stop words dropped) and character bigrams of Chinese/Japanese/
+Korean runs. Each issue gets two sets, its title alone and the title plus
+the first DESC_TOKENS new shingles of the description, so a reworded
+short title is not drowned out by a long description and a vague title
+can still match on its description; the similarity of two issues is the
+better of the two comparisons.
+
+Each set is summarised as a MinHash signature of SIGNATURE_SIZE 32-bit
+minima: one shake_128 digest per shingle supplies all lanes at once, and
+the lanes are reduced with min() over zip(), so a signature costs one hash
+call per shingle. Matching lanes / SIGNATURE_SIZE estimates the Jaccard
+similarity.
+
+Tables:
+  dup_sigs    one row per indexed issue: title and text signatures (text
+              NULL when there is no description), title, done flag
+  dup_bands   LSH buckets: each signature cut into BANDS bands of ROWS
+              lanes, each band hashed to one integer key
+
+Two issues share a bucket with probability 1 - (1 - J^ROWS)^BANDS, about
+96% at J = 0.5 and under 20% at J = 0.2, so a lookup reads BANDS index
+entries and scores only those candidates instead of the whole backlog. Issues are
+keyed by identifier (issue_key()) and updated one by one as the mirror
+stores them; archived issues and issues without text are dropped.
+"""
+
+import hashlib
+import operator
+import re
+import unicodedata
+from array import array
+from zlib import crc32
+
+from _issue_scoring import is_done, issue_key
+
+SIGNATURE_SIZE = 72
+BANDS = 24
+ROWS = SIGNATURE_SIZE // BANDS
+DESC_TOKENS = 40
+DEFAULT_THRESHOLD = 0.5
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS dup_sigs (
+        key TEXT PRIMARY KEY,
+        title TEXT,
+        done INTEGER NOT NULL DEFAULT 0,
+        sig BLOB NOT NULL,
+        text_sig BLOB
+    );
+    CREATE TABLE IF NOT EXISTS dup_bands (
+        band INTEGER NOT NULL,
+        key TEXT NOT NULL,
+        PRIMARY KEY (band, key)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS dup_bands_key ON dup_bands(key);
+"""
+
+_WORD_RE = re.compile(r'[a-z0-9]+(?:[\'_.-][a-z0-9]+)*')
+_CJK_RE = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af]+')
+_TOKEN_RE = re.compile(f'{_WORD_RE.pattern}|{_CJK_RE.pattern}')
+_STOP_WORDS = frozenset("""
+    a an and are as at be but by can do does for from has have how i if in into is it its
+    me my no not of on or our should so that the their then there this to was we when
+    where which will with would you your
+""".split())
+
+
+def _stem(word: str) -> str:
+    """Crude suffix stripping, applied alike to both sides of a comparison."""
+    if len(word) > 5 and word.endswith('ing'):
+        word = word[:-3]
+    elif len(word) > 4 and word.endswith('ed'):
+        word = word[:-2]
+    elif word.endswith('ies') and len(word) > 4:
+        word = word[:-3] + 'y'
+    elif word.endswith(('sses', 'ches', 'shes', 'xes')):
+        word = word[:-2]
+    elif len(word) > 3 and word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        word = word[:-1]
+    if len(word) > 4 and word.endswith('e'):
+        word = word[:-1]
+    return word
+
+
+def tokens(text: str) -> list[str]:
+    """Word and CJK-bigram tokens of text, in order."""
+    text = unicodedata.normalize('NFKC', text).lower()
+    out = []
+    for match in _TOKEN_RE.finditer(text):
+        run = match.group()
+        if _CJK_RE.match(run):
+            out.extend([run] if len(run) == 1 else
+                       [run[i:i + 2] for i in range(len(run) - 1)])
+        elif run not in _STOP_WORDS and (len(run) > 1 or run.isdigit()):
+            out.append(_stem(run))
+    return out
+
+
+def shingles(title: str, description: str = '') -> tuple[set[str], set[str] | None]:
+    """Title shingles, and title plus leading description shingles (None
+    when the description adds nothing)."""
+    title_set = set(tokens(title))
+    extra = []
+    for token in tokens(description[:4000]) if description else ():
+        if token not in title_set and token not in extra:
+            extra.append(token)
+            if len(extra) == DESC_TOKENS:
+                break
+    return title_set, (title_set | set(extra)) if extra else None
+
+
+def signature(features: set[str]) -> array | None:
+    """MinHash signature of a shingle set (None for an empty set)."""
+    if not features:
+        return None
+    lanes = [array('I', hashlib.shake_128(f.encode('utf-8')).digest(SIGNATURE_SIZE * 4))
+             for f in features]
+    return array('I', map(min, zip(*lanes)))
+
+
+def similarity(a: array, b: array) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(map(operator.eq, a, b)) / SIGNATURE_SIZE
+
+
+def band_keys(sig: array, family: int = 0) -> list[int]:
+    """One integer bucket key per band (family and band number in the high bits)."""
+    raw = sig.tobytes()
+    step = ROWS * 4
+    return [((family * BANDS + band) << 32) | crc32(raw[band * step:(band + 1) * step])
+            for band in range(BANDS)]
+
+
+def signatures(title: str, description: str = '') -> tuple[array | None, array | None]:
+    """(title signature, text signature); text is None without a description."""
+    title_set, text_set = shingles(title, description)
+    return signature(title_set), signature(text_set) if text_set else None
+
+
+def issue_text(issue: dict) -> tuple[str, str]:
+    title = issue.get('title') if isinstance(issue.get('title'), str) else ''
+    description = issue.get('description') if isinstance(issue.get('description'), str) else ''
+    return title, description
+
+
+class DupIndex:
+    """Near-duplicate index on an open SQLite connection (autocommit mode)."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        conn.executescript(SCHEMA)
+
+    def _run(self, fn, *args):
+        owned = not self.conn.in_transaction
+        if owned:
+            self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = fn(*args)
+        except BaseException:
+            if owned:
+                self.conn.execute('ROLLBACK')
+            raise
+        if owned:
+            self.conn.execute('COMMIT')
+        return result
+
+    def _remove(self, key: str) -> None:
+        self.conn.execute('DELETE FROM dup_bands WHERE key = ?', (key,))
+        self.conn.execute('DELETE FROM dup_sigs WHERE key = ?', (key,))
+
+    def _update_issue(self, issue: dict) -> None:
+        key = issue_key(issue)
+        if not key:
+            return
+        title, description = issue_text(issue)
+        sig, text_sig = (None, None) if issue.get('archivedAt') else \
+            signatures(title, description)
+        if sig is None and text_sig is None:
+            self._remove(key)
+            return
+        sig = sig or text_sig
+        blobs = (sig.tobytes(), text_sig.tobytes() if text_sig else None)
+        row = self.conn.execute('SELECT sig, text_sig FROM dup_sigs WHERE key = ?',
+                                (key,)).fetchone()
+        self.conn.execute('INSERT OR REPLACE INTO dup_sigs (key, title, done, sig, text_sig) '
+                          'VALUES (?, ?, ?, ?, ?)',
+                          (key, title, int(is_done(issue)), *blobs))
+        if row and tuple(row) == blobs:
+            return  # text unchanged: the buckets still hold
+        self.conn.execute('DELETE FROM dup_bands WHERE key = ?', (key,))
+        bands = band_keys(sig, 0) + band_keys(text_sig or sig, 1)
+        self.conn.executemany('INSERT OR IGNORE INTO dup_bands VALUES (?, ?)',
+                              [(band, key) for band in bands])
+
+    # Updates
+
+    def update_issue(self, issue: dict) -> None:
+        """Index (or re-index) one issue from its payload."""
+        self._run(self._update_issue, issue)
+
+    def remove(self, key: str) -> None:
+        self._run(self._remove, key)
+
+    def rebuild(self, issues) -> None:
+        """Drop the index and rebuild it from an iterable of issues."""
+        def apply():
+            self.conn.execute('DELETE FROM dup_bands')
+            self.conn.execute('DELETE FROM dup_sigs')
+            for issue in issues:
+                self._update_issue(issue)
+        self._run(apply)
+
+    # Queries
+
+    def similar(self, title: str, description: str = '', threshold: float = DEFAULT_THRESHOLD,
+                limit: int | None = 5, include_done: bool = False,
+                exclude: str | None = None) -> list[dict]:
+        """Indexed issues whose estimated similarity is at least threshold, best first.
+
+        Titles are compared with titles and full texts with full texts
+        (an issue without a description stands in with its title).
+        """
+        sig, text_sig = signatures(title, description)
+        if sig is None and text_sig is None:
+            return []
+        sig = sig or text_sig
+        text_sig = text_sig or sig
+        bands = band_keys(sig, 0) + band_keys(text_sig, 1)
+        marks = ','.join('?' * len(bands))
+        sql = ('SELECT s.key, s.title, s.done, s.sig, s.text_sig FROM dup_sigs s WHERE s.key IN '
+               f'(SELECT DISTINCT key FROM dup_bands WHERE band IN ({marks}))')
+        if not include_done:
+            sql += ' AND s.done = 0'
+        matches = []
+        for key, found_title, done, blob, text_blob in self.conn.execute(sql, bands):
+            if key == exclude:
+                continue
+            found = array('I', blob)
+            score = max(similarity(sig, found),
+                        similarity(text_sig, array('I', text_blob) if text_blob else found))
+            if score >= threshold:
+                matches.append({"key": key, "title": found_title, "done": bool(done),
+                                "similarity": round(score, 3)})
+        matches.sort(key=lambda m: (-m['similarity'], m['key']))
+        return matches[:limit] if limit else matches
+
+    def similar_to(self, issue: dict, **options) -> list[dict]:
+        """similar() for an issue payload, never matching the issue itself."""
+        title, description = issue_text(issue)
+        return self.similar(title, description, exclude=issue_key(issue) or None, **options)
+
+    def stats(self) -> dict:
+        count = lambda sql: self.conn.execute(sql).fetchone()[0]
+        return {
+            "indexed": count('SELECT COUNT(*) FROM dup_sigs'),
+            "open": count('SELECT COUNT(*) FROM dup_sigs WHERE done = 0'),
+            "buckets": count('SELECT COUNT(DISTINCT band) FROM dup_bands'),
+        }
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Read git state straight from the .git directory, without forking git.
+
+Covers what the hooks used to ask `git rev-parse --git-common-dir` and
+`git branch --show-current` for:
+- the worktree's git dir (`.git` directory, or `.git` file with `gitdir:`)
+- the common git dir shared by linked worktrees (`commondir` file)
+- the current branch (symbolic HEAD; None when detached)
+- ref resolution through loose refs and `packed-refs`
+
+GIT_DIR is honoured. Repositories using the reftable backend keep no
+readable HEAD, so branch lookups there fall back to asking git.
+"""
+
+import os
+
+_HEADS = 'refs/heads/'
+# Refs that live in the per-worktree git dir rather than the common dir
+_PER_WORKTREE = ('HEAD', 'refs/worktree/', 'refs/bisect/', 'refs/rewritten/')
+
+
+def _read_first_line(path: str) -> str | None:
+    try:
+        with open(path, encoding='utf-8', errors='surrogateescape') as f:
+            return f.readline().strip()
+    except OSError:
+        return None
+
+
+def find_git_dir(cwd: str | None = None) -> str | None:
+    """Return the git dir for cwd's worktree (like `git rev-parse --git-dir`)."""
+    env_dir = os.environ.get('GIT_DIR')
+    if env_dir:
+        return os.path.abspath(env_dir)
+
+    path = os.path.abspath(cwd or os.getcwd())
+    while True:
+        dot_git = os.path.join(path, '.git')
+        if os.path.isdir(dot_git):
+            if os.path.exists(os.path.join(dot_git, 'HEAD')):
+                return dot_git
+        elif os.path.isfile(dot_git):
+            line = _read_first_line(dot_git)
+            if line and line.startswith('gitdir:'):
+                git_dir = line[len('gitdir:'):].strip()
+                return os.path.normpath(os.path.join(path, git_dir))
+            return None
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def get_common_dir(git_dir: str) -> str:
+    """Return the common git dir (like `git rev-parse --git-common-dir`)."""
+    common = _read_first_line(os.path.join(git_dir, 'commondir'))
+    if common:
+        return os.path.normpath(os.path.join(git_dir, common))
+    return git_dir
+
+
+def get_main_repo_root(cwd: str | None = None) -> str | None:
+    """Main repo root, even when cwd is inside a linked worktree."""
+    git_dir = find_git_dir(cwd)
+    if not git_dir:
+        return None
+    return os.path.dirname(get_common_dir(git_dir))
+
+
+def read_head(git_dir: str) -> str | None:
+    """Raw HEAD contents: 'ref: refs/heads/x' or a detached sha."""
+    return _read_first_line(os.path.join(git_dir, 'HEAD'))
+
+
+def get_current_branch(cwd: str | None = None) -> str | None:
+    """Current branch name, None when detached or outside a repo."""
+    git_dir = find_git_dir(cwd)
+    if not git_dir:
+        return None
+    branch = branch_from_head(read_head(git_dir))
+    if branch == '.invalid':
+        # reftable backend: HEAD is a placeholder, ask git
+        import subprocess
+        from _proc import run
+        try:
+            result = run(
+                ['git', 'branch', '--show-current'],
+                capture_output=True, text=True, timeout=5, cwd=cwd
+            )
+            branch = result.stdout.strip() if result.returncode == 0 else None
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            branch = None
+    return branch or None
+
+
+def branch_from_head(head: str | None) -> str | None:
+    """Branch name from HEAD contents, None when detached."""
+    if head and head.startswith('ref:'):
+        ref = head[4:].strip()
+        if ref.startswith(_HEADS):
+            return ref[len(_HEADS):]
+    return None
+
+
+def _lookup_packed(common_dir: str, ref: str) -> str | None:
+    """Find ref in packed-refs (one linear scan of a usually small file)."""
+    try:
+        with open(os.path.join(common_dir, 'packed-refs'),
+                  encoding='utf-8', errors='surrogateescape') as f:
+            for line in f:
+                if not line or line[0] in '#^':
+                    continue
+                sha, _, name = line.rstrip('\n').partition(' ')
+                if name == ref:
+                    return sha
+    except OSError:
+        pass
+    return None
+
+
+def resolve_ref(git_dir: str, ref: str, _depth: int = 0) -> str | None:
+    """Resolve a ref name (or 'HEAD') to a commit sha."""
+    if _depth > 5:
+        return None
+    common_dir = get_common_dir(git_dir)
+    base = git_dir if ref == 'HEAD' or ref.startswith(_PER_WORKTREE) else common_dir
+
+    value = _read_first_line(os.path.join(base, ref))
+    if value is None and ref != 'HEAD':
+        value = _lookup_packed(common_dir, ref)
+    if not value:
+        return None
+    if value.startswith('ref:'):
+        return resolve_ref(git_dir, value[4:].strip(), _depth + 1)
+    return value
+
+
+def get_head_sha(cwd: str | None = None) -> str | None:
+    """Commit sha of HEAD, None for an unborn branch or outside a repo."""
+    git_dir = find_git_dir(cwd)
+    return resolve_ref(git_dir, 'HEAD') if git_dir else None
+
+
+def branch_sha(git_dir: str, branch: str) -> str | None:
+    """Commit sha of a local branch, None if it does not exist."""
+    return resolve_ref(git_dir, _HEADS + branch)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Per-event state shared by the Linear hook checks.
+
+A HookContext parses the stdin payload, evaluates the Linear guard and
+reads git state at most once, no matter how many checks run for the event.
+Every value is computed lazily, so a check that never looks at the payload
+never reads stdin.
+
+With `fields` set, only those payload fields are extracted (see _payload.py)
+and the rest of stdin is skipped without being built; fields=None parses
+the whole payload.
+"""
+
+import sys
+
+from _git_state import get_current_branch, get_main_repo_root
+from _linear_guard import is_linear_project
+
+_UNSET = object()
+
+
+class HookContext:
+    """Lazily evaluated payload, guard verdict and git state for one event."""
+
+    def __init__(self, event: str, raw: str | None = None,
+                 fields: dict[str, int | None] | None = None):
+        self.event = event
+        self._raw = raw
+        self.fields = fields
+        self._payload = _UNSET
+        self._linear_active = _UNSET
+        self._branch = _UNSET
+        self._repo_root = _UNSET
+
+    @property
+    def payload(self) -> dict | None:
+        """Parsed stdin payload, None if it is not a JSON object."""
+        if self._payload is _UNSET:
+            from _payload import read_payload
+            source = self._raw if self._raw is not None else sys.stdin
+            self._payload = read_payload(source, self.fields)
+        return self._payload
+
+    @property
+    def tool_name(self) -> str:
+        return (self.payload or {}).get('tool_name', '')
+
+    @property
+    def session_id(self) -> str | None:
+        session = (self.payload or {}).get('session_id')
+        return session if isinstance(session, str) else None
+
+    @property
+    def linear_active(self) -> bool:
+        if self._linear_active is _UNSET:
+            self._linear_active = is_linear_project()
+        return self._linear_active
+
+    @property
+    def branch(self) -> str | None:
+        if self._branch is _UNSET:
+            self._branch = get_current_branch()
+        return self._branch
+
+    @property
+    def repo_root(self) -> str | None:
+        if self._repo_root is _UNSET:
+            self._repo_root = get_main_repo_root()
+        return self._repo_root
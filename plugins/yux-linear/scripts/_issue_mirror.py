@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Local mirror of a project's Linear issues, synced by updatedAt watermark.
+
+Issues live in `.claude/linear-mirror.db` (SQLite): one row per issue with
+the filterable fields as indexed columns, the labels in a side table and
+the full issue object as JSON, so queries return the same shape the
+scoring script and the skills already consume.
+
+Sync is incremental: the mirror remembers the newest `updatedAt` it has
+seen per project (the watermark), fetches only issues updated at or after
+it, and upserts them. A row is never replaced by an older version of the
+same issue, so overlapping or out-of-order batches are harmless.
+
+Every stored issue also updates the dependency index (_dep_graph.py),
+the near-duplicate index (_dup_index.py) and the cycle metrics
+(_cycle_metrics.py) in the same transaction, so relation, duplicate and
+burndown lookups never need the API.
+
+Issues reach the mirror either from a JSON dump (e.g. the result of
+`mcp__linear__list_issues(updatedAt: <watermark>)`) via ingest(), or by
+paging the GraphQL API directly with sync_graphql() (any endpoint, so a
+local stand-in serving canned responses works the same way).
+"""
+
+import json
+import os
+import sqlite3
+
+from _cycle_metrics import CycleMetrics
+from _dep_graph import DepGraph
+from _dup_index import DupIndex
+from _issue_scoring import (
+    cycle_id, issue_key, labels_of, load_issues, priority_of, state_of,
+)
+
+MIRROR_FILE = 'linear-mirror.db'
+# PRAGMA user_version; 2 added the dependency index, 3 the duplicate index,
+# 4 the cycle metrics
+MIRROR_VERSION = 4
+DEFAULT_ENDPOINT = 'https://api.linear.app/graphql'
+PAGE_SIZE = 100
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS issues (
+        id TEXT PRIMARY KEY,
+        identifier TEXT,
+        project TEXT,
+        title TEXT,
+        state TEXT,
+        state_type TEXT,
+        assignee TEXT,
+        priority INTEGER,
+        cycle TEXT,
+        updated_at TEXT,
+        archived INTEGER NOT NULL DEFAULT 0,
+        data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS issues_identifier ON issues(identifier);
+    CREATE INDEX IF NOT EXISTS issues_project_state ON issues(project, state);
+    CREATE INDEX IF NOT EXISTS issues_assignee ON issues(assignee);
+    CREATE INDEX IF NOT EXISTS issues_cycle ON issues(cycle);
+    CREATE INDEX IF NOT EXISTS issues_updated ON issues(updated_at);
+    CREATE TABLE IF NOT EXISTS labels (
+        issue_id TEXT NOT NULL,
+        label TEXT NOT NULL,
+        PRIMARY KEY (issue_id, label)
+    );
+    CREATE INDEX IF NOT EXISTS labels_label ON labels(label);
+    CREATE TABLE IF NOT EXISTS watermarks (
+        project TEXT PRIMARY KEY,
+        updated_at TEXT
+    );
+"""
+
+ISSUES_QUERY = """
+query MirrorIssues($filter: IssueFilter, $first: Int, $after: String) {
+  issues(filter: $filter, first: $first, after: $after, orderBy: updatedAt, includeArchived: true) {
+    nodes {
+      id identifier title description priority estimate dueDate
+      createdAt updatedAt archivedAt url
+      state { name type }
+      assignee { id name email }
+      cycle { id number startsAt endsAt }
+      project { id name }
+      parent { id identifier }
+      labels { nodes { name } }
+      relations { nodes { type relatedIssue { id identifier } } }
+      inverseRelations { nodes { type issue { id identifier } } }
+    }
+    pageInfo { hasNextPage endCursor }
+  }
+}
+"""
+
+
+class MirrorError(Exception):
+    """Raised when a sync source fails or returns an unexpected response."""
+
+
+def _name(value) -> str:
+    if isinstance(value, dict):
+        return value.get('name') or value.get('displayName') or value.get('email') or ''
+    return value if isinstance(value, str) else ''
+
+
+def _project_id(issue: dict) -> str:
+    project = issue.get('project') or issue.get('projectId')
+    if isinstance(project, dict):
+        project = project.get('id') or project.get('name')
+    return project if isinstance(project, str) else ''
+
+
+class IssueMirror:
+    """SQLite-backed issue mirror for one repo."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+        self.graph = DepGraph(self.conn)
+        self.dups = DupIndex(self.conn)
+        self.cycles = CycleMetrics(self.conn)
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        if version < MIRROR_VERSION:
+            if version < 2:
+                self.rebuild_graph()
+            self.rebuild_dups()
+            if version < 4:
+                self.rebuild_cycles()
+            self.conn.execute(f'PRAGMA user_version = {MIRROR_VERSION}')
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # Watermarks
+
+    def watermark(self, project: str = '') -> str | None:
+        row = self.conn.execute(
+            'SELECT updated_at FROM watermarks WHERE project = ?', (project,)).fetchone()
+        return row[0] if row else None
+
+    def _advance_watermark(self, project: str, updated_at: str) -> None:
+        self.conn.execute(
+            'INSERT INTO watermarks (project, updated_at) VALUES (?, ?) '
+            'ON CONFLICT(project) DO UPDATE SET updated_at = excluded.updated_at '
+            'WHERE excluded.updated_at > watermarks.updated_at',
+            (project, updated_at))
+
+    # Writes
+
+    def upsert(self, issues: list[dict], project: str = '', advance: bool = True) -> int:
+        """Store issues, skipping any not newer than the stored copy.
+
+        With advance, the watermark of `project` moves to the newest
+        updatedAt seen and the cycle metrics take their snapshot (closing
+        ended cycles), so `issues` must be the complete change set since
+        the watermark, not one page of it. Returns the number of rows
+        written.
+        """
+        written = 0
+        newest = ''
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for issue in issues:
+                issue_id = str(issue.get('id') or issue_key(issue))
+                if not issue_id:
+                    continue
+                updated = issue.get('updatedAt') or ''
+                newest = max(newest, updated)
+                row = conn.execute('SELECT updated_at FROM issues WHERE id = ?',
+                                   (issue_id,)).fetchone()
+                if row and row[0] and updated and updated <= row[0]:
+                    continue
+                name, kind = state_of(issue)
+                conn.execute(
+                    'INSERT OR REPLACE INTO issues (id, identifier, project, title, state, '
+                    'state_type, assignee, priority, cycle, updated_at, archived, data) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (issue_id, issue_key(issue), project or _project_id(issue),
+                     issue.get('title') or '', name, kind,
+                     _name(issue.get('assignee')).lower(), priority_of(issue),
+                     cycle_id(issue.get('cycle') or issue.get('cycleId')), updated,
+                     1 if issue.get('archivedAt') else 0,
+                     json.dumps(issue, ensure_ascii=False)))
+                conn.execute('DELETE FROM labels WHERE issue_id = ?', (issue_id,))
+                conn.executemany('INSERT OR IGNORE INTO labels VALUES (?, ?)',
+                                 [(issue_id, label) for label in labels_of(issue)])
+                self.graph.update_issue(issue)
+                self.dups.update_issue(issue)
+                self.cycles.update_issue(issue)
+                written += 1
+            if advance:
+                if newest:
+                    self._advance_watermark(project, newest)
+                self.cycles.snapshot()
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return written
+
+    def _run(self, fn, *args):
+        """fn(*args) in a write transaction, rolled back if it raises (joins
+        the caller's transaction when one is open)."""
+        owned = not self.conn.in_transaction
+        if owned:
+            self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = fn(*args)
+        except BaseException:
+            if owned:
+                self.conn.execute('ROLLBACK')
+            raise
+        if owned:
+            self.conn.execute('COMMIT')
+        return result
+
+    def clear(self, project: str = '') -> None:
+        """Forget every issue of a project (for a full resync)."""
+        def apply():
+            conn = self.conn
+            ids = [r[0] for r in conn.execute('SELECT id FROM issues WHERE project = ?',
+                                              (project,))]
+            conn.executemany('DELETE FROM labels WHERE issue_id = ?', [(i,) for i in ids])
+            conn.execute('DELETE FROM issues WHERE project = ?', (project,))
+            conn.execute('DELETE FROM watermarks WHERE project = ?', (project,))
+            self.rebuild_graph()
+            self.rebuild_dups()
+            self.rebuild_cycles()
+        self._run(apply)
+
+    def rebuild_graph(self) -> None:
+        """Rebuild the dependency index from the stored issues."""
+        rows = self.conn.execute('SELECT data FROM issues ORDER BY updated_at').fetchall()
+        self.graph.rebuild(json.loads(data) for (data,) in rows)
+
+    def rebuild_dups(self) -> None:
+        """Rebuild the near-duplicate index from the stored issues."""
+        rows = self.conn.execute('SELECT data FROM issues WHERE archived = 0').fetchall()
+        self.dups.rebuild(json.loads(data) for (data,) in rows)
+
+    def rebuild_cycles(self) -> None:
+        """Recompute the cycle totals from the stored issues."""
+        rows = self.conn.execute('SELECT data FROM issues').fetchall()
+        self.cycles.rebuild(json.loads(data) for (data,) in rows)
+
+    def ingest(self, data, project: str = '') -> int:
+        """Upsert issues from a JSON dump (list, {"issues": ...} or GraphQL).
+
+        The dump must hold every page of the result: the watermark moves to
+        its newest issue, past any page left out.
+        """
+        return self.upsert(load_issues(data), project)
+
+    # Reads
+
+    def query(self, project: str | None = None, states: list[str] | None = None,
+              assignee: str | None = None, priorities: list[int] | None = None,
+              cycle: str | None = None, labels: list[str] | None = None,
+              text: str | None = None, include_archived: bool = False,
+              limit: int | None = None) -> list[dict]:
+        """Issues matching every given filter, most recently updated first.
+
+        states and labels match case-insensitively; states also match the
+        state type (e.g. 'started'). assignee '' selects unassigned issues.
+        """
+        where, params = [], []
+        if project:
+            where.append('project = ?')
+            params.append(project)
+        if states:
+            wanted = [s.strip().lower() for s in states]
+            marks = ','.join('?' * len(wanted))
+            where.append(f'(state IN ({marks}) OR state_type IN ({marks}))')
+            params += wanted + wanted
+        if assignee is not None:
+            where.append('assignee = ?')
+            params.append(assignee.lower())
+        if priorities:
+            where.append(f"priority IN ({','.join('?' * len(priorities))})")
+            params += priorities
+        if cycle:
+            where.append('cycle = ?')
+            params.append(cycle)
+        for label in labels or []:
+            where.append('id IN (SELECT issue_id FROM labels WHERE label = ?)')
+            params.append(label.lower())
+        if text:
+            where.append("(title LIKE ? ESCAPE '\\' OR identifier = ?)")
+            escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params += [f'%{escaped}%', text.upper()]
+        if not include_archived:
+            where.append('archived = 0')
+        sql = 'SELECT data FROM issues'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY updated_at DESC, identifier'
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        return [json.loads(row[0]) for row in self.conn.execute(sql, params)]
+
+    def get(self, key: str) -> dict | None:
+        row = self.conn.execute(
+            'SELECT data FROM issues WHERE id = ? OR identifier = ? LIMIT 1',
+            (key, key.upper())).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def stats(self, project: str | None = None) -> dict:
+        """Issue counts per state plus the watermark."""
+        sql = 'SELECT state, COUNT(*) FROM issues WHERE archived = 0'
+        params = []
+        if project:
+            sql += ' AND project = ?'
+            params.append(project)
+        counts = dict(self.conn.execute(sql + ' GROUP BY state ORDER BY state', params))
+        return {"issues": sum(counts.values()), "states": counts,
+                "watermark": self.watermark(project or '')}
+
+    # GraphQL sync
+
+    def sync_graphql(self, endpoint: str, token: str | None, project: str = '',
+                     full: bool = False, timeout: float = 30) -> int:
+        """Fetch issues updated since the watermark, page by page.
+
+        Each page is committed as it arrives, but the watermark only moves
+        once the last page is stored: pages come newest first, so moving it
+        earlier would skip the older issues of an interrupted sync. Ended
+        cycles are closed at that point too, never from a partial set. A sync
+        that restarts after a failure refetches from the old watermark and
+        skips the rows it already has. Returns the rows written.
+        """
+        if full:
+            self.clear(project)
+        filter_ = {}
+        if project:
+            filter_['project'] = {'id': {'eq': project}}
+        since = self.watermark(project)
+        if since:
+            # gte, not gt: issues sharing the watermark timestamp are
+            # re-fetched and skipped by upsert rather than missed
+            filter_['updatedAt'] = {'gte': since}
+
+        written = 0
+        newest = ''
+        after = None
+        while True:
+            variables = {'filter': filter_, 'first': PAGE_SIZE, 'after': after}
+            data = graphql_request(endpoint, token, ISSUES_QUERY, variables, timeout)
+            try:
+                page = data['issues']
+                nodes, info = page['nodes'], page['pageInfo']
+            except (KeyError, TypeError):
+                raise MirrorError("unexpected GraphQL response shape") from None
+            written += self.upsert(nodes, project, advance=False)
+            newest = max([newest] + [n.get('updatedAt') or '' for n in nodes
+                                     if isinstance(n, dict)])
+            if not info.get('hasNextPage'):
+                break
+            after = info.get('endCursor')
+        if newest:
+            self._advance_watermark(project, newest)
+        self.cycles.snapshot()
+        return written
+
+
+def graphql_request(endpoint: str, token: str | None, query: str,
+                    variables: dict, timeout: float = 30) -> dict:
+    """POST one GraphQL request and return its `data`."""
+    from urllib.error import URLError
+    from urllib.request import Request, urlopen
+    headers = {'Content-Type': 'application/json'}
+    if token:
+        headers['Authorization'] = token
+    body = json.dumps({'query': query, 'variables': variables}).encode()
+    try:
+        with urlopen(Request(endpoint, data=body, headers=headers), timeout=timeout) as resp:
+            reply = json.load(resp)
+    except (URLError, OSError, json.JSONDecodeError) as e:
+        raise MirrorError(f"GraphQL request to {endpoint} failed: {e}") from None
+    if reply.get('errors'):
+        message = reply['errors'][0].get('message', 'unknown error')
+        raise MirrorError(f"GraphQL error: {message}")
+    return reply.get('data') or {}
+
+
+def open_mirror(repo_root: str | None = None) -> IssueMirror:
+    """Open the mirror in the main repo's .claude directory."""
+    if repo_root is None:
+        from _git_state import get_main_repo_root
+        repo_root = get_main_repo_root() or os.getcwd()
+    return IssueMirror(os.path.join(repo_root, '.claude', MIRROR_FILE))
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Issue scoring from references/issue-scoring.md, for whole backlogs at once.
+
+Issues are normalized once into column arrays (one `array('i')` of points
+per scoring term), the total is the column sum, and the top k come from a
+heap, so ranking 10k+ issues takes milliseconds. Ties break on the issue
+identifier (team prefix, then number), so the same input always gives the
+same ranking and breakdown.
+
+Input issues are Linear objects as returned by the MCP server or the
+GraphQL API; the accessors below accept the common shapes of each field
+(priority as number, name or {value, name}; labels as names, objects or
+{nodes: [...]}; blockers through blockedBy, relations or inverseRelations).
+"""
+
+import heapq
+from array import array
+from datetime import date, datetime
+
+# Linear priority numbers: 0 none, 1 urgent, 2 high, 3 medium, 4 low
+PRIORITY_POINTS = {1: 100, 2: 70, 3: 40, 4: 20}
+PRIORITY_NAMES = {'urgent': 1, 'high': 2, 'medium': 3, 'normal': 3, 'low': 4, 'no priority': 0}
+
+OVERDUE_POINTS = 80
+DUE_1_DAY_POINTS = 60
+DUE_3_DAYS_POINTS = 40
+
+# Base terms (every skill), in breakdown order
+BASE_TERMS = ('priority', 'due_date', 'current_cycle', 'in_progress', 'bug', 'blocked')
+# yux-pm-plan additions
+PLAN_TERMS = ('carried_over', 'due_in_cycle', 'blocks_others', 'blockers_done', 'epic_in_progress')
+
+FLAG_POINTS = {
+    'current_cycle': 30,
+    'in_progress': 50,
+    'bug': 15,
+    'blocked': -100,
+    'carried_over': 50,
+    'due_in_cycle': 60,
+    'blocks_others': 30,
+    'blockers_done': 20,
+    'epic_in_progress': 25,
+}
+
+DONE_STATE_TYPES = {'completed', 'canceled', 'cancelled'}
+DONE_STATE_NAMES = {'done', 'canceled', 'cancelled', 'duplicate', 'merged', 'closed'}
+
+
+# Field accessors
+
+def _name(value) -> str:
+    if isinstance(value, dict):
+        value = value.get('name')
+    return value if isinstance(value, str) else ''
+
+
+def issue_key(issue: dict) -> str:
+    """Identifier used for lookups and tie-breaks (e.g. 'WYX-101')."""
+    return str(issue.get('identifier') or issue.get('id') or '')
+
+
+def sort_key(identifier: str) -> tuple[str, int, str]:
+    """'WYX-101' -> ('WYX', 101, ''), so WYX-9 sorts before WYX-10."""
+    prefix, _, number = identifier.rpartition('-')
+    if prefix and number.isdigit():
+        return prefix, int(number), ''
+    return identifier, -1, identifier
+
+
+def priority_of(issue: dict) -> int:
+    value = issue.get('priority')
+    if isinstance(value, dict):
+        value = value.get('value', value.get('name'))
+    if isinstance(value, str):
+        value = PRIORITY_NAMES.get(value.strip().lower(), value)
+        if isinstance(value, str) and value.isdigit():
+            value = int(value)
+    if value is None and issue.get('priorityLabel'):
+        value = PRIORITY_NAMES.get(issue['priorityLabel'].lower(), 0)
+    return value if isinstance(value, int) else 0
+
+
+def state_of(issue: dict) -> tuple[str, str]:
+    """(state name, state type), lower-cased."""
+    state = issue.get('state', issue.get('status'))
+    if isinstance(state, dict):
+        return (state.get('name') or '').lower(), (state.get('type') or '').lower()
+    return (state or '').lower() if isinstance(state, str) else '', ''
+
+
+def is_done(issue: dict) -> bool:
+    name, kind = state_of(issue)
+    return kind in DONE_STATE_TYPES or name in DONE_STATE_NAMES
+
+
+def labels_of(issue: dict) -> list[str]:
+    labels = issue.get('labels') or []
+    if isinstance(labels, dict):
+        labels = labels.get('nodes') or []
+    return [name.lower() for name in map(_name, labels) if name]
+
+
+def cycle_id(value) -> str | None:
+    if isinstance(value, dict):
+        value = value.get('id') or value.get('number')
+    return None if value is None else str(value)
+
+
+_DATES: dict[str, date | None] = {}
+
+
+def due_date_of(issue: dict) -> date | None:
+    value = issue.get('dueDate') or issue.get('due_date')
+    if not isinstance(value, str):
+        return None
+    # Backlogs share few distinct due dates; parse each once
+    if value not in _DATES:
+        try:
+            _DATES[value] = date.fromisoformat(value[:10])
+        except ValueError:
+            _DATES[value] = None
+    return _DATES[value]
+
+
+def _ref(value) -> tuple[str, dict | None]:
+    """A related issue given as an identifier or as an object."""
+    if isinstance(value, dict):
+        return issue_key(value), value
+    return str(value), None
+
+
+def blockers_of(issue: dict) -> list[tuple[str, dict | None]]:
+    """Issues blocking this one, as (identifier, object if embedded)."""
+    found = []
+    for value in issue.get('blockedBy') or issue.get('blocked_by') or []:
+        found.append(_ref(value))
+    for rel in _nodes(issue.get('relations')):
+        if rel.get('type') in ('blocked_by', 'blockedBy'):
+            found.append(_ref(rel.get('relatedIssue') or rel.get('issue')))
+    for rel in _nodes(issue.get('inverseRelations')):
+        if rel.get('type') == 'blocks':
+            found.append(_ref(rel.get('issue') or rel.get('relatedIssue')))
+    return [ref for ref in found if ref[0]]
+
+
+def blocked_ids_of(issue: dict) -> list[str]:
+    """Issues this one blocks."""
+    found = [_ref(v)[0] for v in issue.get('blocks') or []]
+    for rel in _nodes(issue.get('relations')):
+        if rel.get('type') == 'blocks':
+            found.append(_ref(rel.get('relatedIssue') or rel.get('issue'))[0])
+    return [key for key in found if key]
+
+
+def _nodes(value) -> list[dict]:
+    if not value:
+        return []
+    if isinstance(value, dict):
+        value = value.get('nodes')
+    return [v for v in value or [] if isinstance(v, dict)]
+
+
+def parent_of(issue: dict) -> tuple[str, dict | None] | None:
+    parent = issue.get('parent') or issue.get('parentId')
+    return _ref(parent) if parent else None
+
+
+# Scoring
+
+class ScoringOptions:
+    """Inputs that are not part of the issues themselves."""
+
+    def __init__(self, today: date | None = None, current_cycle: str | None = None,
+                 previous_cycle: str | None = None, cycle_end: date | None = None,
+                 plan: bool = False):
+        self.today = today or date.today()
+        self.current_cycle = current_cycle
+        self.previous_cycle = previous_cycle
+        self.cycle_end = cycle_end
+        self.plan = plan
+
+    @property
+    def terms(self) -> tuple[str, ...]:
+        return BASE_TERMS + PLAN_TERMS if self.plan else BASE_TERMS
+
+
+class ScoreTable:
+    """Per-term point columns and totals for a batch of issues."""
+
+    def __init__(self, issues: list[dict], terms: tuple[str, ...]):
+        self.issues = issues
+        self.terms = terms
+        self.keys = [issue_key(issue) for issue in issues]
+        self.columns = {term: array('i', [0]) * len(issues) for term in terms}
+        self.scores = array('i', [0]) * len(issues)
+
+    def breakdown(self, index: int) -> list[tuple[str, int]]:
+        """Non-zero (term, points) of one issue, in TERMS order."""
+        return [(term, self.columns[term][index]) for term in self.terms
+                if self.columns[term][index]]
+
+    def top(self, k: int | None = None) -> list[int]:
+        """Indices of the k best issues (all when k is None), best first."""
+        scores, keys = self.scores, self.keys
+        candidates = range(len(scores))
+        if k is not None and k < len(scores):
+            if k <= 0:
+                return []
+            # Heap on the raw scores, then keep everything tied with the
+            # k-th score so the identifier tie-break stays deterministic
+            cutoff = scores[heapq.nlargest(k, candidates, key=scores.__getitem__)[-1]]
+            candidates = [i for i in candidates if scores[i] >= cutoff]
+        ranked = sorted(candidates, key=lambda i: (-scores[i], sort_key(keys[i])))
+        return ranked if k is None else ranked[:k]
+
+
+def _due_points(due: date | None, today: date) -> int:
+    if due is None:
+        return 0
+    days = (due - today).days
+    if days < 0:
+        return OVERDUE_POINTS
+    if days <= 1:
+        return DUE_1_DAY_POINTS
+    if days <= 3:
+        return DUE_3_DAYS_POINTS
+    return 0
+
+
+def score_issues(issues: list[dict], options: ScoringOptions | None = None,
+                 relations: dict[str, tuple[int, bool, bool, bool]] | None = None) -> ScoreTable:
+    """Score a batch of issues; see ScoreTable.top() and breakdown().
+
+    relations (DepGraph.relation_terms()) replaces the relation fields of
+    the issues for every key it has: (open blockers, has blockers, blocks
+    others, parent epic in progress).
+    """
+    relations = relations or {}
+    options = options or ScoringOptions()
+    table = ScoreTable(issues, options.terms)
+    by_key = {key: issue for key, issue in zip(table.keys, issues) if key}
+    all_blockers = [blockers_of(issue) for issue in issues]
+    # Issues named as a blocker by another issue in the batch
+    blocking = {ref for blockers in all_blockers for ref, _ in blockers}
+
+    cols = table.columns
+    today = options.today
+    for i, issue in enumerate(issues):
+        cols['priority'][i] = PRIORITY_POINTS.get(priority_of(issue), 0)
+        due = due_date_of(issue)
+        cols['due_date'][i] = _due_points(due, today)
+        cycle = cycle_id(issue.get('cycle') or issue.get('cycleId'))
+        if options.current_cycle and cycle == options.current_cycle:
+            cols['current_cycle'][i] = FLAG_POINTS['current_cycle']
+        if state_of(issue)[0] == 'in progress':
+            cols['in_progress'][i] = FLAG_POINTS['in_progress']
+        if 'bug' in labels_of(issue):
+            cols['bug'][i] = FLAG_POINTS['bug']
+
+        known = relations.get(table.keys[i])
+        blockers = all_blockers[i]
+        if known is not None:
+            open_blockers, has_blockers = known[0], known[1]
+        else:
+            open_blockers, has_blockers = 0, bool(blockers)
+            for ref, embedded in blockers:
+                blocker = by_key.get(ref, embedded)
+                if blocker is None or not is_done(blocker):
+                    open_blockers += 1
+        if open_blockers:
+            cols['blocked'][i] = FLAG_POINTS['blocked']
+
+        if not options.plan:
+            continue
+        if options.previous_cycle and cycle == options.previous_cycle:
+            cols['carried_over'][i] = FLAG_POINTS['carried_over']
+        if due and options.cycle_end and due <= options.cycle_end:
+            cols['due_in_cycle'][i] = FLAG_POINTS['due_in_cycle']
+        if known is not None:
+            blocks_others, epic_in_progress = known[2], known[3]
+        else:
+            blocks_others = bool(blocked_ids_of(issue)) or table.keys[i] in blocking
+            parent = parent_of(issue)
+            epic = by_key.get(parent[0], parent[1]) if parent else None
+            epic_in_progress = epic is not None and state_of(epic)[0] == 'in progress'
+        if blocks_others:
+            cols['blocks_others'][i] = FLAG_POINTS['blocks_others']
+        if has_blockers and not open_blockers:
+            cols['blockers_done'][i] = FLAG_POINTS['blockers_done']
+        if epic_in_progress:
+            cols['epic_in_progress'][i] = FLAG_POINTS['epic_in_progress']
+
+    if issues:
+        table.scores = array('i', map(sum, zip(*(cols[term] for term in table.terms))))
+    return table
+
+
+def parse_date(value: str | None) -> date | None:
+    """YYYY-MM-DD or an ISO timestamp -> date."""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+
+
+def load_issues(data) -> list[dict]:
+    """Issues from a list, {"issues": [...]}, {"nodes": [...]} or a GraphQL
+    {"data": {"issues": {"nodes": [...]}}} response."""
+    if isinstance(data, dict) and isinstance(data.get('data'), dict):
+        data = data['data']
+    if isinstance(data, dict):
+        data = data.get('issues', data.get('nodes', data))
+    if isinstance(data, dict):
+        data = data.get('nodes', [])
+    return [issue for issue in data if isinstance(issue, dict)] if isinstance(data, list) else []
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Inbox triage helpers for yux-pm-triage: keyword type detection and
+duplicate candidates from the local index (_dup_index.py).
+
+Type detection uses the keyword lists of the skill, compiled once into a
+single alternation that is run over each issue's title and description:
+one regex scan per issue instead of one substring test per keyword. English
+keywords match at a word start and may take a plain inflection (crash ->
+crashes, add -> added, but not address); Chinese keywords match anywhere.
+When several types match, TYPE_PRECEDENCE decides.
+"""
+
+import re
+
+from _dup_index import DEFAULT_THRESHOLD
+from _issue_scoring import issue_key
+
+TYPE_KEYWORDS = {
+    'Bug': ('crash', 'error', 'fail', 'broken', '崩溃', '错误', '失败'),
+    'Feature': ('add', 'new', 'support', '希望', '能不能', '新增'),
+    'Improvement': ('improve', 'better', 'optimize', '优化', '改进'),
+    'Chore': ('update', 'upgrade', 'migrate', '更新', '升级'),
+}
+TYPE_PRECEDENCE = ('Bug', 'Feature', 'Improvement', 'Chore')
+
+_INFLECTIONS = r'(?:s|es|d|ed|ing|ment)?'
+
+
+class TypeMatcher:
+    """All type keywords as one compiled pattern."""
+
+    def __init__(self, keywords: dict[str, tuple[str, ...]] = TYPE_KEYWORDS):
+        self.types = {}
+        ascii_words, other_words = [], []
+        for type_name, words in keywords.items():
+            for word in words:
+                word = word.lower()
+                self.types.setdefault(word, type_name)
+                (ascii_words if word.isascii() else other_words).append(re.escape(word))
+        # Longest first, so a keyword is not shadowed by its own prefix
+        parts = []
+        if ascii_words:
+            parts.append(r'\b(?P<word>' + '|'.join(sorted(ascii_words, key=len, reverse=True))
+                         + r')' + _INFLECTIONS + r'\b')
+        if other_words:
+            parts.append('(?P<cjk>' + '|'.join(sorted(other_words, key=len, reverse=True)) + ')')
+        self.pattern = re.compile('|'.join(parts) or r'(?!)')
+
+    def matches(self, text: str) -> dict[str, list[str]]:
+        """Type -> keywords found in text (each keyword once)."""
+        found = {}
+        for match in self.pattern.finditer(text.lower()):
+            word = match.group(match.lastgroup)
+            type_name = self.types[word]
+            if word not in found.setdefault(type_name, []):
+                found[type_name].append(word)
+        return found
+
+    def classify(self, issues: list[dict]) -> list[dict]:
+        """{"type", "matches"} per issue; type is None when nothing matched."""
+        results = []
+        for issue in issues:
+            text = f"{issue.get('title') or ''}\n{issue.get('description') or ''}"
+            found = self.matches(text)
+            best = next((t for t in TYPE_PRECEDENCE if t in found), None)
+            if best is None and found:
+                best = next(iter(found))
+            results.append({"type": best, "matches": found})
+        return results
+
+
+def triage(issues: list[dict], index=None, threshold: float = DEFAULT_THRESHOLD,
+           limit: int = 3, include_done: bool = False) -> list[dict]:
+    """Per inbox issue: key, title, detected type and duplicate candidates.
+
+    index is a DupIndex; without one no duplicates are reported.
+    """
+    rows = []
+    for issue, kind in zip(issues, TypeMatcher().classify(issues)):
+        duplicates = index.similar_to(issue, threshold=threshold, limit=limit,
+                                      include_done=include_done) if index else []
+        rows.append({"key": issue_key(issue), "title": issue.get('title') or '',
+                     "type": kind['type'], "matches": kind['matches'],
+                     "duplicates": duplicates})
+    return rows
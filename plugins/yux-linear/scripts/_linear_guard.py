@@ -4,65 +4,130 @@ Shared guard module for Linear workflow hooks.
 
 Determines if the current project is "Linear-active" by checking:
 1. .claude/linear-config.json file exists
-2. Current git branch matches LIN-* pattern
+2. The task registry has tasks
+3. Current git branch matches LIN-* pattern
 
 If none of these conditions are met, hooks should silently pass (exit 0).
+
+This runs first on every hook event, so it only imports `os` up front:
+the task registry and re are loaded when a .claude directory or a
+LIN-looking branch is found.
+
+Checks 2 and 3 can mean a registry parse and, on reftable repos, a git
+fork. When either would run, the verdict is cached in the runtime dir per
+worktree git dir, stamped with the (inode, mtime, size) of the config and
+registry files and of HEAD, so repeated events cost a few stat calls and
+one small read. Without a .claude directory and with a plain HEAD the
+verdict is already that cheap and is not cached.
 """
 
-import json
-import re
-import subprocess
-from pathlib import Path
+import os
+
+import _git_state
+
+_LINEAR_ID_RE = None
+
+# Everything the verdict of checks 1-3 is derived from
+_CLAUDE_FILES = ('linear-config.json', 'linear-tasks.json', 'linear-tasks.db',
+                 'linear-tasks.db-wal')
+_GIT_FILES = ('HEAD', 'reftable/tables.list')
+
+
+def linear_id_re():
+    """Compiled LIN-xxx pattern, built on first use."""
+    global _LINEAR_ID_RE
+    if _LINEAR_ID_RE is None:
+        import re
+        _LINEAR_ID_RE = re.compile(r'LIN-\d+', re.IGNORECASE)
+    return _LINEAR_ID_RE
+
+
+def get_main_repo_root():
+    """Get the main repo root (as a Path), even when inside a worktree."""
+    root = _git_state.get_main_repo_root()
+    if not root:
+        return None
+    from pathlib import Path
+    return Path(root)
+
+
+def _is_linear_branch(branch: str | None) -> bool:
+    return bool(branch and 'lin-' in branch.lower() and linear_id_re().search(branch))
+
+
+def _stamp(claude_dir: str, git_dir: str) -> str:
+    parts = []
+    for path in ([os.path.join(claude_dir, n) for n in _CLAUDE_FILES]
+                 + [os.path.join(git_dir, n) for n in _GIT_FILES]):
+        try:
+            st = os.stat(path)
+            parts.append(f'{st.st_ino}:{st.st_mtime_ns}:{st.st_size}')
+        except OSError:
+            parts.append('-')
+    return ' '.join(parts)
 
 
-def get_main_repo_root() -> Path | None:
-    """Get the main repo root, even when inside a worktree."""
+def _cache_path(git_dir: str) -> str:
+    from _runtime import repo_key, runtime_dir
+    return os.path.join(runtime_dir(), f'guard-{repo_key(git_dir)}')
+
+
+def _read_cache(path: str, key: str) -> bool | None:
     try:
-        result = subprocess.run(
-            ['git', 'rev-parse', '--git-common-dir'],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0:
-            git_common = Path(result.stdout.strip())
-            return git_common.parent
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+        with open(path, encoding='utf-8', errors='surrogateescape') as f:
+            stored, _, verdict = f.read().rpartition('\n')
+    except OSError:
+        return None
+    if stored != key or verdict not in ('0', '1'):
+        return None
+    return verdict == '1'
+
+
+def _write_cache(path: str, key: str, verdict: bool) -> None:
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp, 'w', encoding='utf-8', errors='surrogateescape') as f:
+            f.write(f'{key}\n{int(verdict)}')
+        os.replace(tmp, path)
+    except OSError:
         pass
-    return None
+
+
+def _evaluate(repo_root: str | None, claude_dir: str) -> bool:
+    """Checks 2 and 3 (check 1 has already failed)."""
+    # 2. Check the task registry for active tasks
+    if os.path.isdir(claude_dir):
+        from _task_registry import open_registry
+        if open_registry(repo_root or '.').has_tasks():
+            return True
+
+    # 3. Check if current git branch matches LIN-* pattern
+    return _is_linear_branch(_git_state.get_current_branch())
 
 
 def is_linear_project() -> bool:
     """Check if the current project is Linear-active."""
     # Resolve paths relative to main repo root (worktree-aware)
-    repo_root = get_main_repo_root()
-    config_base = repo_root if repo_root else Path('.')
+    git_dir = _git_state.find_git_dir()
+    repo_root = os.path.dirname(_git_state.get_common_dir(git_dir)) if git_dir else None
+    claude_dir = os.path.join(repo_root or '.', '.claude')
 
     # 1. Check for linear-config.json
-    if (config_base / '.claude' / 'linear-config.json').is_file():
+    if os.path.isfile(os.path.join(claude_dir, 'linear-config.json')):
         return True
 
-    # 2. Check for linear-tasks.json with active tasks
-    tasks_file = config_base / '.claude' / 'linear-tasks.json'
-    if tasks_file.is_file():
-        try:
-            data = json.loads(tasks_file.read_text())
-            if data.get('tasks'):
-                return True
-        except (json.JSONDecodeError, KeyError):
-            pass
+    if not git_dir:
+        return _evaluate(repo_root, claude_dir)
 
-    # 3. Check if current git branch matches LIN-* pattern
-    try:
-        result = subprocess.run(
-            ['git', 'branch', '--show-current'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            branch = result.stdout.strip()
-            if re.search(r'LIN-\d+', branch, re.IGNORECASE):
-                return True
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+    branch = _git_state.branch_from_head(_git_state.read_head(git_dir))
+    if branch != '.invalid' and not os.path.isdir(claude_dir):
+        # No registry to parse and no git to ask: cheaper than the cache
+        return _is_linear_branch(branch)
 
-    return False
+    path = _cache_path(git_dir)
+    key = f'{repo_root}\0{git_dir}\0{_stamp(claude_dir, git_dir)}'
+    verdict = _read_cache(path, key)
+    if verdict is None:
+        verdict = _evaluate(repo_root, claude_dir)
+        _write_cache(path, key, verdict)
+    return verdict
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Durable outbox of Linear updates (.claude/linear-outbox.jsonl), so hooks
+queue status changes and progress notes instead of asking for one API
+call each, and skills post them in one batch per issue.
+
+The file is append-only JSON lines; every write holds an exclusive
+`fcntl` lock on .claude/linear-outbox.lock, so hooks from parallel
+sessions and a flush never interleave. Records:
+
+  {"op": "status", "id", "issue", "state", "at"}        set the issue state
+  {"op": "note", "id", "issue", "kind", "body", "at"}   add to the comment
+  {"op": "batch", "key", "issue", "ids", "state", "comment", "at"}
+  {"op": "ack", "key"}                                  batch posted
+  {"op": "done", "ids"}                                 recently posted ids
+
+Every entry carries an idempotency id chosen by the caller from what it
+describes (`progress:LIN-1:<head sha>`, `pr-created:LIN-1:42`), so a hook
+that fires twice or a skill that queues what a hook already queued adds
+nothing: add() skips ids the file already holds, checked under the lock. Pending entries of an issue are coalesced: the latest status
+wins, the newest "progress" note replaces older ones, other notes are
+kept in order without repeats.
+
+flush() turns the pending entries of each issue into a batch record with
+a key derived from the entry ids and returns it; the comment ends with
+MARKER, so a flush retried after a crash (batch claimed, never acked)
+returns the same batch with retry=True and the poster can look for the
+marker among the issue's comments before posting again. ack() retires a
+batch; once nothing is pending the file is rewritten down to the last
+KEEP_DONE posted ids, otherwise it is compacted when it passes
+COMPACT_BYTES.
+"""
+
+import json
+import os
+import time
+
+OUTBOX_FILE = 'linear-outbox.jsonl'
+LOCK_FILE = 'linear-outbox.lock'
+MARKER = '<!-- yux-outbox:{key} -->'
+COMPACT_BYTES = 64 * 1024
+KEEP_DONE = 200
+
+
+class _Lock:
+    """Exclusive advisory lock on the outbox lock file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd = None
+
+    def __enter__(self):
+        import fcntl
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        import fcntl
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        os.close(self.fd)
+        self.fd = None
+
+
+def batch_key(ids: list[str]) -> str:
+    import hashlib
+    return hashlib.sha1('\n'.join(sorted(ids)).encode('utf-8')).hexdigest()[:12]
+
+
+def coalesce(entries: list[dict]) -> tuple[str | None, str | None]:
+    """(state, comment) for one issue's entries, oldest first."""
+    state = None
+    notes: list[tuple[str, str]] = []
+    for entry in entries:
+        if entry['op'] == 'status':
+            state = entry['state']
+        elif entry.get('kind') == 'progress':
+            notes = [n for n in notes if n[0] != 'progress'] + [('progress', entry['body'])]
+        elif all(body != entry['body'] for _, body in notes):
+            notes.append((entry.get('kind') or 'note', entry['body']))
+    comment = '\n\n'.join(body for _, body in notes) or None
+    return state, comment
+
+
+class Outbox:
+    """Queue of pending Linear updates in one .claude directory."""
+
+    def __init__(self, claude_dir: str):
+        self.path = os.path.join(claude_dir, OUTBOX_FILE)
+        self.lock_path = os.path.join(claude_dir, LOCK_FILE)
+
+    # Writes
+
+    def _append(self, records: list[dict]) -> None:
+        data = ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data.encode('utf-8'))
+        finally:
+            os.close(fd)
+
+    def add(self, issue: str, entry_id: str, state: str | None = None,
+            note: str | None = None, kind: str = 'note') -> int:
+        """Queue a status change and/or a note for issue; an id already in the
+        file (pending, claimed or posted) is not written again. Returns the
+        number of records appended."""
+        at = int(time.time())
+        records = []
+        if state:
+            records.append({"op": "status", "id": f"{entry_id}:state", "issue": issue,
+                            "state": state, "at": at})
+        if note:
+            records.append({"op": "note", "id": entry_id, "issue": issue, "kind": kind,
+                            "body": note, "at": at})
+        if not records:
+            return 0
+        with _Lock(self.lock_path):
+            known = self._ids(self._read())
+            records = [r for r in records if r['id'] not in known]
+            if records:
+                self._append(records)
+        return len(records)
+
+    # Reads
+
+    def _read(self) -> list[dict]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError:
+            return []
+        records = []
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a torn last line from a crash mid-write
+            if isinstance(record, dict) and 'op' in record:
+                records.append(record)
+        return records
+
+    @staticmethod
+    def _ids(records: list[dict]) -> set[str]:
+        """Every entry id the file still knows: queued, in a batch or posted."""
+        ids = set()
+        for record in records:
+            op = record['op']
+            if op in ('status', 'note'):
+                ids.add(record.get('id') or '')
+            elif op in ('batch', 'done'):
+                ids.update(record.get('ids') or ())
+        return ids
+
+    @staticmethod
+    def _state(records: list[dict]) -> tuple[list[dict], dict[str, dict], set[str]]:
+        """(pending entries, open batches by key, posted ids)."""
+        entries: dict[str, dict] = {}
+        batches: dict[str, dict] = {}
+        acked: set[str] = set()
+        posted: set[str] = set()
+        for record in records:
+            op = record['op']
+            if op in ('status', 'note'):
+                entries.setdefault(record.get('id') or '', record)
+            elif op == 'batch':
+                batches[record['key']] = record
+            elif op == 'ack':
+                acked.add(record['key'])
+            elif op == 'done':
+                posted.update(record.get('ids') or ())
+        claimed = set()
+        for key, batch in list(batches.items()):
+            if key in acked:
+                posted.update(batch['ids'])
+                del batches[key]
+            else:
+                claimed.update(batch['ids'])
+        pending = [e for i, e in entries.items() if i not in posted and i not in claimed]
+        return pending, batches, posted
+
+    def pending(self) -> dict[str, dict]:
+        """Issue -> {"state", "comment", "entries"} not yet claimed by a flush."""
+        pending, _, _ = self._state(self._read())
+        by_issue: dict[str, list[dict]] = {}
+        for entry in pending:
+            by_issue.setdefault(entry['issue'], []).append(entry)
+        result = {}
+        for issue, entries in by_issue.items():
+            state, comment = coalesce(entries)
+            result[issue] = {"state": state, "comment": comment, "entries": len(entries)}
+        return result
+
+    def flush(self, issue: str | None = None) -> list[dict]:
+        """Batches to post: open (retried) ones first, then one new batch per
+        issue with pending entries. New batches are recorded before returning."""
+        with _Lock(self.lock_path):
+            pending, batches, _ = self._state(self._read())
+            out = [dict(b, retry=True) for b in batches.values()
+                   if issue is None or b['issue'] == issue]
+            busy = {b['issue'] for b in batches.values()}
+            by_issue: dict[str, list[dict]] = {}
+            for entry in pending:
+                # An issue waits for its open batch, so the two never both post
+                if entry['issue'] not in busy and (issue is None or entry['issue'] == issue):
+                    by_issue.setdefault(entry['issue'], []).append(entry)
+            new = []
+            for name, entries in by_issue.items():
+                ids = [e['id'] for e in entries]
+                key = batch_key(ids)
+                state, comment = coalesce(entries)
+                if comment:
+                    comment += '\n\n' + MARKER.format(key=key)
+                new.append({"op": "batch", "key": key, "issue": name, "ids": ids,
+                            "state": state, "comment": comment, "at": int(time.time())})
+            if new:
+                self._append(new)
+        return out + [dict(b, retry=False) for b in new]
+
+    def ack(self, keys: list[str]) -> int:
+        """Mark batches posted; returns how many were open."""
+        with _Lock(self.lock_path):
+            records = self._read()
+            _, batches, _ = self._state(records)
+            known = [k for k in keys if k in batches]
+            if known:
+                self._append([{"op": "ack", "key": k} for k in known])
+                self._compact(records + [{"op": "ack", "key": k} for k in known])
+        return len(known)
+
+    def drop(self, issue: str) -> int:
+        """Discard the pending and open entries of issue; returns how many."""
+        with _Lock(self.lock_path):
+            records = self._read()
+            pending, batches, _ = self._state(records)
+            ids = [e['id'] for e in pending if e['issue'] == issue]
+            keys = [k for k, b in batches.items() if b['issue'] == issue]
+            extra = []
+            if ids:
+                extra.append({"op": "done", "ids": ids})
+            extra += [{"op": "ack", "key": k} for k in keys]
+            if extra:
+                self._append(extra)
+                self._compact(records + extra)
+        return len(ids) + sum(len(batches[k]['ids']) for k in keys)
+
+    def _compact(self, records: list[dict]) -> None:
+        """Rewrite the file with live records only (lock held)."""
+        pending, batches, posted = self._state(records)
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if (pending or batches) and size <= COMPACT_BYTES:
+            return
+        claimed = {i for b in batches.values() for i in b['ids']}
+        live = [r for r in records if r['op'] in ('status', 'note') and r['id'] in claimed]
+        live += pending + list(batches.values())
+        # Keep the newest posted ids so a late duplicate is still recognised
+        done = []
+        for record in records:
+            if record['op'] == 'done':
+                done.extend(record.get('ids') or ())
+            elif record['op'] in ('status', 'note') and record.get('id') in posted:
+                done.append(record['id'])
+        done = list(dict.fromkeys(done))[-KEEP_DONE:]
+        if done:
+            live.insert(0, {"op": "done", "ids": done})
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(r, ensure_ascii=False) + '\n' for r in live)
+        os.replace(tmp, self.path)
+
+    def stats(self) -> dict:
+        records = self._read()
+        pending, batches, _ = self._state(records)
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        return {"pending": len(pending), "issues": len({e['issue'] for e in pending}),
+                "open_batches": len(batches), "records": len(records), "bytes": size}
+
+
+def open_outbox(repo_root: str | None = None) -> Outbox:
+    """Open the outbox of the main repo (worktree-aware when repo_root is None)."""
+    if repo_root is None:
+        from _git_state import get_main_repo_root
+        repo_root = get_main_repo_root() or os.getcwd()
+    return Outbox(os.path.join(repo_root, '.claude'))
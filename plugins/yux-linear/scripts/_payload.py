@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Streaming reader for hook payloads: extract a few fields, skip the rest.
+
+Hook payloads can be huge (the full content of a Write call, megabytes of
+build output in tool_output.stdout) while the checks only look at a couple
+of small fields. read_payload() walks the JSON in fixed-size chunks and
+only builds the values it was asked for; everything else is skipped with
+regex scans over the chunk, so memory stays at a few chunks regardless of
+the payload size.
+
+Fields are dotted paths into the top-level object, mapped to a cap:
+
+  {'tool_name': None, 'tool_output.stdout': 65536}
+
+None means "the whole value". A cap keeps only the first and last `cap`
+characters of a string value, joined by TRUNCATED_MARK.
+"""
+
+import re
+from json.decoder import scanstring
+
+CHUNK_SIZE = 1 << 16
+TRUNCATED_MARK = '\n[... truncated ...]\n'
+
+_WS = ' \t\n\r'
+_SCALAR = re.compile(r'-?(?:0|[1-9]\d*)(\.\d+)?([eE][-+]?\d+)?|true|false|null')
+_NUMBER_CHARS = re.compile(r'[-+0-9.eE]*')
+_SURROGATE = re.compile('[\ud800-\udfff]')
+
+
+class PayloadError(ValueError):
+    """Raised for input that is not valid JSON."""
+
+
+def _safe_end(buf: str, start: int) -> int:
+    """End of buf[start:] with a trailing partial escape cut off."""
+    end = len(buf)
+    k = buf.rfind('\\', max(start, end - 6), end)
+    if k < 0:
+        return end
+    j = k
+    while j > start and buf[j - 1] == '\\':
+        j -= 1
+    # buf[j..k] are backslashes; an odd count means buf[k] starts an escape
+    if (k - j) % 2 == 0 and (k + 1 == end or (buf[k + 1] == 'u' and end - k < 6)):
+        return k
+    return end
+
+
+def _join_surrogates(text: str) -> str:
+    """Combine a \\ud83d\\ude00-style pair split across two runs."""
+    if _SURROGATE.search(text):
+        return text.encode('utf-16', 'surrogatepass').decode('utf-16', 'replace')
+    return text
+
+
+class _Scanner:
+    """Chunked cursor over a text stream (or a string already in memory)."""
+
+    def __init__(self, source, chunk_size: int = CHUNK_SIZE):
+        if isinstance(source, str):
+            self.stream, self.buf, self.eof = None, source, True
+        else:
+            self.stream, self.buf, self.eof = source, '', False
+        self.pos = 0
+        self.chunk_size = chunk_size
+
+    def more(self) -> bool:
+        """Drop consumed text and append the next chunk; False at EOF."""
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at EOF), without consuming it."""
+        while True:
+            buf, pos, n = self.buf, self.pos, len(self.buf)
+            while pos < n and buf[pos] in _WS:
+                pos += 1
+            self.pos = pos
+            if pos < n:
+                return buf[pos]
+            if not self.more():
+                return ''
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise PayloadError(f"expected {char!r} at offset {self.pos}")
+        self.pos += 1
+
+    def string_pieces(self):
+        """Yield the decoded content of the string at the cursor, chunk by chunk."""
+        self.expect('"')
+        carry = ''
+        while True:
+            try:
+                text, end = scanstring(self.buf, self.pos)
+                done = True
+            except ValueError:
+                # No closing quote in this chunk (or an invalid escape):
+                # decode what is complete and read on
+                end = _safe_end(self.buf, self.pos)
+                try:
+                    text = scanstring(self.buf[self.pos:end] + '"', 0)[0]
+                except ValueError as e:
+                    raise PayloadError(str(e)) from None
+                done = False
+            self.pos = end
+            text, joined = carry + text, bool(carry)
+            # Keep a trailing high surrogate until its pair arrives
+            if not done and text and '\ud800' <= text[-1] <= '\udbff':
+                text, carry = text[:-1], text[-1]
+            else:
+                carry = ''
+            if text:
+                yield _join_surrogates(text) if joined else text
+            if done:
+                return
+            if not self.more():
+                raise PayloadError("unterminated string")
+
+    def skip_string(self) -> None:
+        for _ in self.string_pieces():
+            pass
+
+    def read_string(self, cap: int | None = None) -> str:
+        if cap is None:
+            return ''.join(self.string_pieces())
+        head, tail, total = [], '', 0
+        head_len = 0
+        for text in self.string_pieces():
+            total += len(text)
+            if head_len < cap:
+                head.append(text[:cap - head_len])
+                head_len += len(head[-1])
+            tail = (tail + text)[-cap:]
+        head = ''.join(head)
+        if total <= cap:
+            return head
+        if total <= 2 * cap:
+            return head + tail[cap - (total - cap):]
+        return head + TRUNCATED_MARK + tail
+
+    def scalar(self):
+        char = self.peek()
+        # A number may continue in the next chunk
+        while (char not in 'tfn'
+               and _NUMBER_CHARS.match(self.buf, self.pos).end() == len(self.buf)
+               and self.more()):
+            pass
+        match = _SCALAR.match(self.buf, self.pos)
+        if not match:
+            if len(self.buf) - self.pos < 5 and self.more():
+                return self.scalar()
+            raise PayloadError(f"unexpected input at offset {self.pos}")
+        self.pos = match.end()
+        text = match.group(0)
+        if text == 'true':
+            return True
+        if text == 'false':
+            return False
+        if text == 'null':
+            return None
+        return float(text) if match.group(1) or match.group(2) else int(text)
+
+    def members(self):
+        """Iterate an object's keys; the caller consumes each value."""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.read_string()
+            self.expect(':')
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise PayloadError(f"expected ',' or '}}' at offset {self.pos - 1}")
+
+    def items(self):
+        """Iterate an array; the caller consumes each element."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise PayloadError(f"expected ',' or ']' at offset {self.pos - 1}")
+
+    def value(self):
+        """Parse and build the value at the cursor."""
+        char = self.peek()
+        if char == '"':
+            return self.read_string()
+        if char == '{':
+            return {key: self.value() for key in self.members()}
+        if char == '[':
+            return [self.value() for _ in self.items()]
+        return self.scalar()
+
+    def skip(self) -> None:
+        """Consume the value at the cursor without building it."""
+        char = self.peek()
+        if char == '"':
+            self.skip_string()
+        elif char == '{':
+            for _ in self.members():
+                self.skip()
+        elif char == '[':
+            for _ in self.items():
+                self.skip()
+        else:
+            self.scalar()
+
+
+def _field_tree(fields: dict[str, int | None]) -> dict:
+    """{'a.b': cap} -> {'a': {'b': ('leaf', cap)}}."""
+    tree: dict = {}
+    for path, cap in fields.items():
+        node = tree
+        *parents, leaf = path.split('.')
+        for name in parents:
+            child = node.get(name)
+            if not isinstance(child, dict):
+                child = node[name] = {}
+            node = child
+        if not isinstance(node.get(leaf), dict):
+            node[leaf] = ('leaf', cap)
+    return tree
+
+
+def _extract(scanner: _Scanner, tree: dict) -> dict:
+    out = {}
+    for key in scanner.members():
+        spec = tree.get(key)
+        if spec is None:
+            scanner.skip()
+        elif isinstance(spec, dict):
+            if scanner.peek() == '{':
+                out[key] = _extract(scanner, spec)
+            else:
+                scanner.skip()
+        elif spec[1] is not None and scanner.peek() == '"':
+            out[key] = scanner.read_string(spec[1])
+        else:
+            out[key] = scanner.value()
+    return out
+
+
+def read_payload(source, fields: dict[str, int | None] | None = None,
+                 chunk_size: int = CHUNK_SIZE) -> dict | None:
+    """Extract fields from a JSON object on source (a text stream or str).
+
+    fields=None parses the whole object. Returns None if the input is not
+    a JSON object.
+    """
+    scanner = _Scanner(source, chunk_size)
+    try:
+        if scanner.peek() != '{':
+            return None
+        if fields is None:
+            data = scanner.value()
+        else:
+            data = _extract(scanner, _field_tree(fields))
+        if scanner.peek() != '':
+            return None
+    except (PayloadError, RecursionError):
+        return None
+    return data
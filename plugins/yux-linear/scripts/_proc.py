@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Subprocess calls made by the hook scripts, under a shared deadline.
+
+Every spawn goes through here so _trace can count forks and time each
+call as a `proc:<command>` span. subprocess itself is imported on first
+use: bench/import_budget.py keeps it off the hook start path.
+
+linear_hook sets a deadline per event (a fraction of the hooks.json
+timeout, see linear_hook.time_budget). Each subprocess then gets only
+the time that remains, none is started once the budget is gone, and
+optional extras check has_budget() first, so a slow git degrades the
+output instead of getting the whole hook killed. Reads that can block
+inside a C call run under alarm(), which kills the child and raises
+DeadlineExceeded through SIGALRM; CPU-bound steps whose cost grows with
+the payload (tokenizing a huge Bash command) run under alarm() without a
+child. Without a deadline (CLI use) all of this is a no-op.
+"""
+
+import os
+import time
+
+import _trace
+
+# Below this many seconds left, no subprocess is started
+MIN_SPAWN_BUDGET = 0.05
+# Optional extras (commit walks, multi-task listings) need this much left
+EXTRA_BUDGET = 1.0
+
+_deadline = None
+
+
+class DeadlineExceeded(TimeoutError):
+    """The hook's time budget is used up."""
+
+
+def set_deadline(seconds: float | None) -> None:
+    """Start a budget of seconds from now (None: no deadline)."""
+    global _deadline
+    _deadline = None if seconds is None else time.monotonic() + seconds
+
+
+def remaining() -> float | None:
+    """Seconds left before the deadline, None without one."""
+    return None if _deadline is None else _deadline - time.monotonic()
+
+
+def has_budget(seconds: float = EXTRA_BUDGET) -> bool:
+    """True when at least seconds remain (always, without a deadline)."""
+    left = remaining()
+    return left is None or left >= seconds
+
+
+def clamp(timeout: float) -> float:
+    """timeout cut to what remains; DeadlineExceeded when nearly nothing does."""
+    left = remaining()
+    if left is None:
+        return timeout
+    if left < MIN_SPAWN_BUDGET:
+        raise DeadlineExceeded("hook time budget used up")
+    return min(timeout, left)
+
+
+def label(cmd: list[str]) -> str:
+    """Span name for a command: program and first non-option argument."""
+    words = [os.path.basename(cmd[0])] if cmd else []
+    skip = False
+    for arg in cmd[1:]:
+        if skip:
+            skip = False
+        elif arg in ('-C', '-c'):
+            skip = True
+        elif not arg.startswith('-'):
+            words.append(arg)
+            break
+    return 'proc:' + ' '.join(words)
+
+
+def run(cmd: list[str], timeout: float, **kwargs):
+    """subprocess.run, counted, timed and limited to the remaining budget."""
+    import subprocess
+    timeout = clamp(timeout)
+    with _trace.span(label(cmd)):
+        _trace.count_fork()
+        return subprocess.run(cmd, timeout=timeout, **kwargs)
+
+
+def popen(cmd: list[str], **kwargs):
+    """subprocess.Popen, counted; the caller times the read loop with
+    _trace.span(label(cmd)) and bounds it with alarm(proc)."""
+    import subprocess
+    clamp(MIN_SPAWN_BUDGET)
+    _trace.count_fork()
+    return subprocess.Popen(cmd, **kwargs)
+
+
+class alarm:
+    """Bound a blocking read of proc's output, or any work when proc is
+    None, by the remaining budget.
+
+    When the deadline passes, SIGALRM kills proc (if any) and raises
+    DeadlineExceeded wherever the main thread is. A no-op without a
+    deadline, off the main thread, or where SIGALRM does not exist.
+    """
+
+    def __init__(self, proc=None):
+        self.proc = proc
+        self.previous = None
+        self.armed = False
+
+    def _fire(self, signum, frame):
+        if self.proc is not None:
+            try:
+                self.proc.kill()
+            except OSError:
+                pass
+        raise DeadlineExceeded("hook time budget used up")
+
+    def __enter__(self):
+        left = remaining()
+        if left is None:
+            return self
+        import signal
+        try:
+            self.previous = signal.signal(signal.SIGALRM, self._fire)
+        except (ValueError, AttributeError):
+            return self
+        self.armed = True
+        signal.setitimer(signal.ITIMER_REAL, max(left, 0.001))
+        return self
+
+    def __exit__(self, *exc):
+        if self.armed:
+            import signal
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, self.previous)
+        return False
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Per-user runtime paths shared by the hook daemon and its clients.
+
+The daemon listens on one Unix socket per main repo root. Sockets live in
+$XDG_RUNTIME_DIR/yux-linear (or a private /tmp fallback) so they never end
+up inside the repository.
+"""
+
+import os
+
+
+def runtime_dir() -> str:
+    """Return the private runtime directory, creating it if needed."""
+    base = os.environ.get('XDG_RUNTIME_DIR')
+    if base and os.path.isdir(base):
+        path = os.path.join(base, 'yux-linear')
+    else:
+        tmp = os.environ.get('TMPDIR') or '/tmp'
+        path = os.path.join(tmp, f'yux-linear-{os.getuid()}')
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
+
+
+def repo_key(repo_root: str) -> str:
+    """Stable short key for a main repo root.
+
+    zlib checksums rather than hashlib: the key is computed on every hook
+    event and loading OpenSSL costs more than the rest of the startup.
+    """
+    import zlib
+    real = os.path.realpath(repo_root).encode('utf-8', 'surrogateescape')
+    return f'{zlib.crc32(real):08x}{zlib.adler32(real):08x}'
+
+
+def socket_path(repo_root: str) -> str:
+    """Unix socket path of the hook daemon serving repo_root."""
+    return os.path.join(runtime_dir(), f'hookd-{repo_key(repo_root)}.sock')
+
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Single-pass tokenizer for the Bash commands the hooks inspect.
+
+split_commands() cuts a command line into simple commands ("segments")
+at &&, ||, ;, |, |&, &, parentheses and newlines. Each segment carries its
+argv after quote removal, the bodies of its heredocs, and the parsed
+segments of every $(...) substitution, keyed by argv index. git_call(),
+commit_args() and gh_call() read git/gh invocations from a segment, so
+validate_commit.py and post_command.py no longer match regexes against
+the raw command.
+
+This is not a shell: nothing is expanded or run, $VAR and globs stay
+literal, redirection targets are dropped, and compound commands
+(if/while/{ }) are flattened into their simple commands. It is linear in
+the input: the cursor only moves forward, an unquoted word and the blanks
+after it are taken by one non-backtracking regex match (so is each
+operator and redirection), heredoc bodies are read line by line with
+str.find, and $(...) nested deeper than MAX_DEPTH is skipped by counting
+parentheses instead of being parsed. Unterminated quotes, substitutions
+and heredocs run to the end of the input rather than fail. The constant
+is still Python's: a megabyte of one-character commands takes about a
+second, so the hooks tokenize under _proc.alarm() and skip the check at
+their deadline.
+"""
+
+import re
+from types import MappingProxyType
+
+# $(...) nesting parsed into segments; deeper levels are kept as raw text
+MAX_DEPTH = 16
+
+_PLAIN = re.compile(r'[^ \t\n\'"\\$`;&|<>()#]+')
+# A whole unquoted word and the blanks after it, when nothing else joins it
+_PLAIN_WORD = re.compile(r'([^ \t\n\'"\\$`;&|<>()#]+)(?:[ \t]+|(?=[\n;&|()])|\Z)')
+_BLANKS = re.compile(r'[ \t]+')
+# Characters _PLAIN stops at
+_SPECIAL = frozenset(' \t\n\'"\\$`;&|<>()#')
+_NO_SUBS = MappingProxyType({})
+_DQ_PLAIN = re.compile(r'[^"\\$`]+')
+_OPERATOR = re.compile(r'&&|\|\||;;|\|&|[;|&]')
+_REDIRECTION = re.compile(r'<<<|<<-|&>>|<<|>>|<>|<&|>&|>\||&>|[<>]')
+_ANSI_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', 'a': '\a', 'b': '\b', 'e': '\x1b',
+                 'f': '\f', 'v': '\v', '\\': '\\', "'": "'", '"': '"'}
+
+# Words that may precede the command name of a simple command
+_PREFIX_WORDS = frozenset({'!', '{', 'if', 'then', 'elif', 'else', 'while', 'until', 'do',
+                           'time', 'command', 'exec', 'nohup'})
+# git options that take the next word as their value
+_GIT_VALUE_OPTIONS = frozenset({'-C', '-c', '--git-dir', '--work-tree', '--namespace',
+                                '--config-env', '--super-prefix', '--exec-path'})
+# git commit options that take a value, beyond -m/-F
+_COMMIT_SHORT_VALUES = frozenset('mFcCt')
+_COMMIT_LONG_VALUES = frozenset({'--message', '--file', '--template', '--reuse-message',
+                                 '--reedit-message', '--fixup', '--squash', '--author',
+                                 '--date', '--cleanup', '--trailer', '--pathspec-from-file'})
+
+
+class Segment:
+    """One simple command and the operator that ended it (None at the end).
+
+    heredocs and subs stay shared empty (read-only) values until the parser
+    has something to put in them, so a long chain of plain commands does not
+    allocate two containers per segment.
+    """
+
+    __slots__ = ('argv', 'op', 'heredocs', 'subs')
+    argv: list[str]
+    op: str | None
+    heredocs: list[str] | tuple[()]
+    subs: dict[int, list['Segment']] | MappingProxyType
+
+    def __init__(self):
+        self.argv = []
+        self.op = None
+        self.heredocs = ()
+        self.subs = _NO_SUBS
+
+    def __repr__(self):
+        return f'Segment(argv={self.argv!r}, op={self.op!r}, heredocs={len(self.heredocs)})'
+
+
+class _Parser:
+    __slots__ = ('s', 'n', 'i')
+
+    def __init__(self, text: str):
+        self.s = text
+        self.n = len(text)
+        self.i = 0
+
+    def parse(self, depth: int = 0, nested: bool = False) -> list['Segment']:
+        """Segments up to the end of input or, when nested, the ')' closing a $(...)."""
+        s, n = self.s, self.n
+        segments: list[Segment] = []
+        seg = Segment()
+        word: list[str] = []
+        in_word = False
+        word_subs: list[Segment] = []
+        target = None           # redirection waiting for its target word
+        pending = []            # (delimiter, strip tabs, segment) heredocs
+        parens = 0
+
+        def finish_word():
+            nonlocal word, in_word, word_subs, target
+            if not in_word:
+                return
+            text = ''.join(word)
+            if target is None:
+                if word_subs:
+                    if not seg.subs:
+                        seg.subs = {}
+                    seg.subs[len(seg.argv)] = word_subs
+                seg.argv.append(text)
+            elif target in ('<<', '<<-'):
+                pending.append((text, target == '<<-', seg))
+            target = None
+            word, in_word, word_subs = [], False, []
+
+        def end_segment(op):
+            nonlocal seg, target
+            finish_word()
+            target = None
+            if seg.argv or (pending and pending[-1][2] is seg):
+                seg.op = op
+                segments.append(seg)
+                seg = Segment()
+
+        while self.i < n:
+            c = s[self.i]
+            if c not in _SPECIAL:
+                if not in_word and target is None:
+                    m = _PLAIN_WORD.match(s, self.i)
+                    if m:
+                        seg.argv.append(m.group(1))
+                        self.i = m.end()
+                        continue
+                m = _PLAIN.match(s, self.i)
+                word.append(m.group())
+                in_word = True
+                self.i = m.end()
+            elif c in ';|' or (c == '&' and not s.startswith('&>', self.i)):
+                op = _OPERATOR.match(s, self.i).group()
+                self.i += len(op)
+                end_segment(op)
+            elif c == ' ' or c == '\t':
+                finish_word()
+                self.i = _BLANKS.match(s, self.i).end()
+            elif c == '\n':
+                self.i += 1
+                end_segment('\n')
+                for delimiter, strip, owner in pending:
+                    if not owner.heredocs:
+                        owner.heredocs = []
+                    owner.heredocs.append(self._heredoc(delimiter, strip))
+                pending = []
+            elif c == '#' and not in_word:
+                j = s.find('\n', self.i)
+                self.i = n if j < 0 else j
+            elif c == '#':
+                word.append(c)
+                self.i += 1
+            elif c == "'":
+                j = s.find("'", self.i + 1)
+                j = n if j < 0 else j
+                word.append(s[self.i + 1:j])
+                in_word = True
+                self.i = j + 1
+            elif c == '"':
+                self.i += 1
+                self._double_quoted(word, word_subs, depth)
+                in_word = True
+            elif c == '\\':
+                if self.i + 1 < n and s[self.i + 1] != '\n':
+                    word.append(s[self.i + 1])
+                    in_word = True
+                self.i += 2
+            elif c == '$':
+                self._dollar(word, word_subs, depth)
+                in_word = True
+            elif c == '`':
+                word.append(self._backticks())
+                in_word = True
+            elif c in '<>' or (c == '&' and s.startswith('&>', self.i)):
+                if in_word and ''.join(word).isdigit():
+                    word, in_word = [], False        # 2>file: the fd is not an argument
+                finish_word()
+                op = self._redirection()
+                if op not in ('>&', '<&') or not self._fd_follows():
+                    target = op
+            elif c == '(':
+                end_segment('(')
+                parens += 1
+                self.i += 1
+            else:
+                self.i += 1
+                if nested and parens == 0:
+                    end_segment(None)
+                    return segments
+                parens = max(0, parens - 1)
+                end_segment(')')
+        end_segment(None)
+        for delimiter, strip, owner in pending:
+            if not owner.heredocs:
+                owner.heredocs = []
+            owner.heredocs.append('')
+        return segments
+
+    def _double_quoted(self, word: list[str], word_subs: list['Segment'], depth: int) -> None:
+        s, n = self.s, self.n
+        while self.i < n:
+            m = _DQ_PLAIN.match(s, self.i)
+            if m:
+                word.append(m.group())
+                self.i = m.end()
+                continue
+            c = s[self.i]
+            if c == '"':
+                self.i += 1
+                return
+            if c == '\\':
+                nxt = s[self.i + 1:self.i + 2]
+                if nxt in ('"', '\\', '$', '`'):
+                    word.append(nxt)
+                elif nxt != '\n':
+                    word.append('\\' + nxt)
+                self.i += 2
+            elif c == '$':
+                self._dollar(word, word_subs, depth)
+            else:
+                word.append(self._backticks())
+
+    def _dollar(self, word: list[str], word_subs: list['Segment'], depth: int) -> None:
+        s, start = self.s, self.i
+        nxt = s[start + 1:start + 2]
+        if nxt == '(':
+            self.i += 2
+            if depth < MAX_DEPTH:
+                word_subs.extend(self.parse(depth + 1, nested=True))
+            else:
+                self._skip_parens()
+            word.append(s[start:self.i])
+        elif nxt == '{':
+            self.i += 2
+            level = 1
+            while self.i < self.n and level:
+                c = s[self.i]
+                if c == '{':
+                    level += 1
+                elif c == '}':
+                    level -= 1
+                elif c == '\\':
+                    self.i += 1
+                self.i += 1
+            word.append(s[start:self.i])
+        elif nxt == "'":
+            self.i += 2
+            while self.i < self.n and s[self.i] != "'":
+                c = s[self.i]
+                if c == '\\' and self.i + 1 < self.n:
+                    self.i += 1
+                    esc = s[self.i]
+                    word.append(_ANSI_ESCAPES.get(esc, '\\' + esc))
+                else:
+                    word.append(c)
+                self.i += 1
+            self.i += 1
+        else:
+            word.append('$')
+            self.i += 1
+
+    def _skip_parens(self) -> None:
+        """Skip to the ')' closing a too-deep $(...), counting parentheses."""
+        s, level = self.s, 1
+        while self.i < self.n and level:
+            c = s[self.i]
+            if c == '(':
+                level += 1
+            elif c == ')':
+                level -= 1
+            elif c == '\\':
+                self.i += 1
+            self.i += 1
+
+    def _backticks(self) -> str:
+        s, start = self.s, self.i
+        self.i += 1
+        while self.i < self.n and s[self.i] != '`':
+            self.i += 2 if s[self.i] == '\\' else 1
+        self.i = min(self.i + 1, self.n)
+        return s[start:self.i]
+
+    def _redirection(self) -> str:
+        op = _REDIRECTION.match(self.s, self.i).group()
+        self.i += len(op)
+        return op
+
+    def _fd_follows(self) -> bool:
+        """After >& or <&: a file descriptor (2>&1) or '-' instead of a path."""
+        j = self.i
+        while j < self.n and (self.s[j].isdigit() or self.s[j] == '-'):
+            j += 1
+        if j > self.i and (j == self.n or self.s[j] in ' \t\n;&|)'):
+            self.i = j
+            return True
+        return False
+
+    def _heredoc(self, delimiter: str, strip_tabs: bool) -> str:
+        """Body lines after the current newline, up to the delimiter line."""
+        s, lines = self.s, []
+        while self.i < self.n:
+            j = s.find('\n', self.i)
+            end = self.n if j < 0 else j
+            line = s[self.i:end]
+            self.i = end + 1 if j >= 0 else self.n
+            if strip_tabs:
+                line = line.lstrip('\t')
+            if line == delimiter:
+                break
+            lines.append(line)
+        return '\n'.join(lines)
+
+
+def split_commands(command: str) -> list[Segment]:
+    """The simple commands of a Bash command line, in order."""
+    return _Parser(command).parse()
+
+
+def command_words(seg: Segment) -> tuple[int, list[str]]:
+    """(argv index of the command name, argv from it on), past variable
+    assignments and keywords such as `if`, `!` and `time`."""
+    argv = seg.argv
+    for index, word in enumerate(argv):
+        name, eq, _ = word.partition('=')
+        if word in _PREFIX_WORDS or (eq and name.isidentifier()):
+            continue
+        return index, argv[index:]
+    return len(argv), []
+
+
+def _program(word: str) -> str:
+    return word.rpartition('/')[2]
+
+
+def git_call(seg: Segment) -> tuple[str, int, str | None] | None:
+    """(subcommand, its argv index, last -C directory) for a git segment."""
+    index, words = command_words(seg)
+    if not words or _program(words[0]) != 'git':
+        return None
+    directory = None
+    j = 1
+    while j < len(words):
+        word = words[j]
+        if word in _GIT_VALUE_OPTIONS:
+            if word == '-C' and j + 1 < len(words):
+                value = words[j + 1]
+                directory = value if directory is None or value.startswith('/') \
+                    else f'{directory}/{value}'
+            j += 2
+        elif word.startswith('-'):
+            j += 1
+        else:
+            return word, index + j, directory
+    return None
+
+
+def gh_call(seg: Segment) -> list[str]:
+    """gh's arguments (e.g. ['pr', 'create', ...]) for a gh segment, else []."""
+    _, words = command_words(seg)
+    if words and _program(words[0]) == 'gh':
+        return words[1:]
+    return []
+
+
+def word_value(seg: Segment, index: int) -> str:
+    """argv[index], or the heredoc body when the word is "$(cat <<EOF ... EOF)"."""
+    word = seg.argv[index]
+    if word.startswith('$(') and word.endswith(')'):
+        for sub in seg.subs.get(index, ()):
+            if sub.heredocs and sub.argv[:1] == ['cat']:
+                return sub.heredocs[0]
+    return word
+
+
+def commit_args(seg: Segment) -> tuple[list[str], list[str]] | None:
+    """(-m messages, -F files) of a `git commit` segment, None otherwise."""
+    call = git_call(seg)
+    if call is None or call[0] != 'commit':
+        return None
+    argv = seg.argv
+    messages: list[str] = []
+    files: list[str] = []
+    j = call[1] + 1
+    while j < len(argv):
+        word = argv[j]
+        j += 1
+        if word == '--':
+            break
+        if word.startswith('--'):
+            name, eq, value = word.partition('=')
+            if name not in _COMMIT_LONG_VALUES:
+                continue
+            if not eq:
+                if j >= len(argv):
+                    break
+                value = word_value(seg, j)
+                j += 1
+            if name == '--message':
+                messages.append(value)
+            elif name == '--file':
+                files.append(value)
+        elif word.startswith('-') and len(word) > 1:
+            for k, flag in enumerate(word[1:], 2):
+                if flag not in _COMMIT_SHORT_VALUES:
+                    continue
+                if k < len(word):
+                    value = word[k:]
+                elif j < len(argv):
+                    value = word_value(seg, j)
+                    j += 1
+                else:
+                    break
+                if flag == 'm':
+                    messages.append(value)
+                elif flag == 'F':
+                    files.append(value)
+                break
+    return messages, files
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+"""
+Sprint scoping as a precedence-constrained knapsack.
+
+Given items (key, effort, value, required keys) and a capacity, pick the
+set with the highest total value that fits, where an item can only be
+picked together with every open item it requires (its blockers). Efforts
+are integer units (UNITS_PER_DAY per day), so XS = 1 unit.
+
+Items are split into dependency components. Each component contributes a
+short list of options, its feasible dependency-closed subsets with the
+dominated ones (heavier but not more valuable) dropped; independent
+issues are components of one item. A multiple-choice knapsack DP over the
+capacity then picks at most one option per component, which is exact.
+
+Two things make it inexact, and Plan.exact says so:
+  - a component with more than MAX_GROUP_OPTIONS closed subsets gets
+    greedy options (closures and greedy prefixes) instead of all of them;
+  - when the DP would exceed EXACT_CELL_LIMIT cells or the deadline, the
+    whole backlog is planned with the density greedy in _greedy_steps(),
+    which is bounded by the deadline too.
+"""
+
+import heapq
+import math
+import time
+from array import array
+
+EFFORT_DAYS = {'XS': 0.25, 'S': 0.5, 'M': 2, 'L': 5, 'XL': 10}
+UNITS_PER_DAY = 4
+# Linear's T-shirt estimate scale, stored as points on the issue
+TSHIRT_POINTS = {1: 'XS', 2: 'S', 3: 'M', 5: 'L', 8: 'XL'}
+
+MAX_GROUP_OPTIONS = 512
+MAX_ENUM_SIZE = 200
+EXACT_CELL_LIMIT = 2_000_000
+DEFAULT_DEADLINE = 2.0
+
+
+class _TooMany(Exception):
+    pass
+
+
+class Item:
+    """One plannable issue. requires: keys that must be planned first."""
+
+    __slots__ = ('key', 'units', 'value', 'requires')
+
+    def __init__(self, key: str, units: int, value: int, requires=()):
+        self.key = key
+        self.units = units
+        self.value = value
+        self.requires = tuple(requires)
+
+
+class Plan:
+    """Selected keys in dependency order, with totals."""
+
+    def __init__(self, keys: list[str], value: int, units: int, exact: bool,
+                 excluded: list[str] | None = None):
+        self.keys = keys
+        self.value = value
+        self.units = units
+        self.exact = exact
+        self.excluded = excluded or []
+
+
+def days_to_units(days: float) -> int:
+    return max(1, math.ceil(days * UNITS_PER_DAY - 1e-9))
+
+
+def units_to_days(units: int) -> float:
+    return units / UNITS_PER_DAY
+
+
+def size_of(issue: dict, default: str = 'M') -> str | float:
+    """T-shirt size (or a number of days) from effort, size or estimate."""
+    for field in ('effort', 'size', 'estimate'):
+        value = issue.get(field)
+        if isinstance(value, dict):
+            value = value.get('value', value.get('name'))
+        if isinstance(value, str) and value.strip().upper() in EFFORT_DAYS:
+            return value.strip().upper()
+        if field == 'estimate' and value in TSHIRT_POINTS:
+            return TSHIRT_POINTS[value]
+        if field != 'estimate' and isinstance(value, (int, float)) and value > 0:
+            return float(value)
+    return default
+
+
+def effort_days(size: str | float) -> float:
+    return EFFORT_DAYS[size] if isinstance(size, str) else size
+
+
+# Preparation
+
+def _schedulable(items: dict[str, Item], done) -> tuple[dict[str, Item], list[str], list[str]]:
+    """(pool, topological order, excluded keys).
+
+    Requirements already done are dropped. Items requiring something that
+    is neither done nor plannable, or caught in a dependency cycle, are
+    excluded along with everything that requires them.
+    """
+    reqs = {k: [r for r in item.requires if r not in done] for k, item in items.items()}
+    dependents: dict[str, list[str]] = {k: [] for k in items}
+    missing = {k for k, rs in reqs.items() if any(r not in items for r in rs)}
+    indegree = {}
+    for k, rs in reqs.items():
+        indegree[k] = len(rs)
+        for r in rs:
+            if r in dependents:
+                dependents[r].append(k)
+
+    # Kahn's algorithm; ties by value (best first), then key
+    ready = [(-items[k].value, k) for k, n in indegree.items() if n == 0]
+    heapq.heapify(ready)
+    order = []
+    while ready:
+        _, k = heapq.heappop(ready)
+        order.append(k)
+        for d in dependents[k]:
+            indegree[d] -= 1
+            if indegree[d] == 0:
+                heapq.heappush(ready, (-items[d].value, d))
+
+    bad = set(missing) | (items.keys() - set(order))
+    pool = {}
+    for k in order:
+        if k in bad or any(r in bad for r in reqs[k]):
+            bad.add(k)
+            continue
+        item = items[k]
+        pool[k] = Item(k, item.units, item.value, reqs[k])
+    return pool, [k for k in order if k in pool], sorted(bad)
+
+
+def _components(pool: dict[str, Item], order: list[str]) -> list[list[str]]:
+    """Dependency components, each in topological order."""
+    parent = {k: k for k in pool}
+
+    def find(k):
+        while parent[k] != k:
+            parent[k] = parent[parent[k]]
+            k = parent[k]
+        return k
+
+    for k, item in pool.items():
+        for r in item.requires:
+            a, b = find(k), find(r)
+            if a != b:
+                parent[a] = b
+    groups: dict[str, list[str]] = {}
+    for k in order:
+        groups.setdefault(find(k), []).append(k)
+    return list(groups.values())
+
+
+# Options per component
+
+def _pareto(options: list[tuple[int, int, tuple]]) -> list[tuple[int, int, tuple]]:
+    """Drop options that are no lighter and no more valuable than another."""
+    kept, best = [], 0
+    for option in sorted(options, key=lambda o: (o[0], -o[1])):
+        if option[1] > best:
+            kept.append(option)
+            best = option[1]
+    return kept
+
+
+def _enumerate_closed(comp: list[str], pool: dict[str, Item], capacity: int,
+                      limit: int) -> list[tuple[int, int, tuple]]:
+    """Every dependency-closed subset of comp that fits; _TooMany past limit."""
+    results = []
+    chosen: list[str] = []
+    chosen_set: set[str] = set()
+    n = len(comp)
+
+    def walk(i: int, units: int, value: int) -> None:
+        if i == n:
+            if chosen:
+                results.append((units, value, tuple(chosen)))
+                if len(results) > limit:
+                    raise _TooMany
+            return
+        item = pool[comp[i]]
+        if (units + item.units <= capacity
+                and all(r in chosen_set for r in item.requires)):
+            chosen.append(item.key)
+            chosen_set.add(item.key)
+            walk(i + 1, units + item.units, value + item.value)
+            chosen.pop()
+            chosen_set.discard(item.key)
+        walk(i + 1, units, value)
+
+    walk(0, 0, 0)
+    return results
+
+
+def _closures(keys: list[str], pool: dict[str, Item]) -> dict[str, frozenset]:
+    """Key -> itself plus everything it transitively requires (keys in topo order)."""
+    closure: dict[str, frozenset] = {}
+    for k in keys:
+        closure[k] = frozenset((k,)).union(*(closure[r] for r in pool[k].requires))
+    return closure
+
+
+def _greedy_steps(keys: list[str], pool: dict[str, Item], closure: dict[str, frozenset],
+                  capacity: int, stop: float | None, seed: frozenset = frozenset()) -> list[tuple]:
+    """Add closures by value density while they fit; returns each added step.
+
+    The seed (a closed set) is taken first. Densities are recomputed
+    lazily against what is already planned, then a last pass picks up
+    closures that only became worthwhile once their blockers were in.
+    The walk ends at the deadline with whatever it has.
+    """
+    index = {k: i for i, k in enumerate(keys)}
+    selected: set[str] = set()
+    used = 0
+    steps = []
+    if seed:
+        steps.append(tuple(sorted(seed, key=index.__getitem__)))
+        selected |= seed
+        used = sum(pool[k].units for k in seed)
+
+    def residual(k):
+        rest = closure[k] - selected
+        return rest, sum(pool[r].units for r in rest), sum(pool[r].value for r in rest)
+
+    def take(rest, units):
+        nonlocal used
+        steps.append(tuple(sorted(rest, key=index.__getitem__)))
+        selected.update(rest)
+        used += units
+
+    heap = []
+    for k in keys:
+        _, units, value = residual(k)
+        if value > 0:
+            heap.append((-value / units, k))
+    heapq.heapify(heap)
+    while heap:
+        if stop is not None and time.monotonic() > stop:
+            return steps
+        density, k = heapq.heappop(heap)
+        if k in selected:
+            continue
+        rest, units, value = residual(k)
+        if value <= 0 or used + units > capacity:
+            continue
+        if -value / units > density + 1e-12:
+            # Part of its closure got planned meanwhile; requeue at the new density
+            heapq.heappush(heap, (-value / units, k))
+            continue
+        take(rest, units)
+
+    for k in sorted(keys, key=lambda k: -pool[k].value):
+        if k in selected or pool[k].value <= 0:
+            continue
+        rest, units, value = residual(k)
+        if value > 0 and used + units <= capacity:
+            take(rest, units)
+    return steps
+
+
+def _heuristic_options(comp: list[str], pool: dict[str, Item], capacity: int,
+                       stop: float | None) -> list[tuple[int, int, tuple]]:
+    """Closures of single items plus every prefix of the greedy fill."""
+    index = {k: i for i, k in enumerate(comp)}
+    closure = _closures(comp, pool)
+    options = []
+    for keys in closure.values():
+        units = sum(pool[r].units for r in keys)
+        if units <= capacity:
+            options.append((units, sum(pool[r].value for r in keys),
+                            tuple(sorted(keys, key=index.__getitem__))))
+    units = value = 0
+    prefix: list[str] = []
+    for step in _greedy_steps(comp, pool, closure, capacity, stop):
+        prefix.extend(step)
+        units += sum(pool[r].units for r in step)
+        value += sum(pool[r].value for r in step)
+        options.append((units, value, tuple(prefix)))
+    return options
+
+
+def _group_options(comp: list[str], pool: dict[str, Item], capacity: int,
+                   stop: float | None) -> tuple[list, bool]:
+    """(options, complete) for one component."""
+    if len(comp) == 1:
+        item = pool[comp[0]]
+        fits = item.units <= capacity and item.value > 0
+        return ([(item.units, item.value, (item.key,))] if fits else []), True
+    if len(comp) <= MAX_ENUM_SIZE:
+        try:
+            return _pareto(_enumerate_closed(comp, pool, capacity, MAX_GROUP_OPTIONS)), True
+        except _TooMany:
+            pass
+    return _pareto(_heuristic_options(comp, pool, capacity, stop)), False
+
+
+# Solving
+
+def _knapsack(groups: list[list], capacity: int, stop: float | None) -> list[str] | None:
+    """Multiple-choice knapsack: at most one option per group. None at the deadline."""
+    best = [0] * (capacity + 1)
+    picks = []
+    for options in groups:
+        if stop is not None and time.monotonic() > stop:
+            return None
+        new = best[:]
+        pick = array('I', [0]) * (capacity + 1)
+        for index, (units, value, _) in enumerate(options, 1):
+            for c in range(units, capacity + 1):
+                total = best[c - units] + value
+                if total > new[c]:
+                    new[c] = total
+                    pick[c] = index
+        best = new
+        picks.append(pick)
+
+    keys = []
+    c = capacity
+    for options, pick in zip(reversed(groups), reversed(picks)):
+        if pick[c]:
+            units, _, chosen = options[pick[c] - 1]
+            keys.extend(chosen)
+            c -= units
+    return keys
+
+
+def _greedy_plan(pool: dict[str, Item], order: list[str], capacity: int,
+                 stop: float | None) -> list[str]:
+    """Density greedy, also seeded with the best single closure; the better wins."""
+    closure = _closures(order, pool)
+    plain = [k for step in _greedy_steps(order, pool, closure, capacity, stop) for k in step]
+    seed, seed_value = None, 0
+    for keys in closure.values():
+        value = sum(pool[k].value for k in keys)
+        if value > seed_value and sum(pool[k].units for k in keys) <= capacity:
+            seed, seed_value = keys, value
+    if seed is None or seed_value <= sum(pool[k].value for k in plain):
+        return plain
+    seeded = [k for step in _greedy_steps(order, pool, closure, capacity, stop, seed)
+              for k in step]
+    if sum(pool[k].value for k in seeded) > sum(pool[k].value for k in plain):
+        return seeded
+    return plain
+
+
+def solve(items: list[Item], capacity: int, done=(), deadline: float | None = DEFAULT_DEADLINE,
+          cell_limit: int = EXACT_CELL_LIMIT) -> Plan:
+    """Highest-value dependency-closed set of items within capacity units.
+
+    done: keys already finished (or planned), whose dependents are free to
+    go. deadline: seconds before falling back to / stopping the greedy.
+    """
+    stop = time.monotonic() + deadline if deadline else None
+    pool, order, excluded = _schedulable({item.key: item for item in items}, frozenset(done))
+    exact = True
+    groups = []
+    for comp in _components(pool, order):
+        options, complete = _group_options(comp, pool, capacity, stop)
+        exact = exact and complete
+        if options:
+            groups.append(options)
+
+    keys = None
+    if (capacity + 1) * sum(map(len, groups)) <= cell_limit:
+        keys = _knapsack(groups, capacity, stop)
+    if keys is None:
+        exact = False
+        keys = _greedy_plan(pool, order, capacity, stop)
+
+    chosen = set(keys)
+    keys = [k for k in order if k in chosen]
+    return Plan(keys, sum(pool[k].value for k in keys), sum(pool[k].units for k in keys),
+                exact, excluded)
+
+
+def plan_buckets(items: list[Item], capacity: int, must_fraction: float = 0.6,
+                 stretch_fraction: float = 0.25, done=(),
+                 deadline: float | None = DEFAULT_DEADLINE) -> dict[str, Plan]:
+    """The best plan ('plan') and its must / should / stretch split.
+
+    The best plan for the full capacity is solved first, so the sprint
+    total is optimal; must is then the best dependency-closed part of it
+    within must_fraction of the capacity, should the rest of it, and
+    stretch the best extra work for stretch_fraction more capacity.
+    """
+    share = deadline / 2 if deadline else None
+    plan = solve(items, capacity, done, share)
+    by_key = {item.key: item for item in items}
+    planned = [by_key[k] for k in plan.keys]
+    quarter = deadline / 4 if deadline else None
+    must = solve(planned, int(capacity * must_fraction), done, quarter)
+    must_keys = set(must.keys)
+    should_keys = [k for k in plan.keys if k not in must_keys]
+    should = Plan(should_keys, plan.value - must.value, plan.units - must.units, plan.exact)
+    planned_keys = set(plan.keys)
+    rest = [item for item in items if item.key not in planned_keys]
+    stretch = solve(rest, int(capacity * stretch_fraction), set(done) | planned_keys, quarter)
+    return {'plan': plan, 'must': must, 'should': should, 'stretch': stretch}
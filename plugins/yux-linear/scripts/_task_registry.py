@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+"""
+Task registry shared by every worktree of a repo.
+
+The registry lives in the main repo's `.claude/` directory, so parallel
+worktree sessions all write to it. Every write goes through a transaction
+that holds an exclusive `fcntl` lock on `.claude/linear-tasks.lock`,
+re-reads the current state and replaces the store atomically, so two
+sessions bumping `last_active_at` at the same time no longer lose updates.
+
+Backends (selected by `"registry": {"backend": ...}` in linear-config.json):
+- json (default): `.claude/linear-tasks.json`, the format described by
+  references/linear-tasks-schema.json. Parses are cached by (mtime, size)
+  together with a branch index, so lookups by issue id or branch are O(1)
+  once loaded and the hook daemon keeps the parse warm. Reads return
+  copies, so a caller annotating its tasks cannot change the cached parse.
+- sqlite: `.claude/linear-tasks.db`, one row per task with an index on
+  branch. Single-field updates touch one row instead of rewriting the file.
+  An existing linear-tasks.json is imported the first time it is opened;
+  `export()` returns the same document the json backend stores.
+
+Hooks and skills should go through open_registry() (or the linear_tasks.py
+CLI) instead of reading or writing linear-tasks.json directly.
+"""
+
+import abc
+import os
+
+SCHEMA_VERSION = 1
+STATUSES = ('in_progress', 'pr_created', 'merged')
+TASK_FIELDS = ('issue_id', 'issue_uuid', 'title', 'branch', 'status',
+               'linear_status', 'pr_number', 'started_at', 'last_active_at')
+
+TASKS_FILE = 'linear-tasks.json'
+DB_FILE = 'linear-tasks.db'
+LOCK_FILE = 'linear-tasks.lock'
+
+# Parsed linear-tasks.json keyed by path, invalidated by (mtime, size):
+# (stamp, document, branch -> issue_id index)
+_JSON_CACHE: dict[str, tuple[tuple[int, int], dict | None, dict[str, str]]] = {}
+
+
+class RegistryError(Exception):
+    """Raised for invalid registry operations (unknown task, bad field)."""
+
+
+def empty_document() -> dict:
+    return {'version': SCHEMA_VERSION, 'active_task': None, 'tasks': {}}
+
+
+def now_iso() -> str:
+    """Current UTC time in the format used for started_at/last_active_at."""
+    from datetime import datetime, timezone
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def most_recent_task(tasks: dict) -> str | None:
+    """Issue id of the most recently active task, or None."""
+    if not tasks:
+        return None
+    return max(tasks, key=lambda tid: tasks[tid].get('last_active_at') or '')
+
+
+def _check_fields(fields: dict) -> None:
+    for name in fields:
+        if name not in TASK_FIELDS:
+            raise RegistryError(f"unknown task field: {name}")
+    status = fields.get('status')
+    if status is not None and status not in STATUSES:
+        raise RegistryError(f"invalid status: {status}")
+
+
+def _copy_value(value):
+    """A parsed JSON value the caller may edit without touching _JSON_CACHE."""
+    if isinstance(value, (dict, list)):
+        import copy
+        return copy.deepcopy(value)
+    return value
+
+
+_CONTAINERS = frozenset((dict, list))
+
+
+def _copy_task(task):
+    """Copy of a cached task. Task fields are scalars (see TASK_FIELDS), so
+    this is a flat dict copy unless the file nests something."""
+    if not isinstance(task, dict):
+        return _copy_value(task)
+    copied = dict(task)
+    if _CONTAINERS.isdisjoint(map(type, copied.values())):
+        return copied
+    return {name: _copy_value(value) for name, value in copied.items()}
+
+
+def _stamp(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class _Lock:
+    """Exclusive advisory lock on the registry lock file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd = None
+
+    def __enter__(self):
+        import fcntl
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        import fcntl
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        os.close(self.fd)
+        self.fd = None
+
+
+class TaskRegistry(abc.ABC):
+    """Common read/update API; backends implement export(), storage_paths()
+    and the locked writes (_put, _update, _remove, _set_active)."""
+
+    backend = ''
+
+    def __init__(self, claude_dir: str):
+        self.claude_dir = claude_dir
+        self.lock_path = os.path.join(claude_dir, LOCK_FILE)
+
+    # Reads
+
+    @abc.abstractmethod
+    def export(self) -> dict:
+        """The whole registry as a linear-tasks.json document."""
+
+    def get(self, issue_id: str) -> dict | None:
+        return self.export()['tasks'].get(issue_id)
+
+    def find_by_branch(self, branch: str) -> dict | None:
+        doc = self.export()
+        for task in doc['tasks'].values():
+            if task.get('branch') == branch:
+                return task
+        return None
+
+    def tasks(self) -> dict:
+        return self.export()['tasks']
+
+    def active_task(self) -> str | None:
+        return self.export().get('active_task')
+
+    def has_tasks(self) -> bool:
+        return bool(self.tasks())
+
+    @abc.abstractmethod
+    def storage_paths(self) -> list[str]:
+        """Files whose (mtime, size) change whenever the registry does."""
+
+    # Writes
+
+    def add(self, task: dict, activate: bool = True) -> dict:
+        """Register a task (replacing one with the same issue id)."""
+        issue_id = task.get('issue_id')
+        if not issue_id:
+            raise RegistryError("task needs an issue_id")
+        _check_fields(task)
+        entry = dict(task)
+        stamp = now_iso()
+        entry.setdefault('status', 'in_progress')
+        entry.setdefault('pr_number', None)
+        entry.setdefault('started_at', stamp)
+        entry.setdefault('last_active_at', stamp)
+        self._put(entry, activate)
+        return entry
+
+    def update(self, issue_id: str, touch: bool = True, **fields) -> dict:
+        """Set some fields of one task; bumps last_active_at unless touch=False."""
+        _check_fields(fields)
+        if 'issue_id' in fields and fields['issue_id'] != issue_id:
+            raise RegistryError("issue_id cannot be changed")
+        if touch and 'last_active_at' not in fields:
+            fields['last_active_at'] = now_iso()
+        return self._update(issue_id, fields)
+
+    def touch(self, issue_id: str) -> dict:
+        return self.update(issue_id)
+
+    def remove(self, issue_id: str) -> str | None:
+        """Drop a task; returns the new active task (most recently active)."""
+        return self._remove(issue_id)
+
+    def set_active(self, issue_id: str | None) -> None:
+        self._set_active(issue_id)
+
+    # Backend writes, each one locked transaction
+
+    @abc.abstractmethod
+    def _put(self, entry: dict, activate: bool) -> None:
+        """Store a task, replacing one with the same issue id."""
+
+    @abc.abstractmethod
+    def _update(self, issue_id: str, fields: dict) -> dict:
+        """Merge fields into a task; returns the updated task."""
+
+    @abc.abstractmethod
+    def _remove(self, issue_id: str) -> str | None:
+        """Drop a task; returns the new active task."""
+
+    @abc.abstractmethod
+    def _set_active(self, issue_id: str | None) -> None:
+        """Set (or clear) the active task."""
+
+
+class JsonRegistry(TaskRegistry):
+    """linear-tasks.json, rewritten atomically under the registry lock."""
+
+    backend = 'json'
+
+    def __init__(self, claude_dir: str):
+        super().__init__(claude_dir)
+        self.path = os.path.join(claude_dir, TASKS_FILE)
+
+    def storage_paths(self) -> list[str]:
+        return [self.path]
+
+    def _snapshot(self) -> tuple[dict, dict[str, str]]:
+        """Cached (document, branch index) for the file as it is now. Both
+        are shared with _JSON_CACHE: the public reads return copies."""
+        stamp = _stamp(self.path)
+        if stamp is None:
+            return empty_document(), {}
+        cached = _JSON_CACHE.get(self.path)
+        if cached and cached[0] == stamp:
+            return cached[1] or empty_document(), cached[2]
+
+        import json
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            data = None
+        if not isinstance(data, dict):
+            data = None
+        tasks = data.get('tasks') if data else None
+        index = {}
+        if isinstance(tasks, dict):
+            index = {t['branch']: tid for tid, t in tasks.items()
+                     if isinstance(t, dict) and t.get('branch')}
+        _JSON_CACHE[self.path] = (stamp, data, index)
+        return data or empty_document(), index
+
+    def raw(self) -> dict | None:
+        """The parsed file as-is, None if missing or not a JSON object."""
+        stamp = _stamp(self.path)
+        if stamp is None:
+            return None
+        self._snapshot()
+        return _copy_value(_JSON_CACHE[self.path][1])
+
+    def _cached_tasks(self) -> dict:
+        tasks = self._snapshot()[0].get('tasks')
+        return tasks if isinstance(tasks, dict) else {}
+
+    def export(self) -> dict:
+        doc = self._snapshot()[0]
+        copied = {key: _copy_value(value) for key, value in doc.items() if key != 'tasks'}
+        copied['tasks'] = self.tasks()
+        return copied
+
+    def tasks(self) -> dict:
+        return {tid: _copy_task(task) for tid, task in self._cached_tasks().items()}
+
+    def get(self, issue_id: str) -> dict | None:
+        task = self._cached_tasks().get(issue_id)
+        return None if task is None else _copy_task(task)
+
+    def find_by_branch(self, branch: str) -> dict | None:
+        issue_id = self._snapshot()[1].get(branch)
+        return self.get(issue_id) if issue_id else None
+
+    def active_task(self) -> str | None:
+        return self._snapshot()[0].get('active_task')
+
+    def has_tasks(self) -> bool:
+        return bool(self._cached_tasks())
+
+    def _transaction(self, mutate) -> object:
+        """Lock, re-read, apply mutate(doc) and replace the file atomically."""
+        import json
+        with _Lock(self.lock_path):
+            _JSON_CACHE.pop(self.path, None)
+            doc = self.export()
+            doc = {'version': doc.get('version', SCHEMA_VERSION),
+                   'active_task': doc.get('active_task'),
+                   'tasks': doc['tasks']}
+            result = mutate(doc)
+            tmp = f'{self.path}.{os.getpid()}.tmp'
+            try:
+                with open(tmp, 'w') as f:
+                    json.dump(doc, f, indent=2, ensure_ascii=False)
+                    f.write('\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+        return result
+
+    def replace_document(self, doc: dict) -> None:
+        """Overwrite the registry with a full document (used by import)."""
+        def mutate(current):
+            current.clear()
+            current.update(doc)
+        self._transaction(mutate)
+
+    def _put(self, entry: dict, activate: bool) -> None:
+        def mutate(doc):
+            doc['tasks'][entry['issue_id']] = entry
+            if activate:
+                doc['active_task'] = entry['issue_id']
+        self._transaction(mutate)
+
+    def _update(self, issue_id: str, fields: dict) -> dict:
+        def mutate(doc):
+            task = doc['tasks'].get(issue_id)
+            if task is None:
+                raise RegistryError(f"unknown task: {issue_id}")
+            task.update(fields)
+            return task
+        return self._transaction(mutate)
+
+    def _remove(self, issue_id: str) -> str | None:
+        def mutate(doc):
+            if doc['tasks'].pop(issue_id, None) is None:
+                raise RegistryError(f"unknown task: {issue_id}")
+            if doc['active_task'] == issue_id or doc['active_task'] not in doc['tasks']:
+                doc['active_task'] = most_recent_task(doc['tasks'])
+            return doc['active_task']
+        return self._transaction(mutate)
+
+    def _set_active(self, issue_id: str | None) -> None:
+        def mutate(doc):
+            if issue_id is not None and issue_id not in doc['tasks']:
+                raise RegistryError(f"unknown task: {issue_id}")
+            doc['active_task'] = issue_id
+        self._transaction(mutate)
+
+
+class SqliteRegistry(TaskRegistry):
+    """linear-tasks.db: one row per task, indexed by branch."""
+
+    backend = 'sqlite'
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            issue_id TEXT PRIMARY KEY,
+            branch TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS tasks_branch ON tasks(branch);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, claude_dir: str):
+        super().__init__(claude_dir)
+        self.path = os.path.join(claude_dir, DB_FILE)
+        self._conn = None
+
+    def storage_paths(self) -> list[str]:
+        return [self.path, self.path + '-wal']
+
+    def _connect(self):
+        if self._conn is not None:
+            return self._conn
+        import sqlite3
+        os.makedirs(self.claude_dir, exist_ok=True)
+        # The lock makes creation plus the one-time JSON import atomic
+        with _Lock(self.lock_path):
+            fresh = not os.path.exists(self.path)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(self.SCHEMA)
+            if fresh:
+                legacy = JsonRegistry(self.claude_dir).raw()
+                if legacy:
+                    self._import(conn, legacy)
+        self._conn = conn
+        return conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _import(conn, doc: dict) -> None:
+        import json
+        tasks = doc.get('tasks') if isinstance(doc.get('tasks'), dict) else {}
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute('DELETE FROM tasks')
+        conn.executemany(
+            'INSERT INTO tasks (issue_id, branch, data) VALUES (?, ?, ?)',
+            [(tid, t.get('branch'), json.dumps(t, ensure_ascii=False))
+             for tid, t in tasks.items() if isinstance(t, dict)])
+        conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)',
+                     ('active_task', doc.get('active_task')))
+        conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)',
+                     ('version', str(doc.get('version', SCHEMA_VERSION))))
+        conn.execute('COMMIT')
+
+    def replace_document(self, doc: dict) -> None:
+        self._import(self._connect(), doc)
+
+    def _row(self, where: str, value: str) -> dict | None:
+        import json
+        row = self._connect().execute(
+            f'SELECT data FROM tasks WHERE {where} = ? LIMIT 1', (value,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get(self, issue_id: str) -> dict | None:
+        return self._row('issue_id', issue_id)
+
+    def find_by_branch(self, branch: str) -> dict | None:
+        return self._row('branch', branch)
+
+    def active_task(self) -> str | None:
+        row = self._connect().execute(
+            "SELECT value FROM meta WHERE key = 'active_task'").fetchone()
+        return row[0] if row else None
+
+    def has_tasks(self) -> bool:
+        return self._connect().execute('SELECT 1 FROM tasks LIMIT 1').fetchone() is not None
+
+    def tasks(self) -> dict:
+        import json
+        rows = self._connect().execute('SELECT issue_id, data FROM tasks ORDER BY issue_id')
+        return {tid: json.loads(data) for tid, data in rows}
+
+    def export(self) -> dict:
+        row = self._connect().execute(
+            "SELECT value FROM meta WHERE key = 'version'").fetchone()
+        version = int(row[0]) if row and row[0] else SCHEMA_VERSION
+        return {'version': version, 'active_task': self.active_task(), 'tasks': self.tasks()}
+
+    def _write(self, fn):
+        """Run fn(conn) inside an immediate transaction."""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            result = fn(conn)
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+        return result
+
+    def _put(self, entry: dict, activate: bool) -> None:
+        import json
+
+        def fn(conn):
+            conn.execute('INSERT OR REPLACE INTO tasks (issue_id, branch, data) VALUES (?, ?, ?)',
+                         (entry['issue_id'], entry.get('branch'),
+                          json.dumps(entry, ensure_ascii=False)))
+            if activate:
+                conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)',
+                             ('active_task', entry['issue_id']))
+        self._write(fn)
+
+    def _update(self, issue_id: str, fields: dict) -> dict:
+        import json
+
+        def fn(conn):
+            row = conn.execute('SELECT data FROM tasks WHERE issue_id = ?', (issue_id,)).fetchone()
+            if row is None:
+                raise RegistryError(f"unknown task: {issue_id}")
+            task = json.loads(row[0])
+            task.update(fields)
+            conn.execute('UPDATE tasks SET branch = ?, data = ? WHERE issue_id = ?',
+                         (task.get('branch'), json.dumps(task, ensure_ascii=False), issue_id))
+            return task
+        return self._write(fn)
+
+    def _remove(self, issue_id: str) -> str | None:
+        def fn(conn):
+            if conn.execute('DELETE FROM tasks WHERE issue_id = ?', (issue_id,)).rowcount == 0:
+                raise RegistryError(f"unknown task: {issue_id}")
+            row = conn.execute("SELECT value FROM meta WHERE key = 'active_task'").fetchone()
+            active = row[0] if row else None
+            exists = active and conn.execute(
+                'SELECT 1 FROM tasks WHERE issue_id = ?', (active,)).fetchone()
+            if not exists:
+                row = conn.execute(
+                    "SELECT issue_id FROM tasks "
+                    "ORDER BY json_extract(data, '$.last_active_at') DESC LIMIT 1").fetchone()
+                active = row[0] if row else None
+                conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', ('active_task', active))
+            return active
+        return self._write(fn)
+
+    def _set_active(self, issue_id: str | None) -> None:
+        def fn(conn):
+            if issue_id is not None and not conn.execute(
+                    'SELECT 1 FROM tasks WHERE issue_id = ?', (issue_id,)).fetchone():
+                raise RegistryError(f"unknown task: {issue_id}")
+            conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', ('active_task', issue_id))
+        self._write(fn)
+
+
+BACKENDS = {'json': JsonRegistry, 'sqlite': SqliteRegistry}
+
+
+def configured_backend(claude_dir: str) -> str:
+    """Backend named in linear-config.json, 'json' if unset or unknown."""
+    config_file = os.path.join(claude_dir, 'linear-config.json')
+    if not os.path.isfile(config_file):
+        return 'json'
+    import json
+    try:
+        with open(config_file) as f:
+            config = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return 'json'
+    registry = config.get('registry') if isinstance(config, dict) else None
+    backend = registry.get('backend') if isinstance(registry, dict) else None
+    return backend if backend in BACKENDS else 'json'
+
+
+def open_registry(repo_root: str | None = None, backend: str | None = None) -> TaskRegistry:
+    """Open the registry of the main repo (worktree-aware when repo_root is None)."""
+    if repo_root is None:
+        from _git_state import get_main_repo_root
+        repo_root = get_main_repo_root() or os.getcwd()
+    claude_dir = os.path.join(repo_root, '.claude')
+    return BACKENDS[backend or configured_backend(claude_dir)](claude_dir)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Opt-in timing spans for the Linear hooks.
+
+Tracing is on when YUX_LINEAR_TRACE=1, or when linear-config.json has
+`"trace": true` (YUX_LINEAR_TRACE=0 forces it off). Each hook process,
+and each event the hook daemon serves, then appends one JSON line to
+.claude/linear-hook-trace.jsonl:
+
+  {"ts": 1760000000.123, "event": "PreToolUse", "pid": 123, "daemon": false,
+   "code": 0, "total_ms": 41.2, "forks": 1,
+   "spans": [{"name": "startup", "at_ms": -22.0, "ms": 22.0, "forks": 0}, ...]}
+
+Spans cover interpreter startup (process age when tracing starts: Python
+start, imports and the repo lookup), stdin parsing, the Linear guard, each
+check, each subprocess (see _proc.py) and writing the output; `at_ms` is
+relative to the start of tracing. The file is a ring buffer: past
+`trace_max_kb` (linear-config.json, default 512) its oldest half is
+dropped. scripts/linear_hook_stats.py aggregates it.
+
+Off, every call here is a global lookup and a return; only os and time
+(already loaded by the interpreter) are imported up front.
+"""
+
+import os
+import time
+
+ENV_VAR = 'YUX_LINEAR_TRACE'
+TRACE_FILE = 'linear-hook-trace.jsonl'
+DEFAULT_MAX_KB = 512
+
+_record = None
+_forks = 0
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+class _Span:
+    __slots__ = ('name', 'start', 'forks')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.forks = _forks
+        return self
+
+    def __exit__(self, *exc):
+        if _record is not None:
+            end = time.perf_counter()
+            _record['spans'].append({
+                "name": self.name,
+                "at_ms": _ms(self.start - _record['t0']),
+                "ms": _ms(end - self.start),
+                "forks": _forks - self.forks,
+            })
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str):
+    """Context manager timing one span (a shared no-op when tracing is off)."""
+    return _Span(name) if _record is not None else _NO_SPAN
+
+
+def active() -> bool:
+    return _record is not None
+
+
+def count_fork() -> None:
+    """Note one child process; called by _proc for every spawn."""
+    global _forks
+    _forks += 1
+
+
+def _read_config(repo_root: str) -> tuple[bool, int]:
+    """(trace flag, size cap in KiB) from linear-config.json."""
+    try:
+        with open(os.path.join(repo_root, '.claude', 'linear-config.json'), 'rb') as f:
+            data = f.read()
+    except OSError:
+        return False, DEFAULT_MAX_KB
+    # Most configs have no trace keys: skip the JSON parse for them
+    if b'"trace' not in data:
+        return False, DEFAULT_MAX_KB
+    import json
+    try:
+        config = json.loads(data)
+    except ValueError:
+        return False, DEFAULT_MAX_KB
+    if not isinstance(config, dict):
+        return False, DEFAULT_MAX_KB
+    max_kb = config.get('trace_max_kb')
+    if not isinstance(max_kb, int) or max_kb <= 0:
+        max_kb = DEFAULT_MAX_KB
+    return config.get('trace') is True, max_kb
+
+
+def process_age() -> float | None:
+    """Seconds since this process started (Linux, clock-tick resolution)."""
+    try:
+        with open('/proc/self/stat', 'rb') as f:
+            stat = f.read()
+        # Fields after the parenthesised command name; starttime is field 22
+        started = int(stat.rpartition(b')')[2].split()[19]) / os.sysconf('SC_CLK_TCK')
+        return max(0.0, time.clock_gettime(time.CLOCK_BOOTTIME) - started)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def start(event: str, repo_root: str | None, daemon: bool = False) -> bool:
+    """Begin tracing one event if tracing is enabled for repo_root."""
+    global _record
+    _record = None
+    flag = os.environ.get(ENV_VAR)
+    if flag == '0' or not repo_root or not os.path.isdir(os.path.join(repo_root, '.claude')):
+        return False
+    enabled, max_kb = _read_config(repo_root)
+    if flag != '1' and not enabled:
+        return False
+
+    _record = {'t0': time.perf_counter(), 'forks0': _forks, 'root': repo_root,
+               'max_kb': max_kb, 'event': event, 'daemon': daemon, 'spans': []}
+    age = None if daemon else process_age()
+    if age is not None:
+        _record['spans'].append({"name": "startup", "at_ms": -_ms(age), "ms": _ms(age),
+                                 "forks": 0})
+    return True
+
+
+def finish(code: int) -> None:
+    """Append the finished record to the trace file; never raises."""
+    global _record
+    record, _record = _record, None
+    if record is None:
+        return
+    elapsed = time.perf_counter() - record['t0']
+    startup = sum(s['ms'] for s in record['spans'] if s['name'] == 'startup')
+    line = {
+        "ts": round(time.time(), 3),
+        "event": record['event'],
+        "pid": os.getpid(),
+        "daemon": record['daemon'],
+        "code": code,
+        "total_ms": round(_ms(elapsed) + startup, 3),
+        "forks": _forks - record['forks0'],
+        "spans": record['spans'],
+    }
+    try:
+        import json
+        append(os.path.join(record['root'], '.claude', TRACE_FILE),
+               json.dumps(line) + '\n', record['max_kb'] * 1024)
+    except (OSError, ValueError):
+        pass
+
+
+def append(path: str, line: str, max_bytes: int) -> None:
+    """Append one line; past max_bytes keep only the newest half of the file."""
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line.encode('utf-8'))
+        size = os.fstat(fd).st_size
+    finally:
+        os.close(fd)
+    if size <= max_bytes:
+        return
+    # Best effort: a line appended by a concurrent hook during the rewrite is lost
+    with open(path, 'rb') as f:
+        f.seek(max(0, size - max_bytes // 2))
+        tail = f.read()
+    tail = tail[tail.find(b'\n') + 1:]
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(tail)
+    os.replace(tmp, path)
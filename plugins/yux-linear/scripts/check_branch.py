@@ -10,67 +10,45 @@ Exit codes:
   2 - Block operation (reserved for future strict mode)
 """
 
-import json
 import os
-import re
-import subprocess
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from _linear_guard import is_linear_project
+from _hook_context import HookContext
+from _linear_guard import linear_id_re
 
 PROTECTED_BRANCHES = ['main', 'master', 'develop', 'release']
 
 
-def get_current_branch() -> str | None:
-    """Get the current git branch name."""
-    try:
-        result = subprocess.run(
-            ['git', 'branch', '--show-current'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
-    return None
-
-
 def is_linear_branch(branch: str) -> bool:
     """Check if branch follows Linear naming convention (contains LIN-xxx)."""
-    return bool(re.search(r'LIN-\d+', branch, re.IGNORECASE))
+    return bool(linear_id_re().search(branch))
 
 
 def extract_linear_id(branch: str) -> str | None:
     """Extract Linear issue ID from branch name."""
-    match = re.search(r'(LIN-\d+)', branch, re.IGNORECASE)
-    return match.group(1).upper() if match else None
-
+    match = linear_id_re().search(branch)
+    return match.group(0).upper() if match else None
 
-def main():
-    # Read input from stdin
-    try:
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError:
-        sys.exit(0)
 
+def check(ctx: HookContext) -> int:
+    """Warn on Write/Edit while on a protected branch."""
     # Skip if not a Linear-active project
-    if not is_linear_project():
-        sys.exit(0)
+    if not ctx.linear_active:
+        return 0
 
-    tool_name = input_data.get("tool_name", "")
+    if ctx.payload is None:
+        return 0
 
     # Only check Write and Edit operations
-    if tool_name not in ("Write", "Edit"):
-        sys.exit(0)
+    if ctx.tool_name not in ("Write", "Edit"):
+        return 0
 
     # Get current branch
-    branch = get_current_branch()
+    branch = ctx.branch
     if not branch:
         # Not in a git repo or can't determine branch
-        sys.exit(0)
+        return 0
 
     # Check if on protected branch
     if branch.lower() in [b.lower() for b in PROTECTED_BRANCHES]:
@@ -84,7 +62,11 @@ def main():
         print(warning)  # stdout - informational
         # Note: We allow the operation but Claude sees the warning
 
-    sys.exit(0)
+    return 0
+
+
+def main():
+    sys.exit(check(HookContext('PreToolUse')))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Watch CI for one or more PRs at once and print state changes as JSON lines.
+
+Replaces polling `gh pr checks` every 15 seconds per PR. Each PR is
+watched by its own asyncio task over `gh api -i`:
+
+  - every request carries If-None-Match with the last ETag, so unchanged
+    PRs cost a 304 that GitHub does not count against the rate limit;
+  - the next poll is timed from the running checks: the remaining part of
+    their usual duration (kept in .claude/ci-durations.json), otherwise a
+    quarter of their elapsed time, between MIN_INTERVAL and MAX_INTERVAL,
+    and growing while nothing changes;
+  - `gh run view --job <id> --log-failed` runs once per check that newly
+    failed, and the tail of its log goes into the check_failed event;
+  - check runs and statuses are read page by page (Link rel="next"), and
+    a list shorter than its total_count is an error, not a result.
+
+Usage:
+  ci_watch.py <PR> [<PR> ...] [--timeout 1800] [--no-logs] [--once]
+              [--repo OWNER/REPO] [--gh PATH]
+
+--once polls every PR a single time and reports its current state.
+--gh runs another executable instead of `gh` (e.g. bench/fake_gh.py).
+
+Events (one JSON object per line, all with "time", "event" and "pr"):
+  head        the PR head commit (again after a push)
+  check       a check changed status or conclusion
+  check_failed  a check newly failed; "log" holds the failed-step log tail
+  completed   every check concluded: "result" passed | failed | no_checks
+  closed      the PR was merged or closed while watching
+  pending     (--once) checks still running
+  timeout     the PR still had pending checks at --timeout
+  rate_limited  GitHub asked to wait "wait" seconds
+  error       gh failed repeatedly or the PR is unknown; "message" says why
+A final "summary" event (no "pr") counts API requests and 304 responses.
+
+Exit codes:
+  0 - Every PR passed (or has no checks, or was merged)
+  1 - A check failed or a PR was closed unmerged
+  2 - Timed out with checks still pending (with --once: still pending)
+  3 - gh failed (not installed, not authenticated, unknown PR)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from statistics import median
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _git_state import get_main_repo_root
+
+MIN_INTERVAL = 5
+BASE_INTERVAL = 15
+MAX_INTERVAL = 120
+IDLE_GROWTH = 1.5
+NO_CHECKS_GRACE = 60
+DEFAULT_TIMEOUT = 1800
+MAX_CONCURRENCY = 4
+MAX_ERRORS = 3
+GH_TIMEOUT = 60
+LOG_TAIL_LINES = 200
+
+DURATIONS_FILE = 'ci-durations.json'
+DURATION_SAMPLES = 10
+
+FAILED_CONCLUSIONS = {'failure', 'timed_out', 'cancelled', 'action_required', 'startup_failure'}
+JOB_URL_RE = re.compile(r'/actions/runs/\d+/job/(\d+)')
+NEXT_LINK_RE = re.compile(r'<([^>]+)>\s*;\s*rel="next"')
+
+RESULT_CODES = {'passed': 0, 'no_checks': 0, 'merged': 0, 'failed': 1, 'closed': 1,
+                'timeout': 2, 'error': 3}
+
+
+class GhError(Exception):
+    """gh exited with an error or returned an unusable response."""
+
+    def __init__(self, message: str, status: int | None = None, permanent: bool = False):
+        super().__init__(message)
+        # A missing gh or a 4xx (unknown PR, no access) will not fix itself
+        self.permanent = permanent or (status is not None and 400 <= status < 500)
+
+
+class RateLimited(Exception):
+    def __init__(self, wait: float):
+        super().__init__(f"rate limited for {wait:.0f}s")
+        self.wait = wait
+
+
+def parse_http(raw: bytes) -> tuple[int | None, dict, bytes]:
+    """Split `gh api -i` output into (status, lower-cased headers, body)."""
+    head, sep, body = raw.partition(b'\r\n\r\n')
+    if not sep:
+        head, sep, body = raw.partition(b'\n\n')
+    lines = head.decode('latin-1').splitlines()
+    status = None
+    if lines and lines[0].startswith('HTTP/'):
+        parts = lines[0].split()
+        if len(parts) > 1 and parts[1].isdigit():
+            status = int(parts[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return status, headers, body
+
+
+def parse_time(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class GhClient:
+    """Runs gh with ETag caching, bounded concurrency and call counters."""
+
+    def __init__(self, gh: str = 'gh', repo: str | None = None,
+                 concurrency: int = MAX_CONCURRENCY):
+        self.gh = gh
+        self.env = dict(os.environ, GH_REPO=repo) if repo else None
+        self.semaphore = asyncio.Semaphore(concurrency)
+        # path -> (ETag, body, next page URL from the Link header)
+        self.etags: dict[str, tuple[str, object, str | None]] = {}
+        self.requests = 0
+        self.not_modified = 0
+
+    async def _run(self, *args: str) -> tuple[int, bytes, bytes]:
+        async with self.semaphore:
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    self.gh, *args, stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE, env=self.env)
+            except OSError as e:
+                raise GhError(f"cannot run {self.gh}: {e}", permanent=True) from None
+            try:
+                out, err = await asyncio.wait_for(proc.communicate(), GH_TIMEOUT)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise GhError(f"{self.gh} {args[0]} timed out") from None
+            return proc.returncode, out, err
+
+    async def get(self, path: str) -> tuple[object, bool]:
+        """(JSON body, changed since the last call for this path)."""
+        data, changed, _ = await self.get_page(path)
+        return data, changed
+
+    async def get_all(self, path: str, key: str) -> tuple[dict, bool]:
+        """A paginated list endpoint with every page's `key` items merged into
+        the first page's object, following Link rel="next"; changed if any
+        page was."""
+        merged, changed = None, False
+        while path:
+            data, page_changed, next_url = await self.get_page(path)
+            if not isinstance(data, dict):
+                raise GhError(f"gh api {path}: response is not an object")
+            changed, path = changed or page_changed, next_url
+            if merged is None:
+                merged = {**data, key: list(data.get(key) or [])}
+            else:
+                merged[key].extend(data.get(key) or [])
+        return merged, changed
+
+    async def get_page(self, path: str) -> tuple[object, bool, str | None]:
+        """(JSON body, changed since the last call, URL of the next page)."""
+        cached = self.etags.get(path)
+        args = ['api', '-i']
+        if cached:
+            args += ['-H', f'If-None-Match: {cached[0]}']
+        self.requests += 1
+        code, out, err = await self._run(*args, path)
+        status, headers, body = parse_http(out)
+        if status == 304 and cached:
+            self.not_modified += 1
+            return cached[1], False, cached[2]
+        if status in (403, 429) and (headers.get('retry-after')
+                                     or headers.get('x-ratelimit-remaining') == '0'):
+            wait = headers.get('retry-after')
+            if wait and wait.isdigit():
+                raise RateLimited(float(wait))
+            reset = headers.get('x-ratelimit-reset', '')
+            raise RateLimited(max(float(reset) - time.time(), 1) if reset.isdigit() else 60)
+        if status is None or status >= 400 or code != 0:
+            message = err.decode(errors='replace').strip() or f"HTTP {status}"
+            raise GhError(f"gh api {path}: {message}", status)
+        try:
+            data = json.loads(body)
+        except json.JSONDecodeError:
+            raise GhError(f"gh api {path}: response is not JSON") from None
+        link = NEXT_LINK_RE.search(headers.get('link', ''))
+        next_url = link.group(1) if link else None
+        if headers.get('etag'):
+            self.etags[path] = (headers['etag'], data, next_url)
+        return data, True, next_url
+
+    async def failed_log(self, job_id: str) -> str | None:
+        code, out, _ = await self._run('run', 'view', '--job', job_id, '--log-failed')
+        if code != 0:
+            return None
+        lines = out.decode(errors='replace').splitlines()
+        return '\n'.join(lines[-LOG_TAIL_LINES:])
+
+
+def normalize_checks(runs, status) -> dict[str, dict]:
+    """Check runs and commit statuses keyed by name, latest run per name."""
+    checks: dict[str, dict] = {}
+    for run in sorted((runs or {}).get('check_runs') or [], key=lambda r: r.get('id') or 0):
+        match = JOB_URL_RE.search(run.get('details_url') or '')
+        checks[run.get('name') or str(run.get('id'))] = {
+            'status': run.get('status') or 'queued',
+            'conclusion': run.get('conclusion'),
+            'started': run.get('started_at'),
+            'completed': run.get('completed_at'),
+            'job': match.group(1) if match else None,
+            'url': run.get('details_url'),
+        }
+    for item in (status or {}).get('statuses') or []:
+        state = item.get('state') or 'pending'
+        checks[item.get('context') or '?'] = {
+            'status': 'in_progress' if state == 'pending' else 'completed',
+            'conclusion': None if state == 'pending' else
+            ('failure' if state in ('failure', 'error') else state),
+            'started': item.get('created_at'),
+            'completed': None if state == 'pending' else item.get('updated_at'),
+            'job': None,
+            'url': item.get('target_url'),
+        }
+    return checks
+
+
+class Durations:
+    """Recent durations per check name, in .claude/ci-durations.json."""
+
+    def __init__(self, path: str | None):
+        self.path = path
+        self.samples: dict[str, list[float]] = {}
+        if path:
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self.samples = {k: v for k, v in data.items() if isinstance(v, list)}
+            except (OSError, json.JSONDecodeError):
+                pass
+        self.dirty = False
+
+    def expected(self, name: str) -> float | None:
+        samples = self.samples.get(name)
+        return median(samples) if samples else None
+
+    def record(self, name: str, check: dict) -> None:
+        start, end = parse_time(check['started']), parse_time(check['completed'])
+        if start is None or end is None or end < start:
+            return
+        samples = self.samples.setdefault(name, [])
+        samples.append(round(end - start, 1))
+        del samples[:-DURATION_SAMPLES]
+        self.dirty = True
+
+    def save(self) -> None:
+        if not self.path or not self.dirty:
+            return
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(self.samples, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+
+def next_delay(pending: dict[str, dict], durations: Durations, previous: float,
+               changed: bool) -> float:
+    """Seconds until the next poll of a PR with these pending checks."""
+    now = time.time()
+    waits = []
+    for name, check in pending.items():
+        started = parse_time(check['started'])
+        elapsed = now - started if started else 0
+        expected = durations.expected(name)
+        if expected is not None:
+            waits.append(expected - elapsed)
+        else:
+            waits.append(max(BASE_INTERVAL, elapsed / 4))
+    delay = min(waits) if waits else BASE_INTERVAL
+    if not changed:
+        delay = max(delay, previous * IDLE_GROWTH)
+    return min(max(delay, MIN_INTERVAL), MAX_INTERVAL)
+
+
+class Watcher:
+    def __init__(self, client: GhClient, durations: Durations, timeout: float,
+                 fetch_logs: bool = True, once: bool = False):
+        self.client = client
+        self.durations = durations
+        self.deadline = time.monotonic() + timeout
+        self.fetch_logs = fetch_logs
+        self.once = once
+
+    def emit(self, event: str, pr: int, **fields) -> None:
+        print(json.dumps({"time": now_iso(), "event": event, "pr": pr, **fields},
+                         ensure_ascii=False), flush=True)
+
+    async def poll(self, pr: int, state: dict) -> str | None:
+        """One round for a PR; returns its result once it has one."""
+        client = self.client
+        pull, changed = await client.get(f'repos/{{owner}}/{{repo}}/pulls/{pr}')
+        if pull.get('state') != 'open':
+            merged = bool(pull.get('merged') or pull.get('merged_at'))
+            self.emit('closed', pr, merged=merged)
+            return 'merged' if merged else 'closed'
+        sha = (pull.get('head') or {}).get('sha')
+        if sha != state.get('sha'):
+            state.update(sha=sha, checks={}, first_seen=time.monotonic())
+            self.emit('head', pr, sha=sha, branch=(pull.get('head') or {}).get('ref'))
+
+        # Both lists are paged (100 at most per page); a commit with more
+        # checks must not look finished from its first page
+        runs, runs_changed = await client.get_all(
+            f'repos/{{owner}}/{{repo}}/commits/{sha}/check-runs?per_page=100', 'check_runs')
+        status, status_changed = await client.get_all(
+            f'repos/{{owner}}/{{repo}}/commits/{sha}/status?per_page=100', 'statuses')
+        for body, key in ((runs, 'check_runs'), (status, 'statuses')):
+            total = body.get('total_count')
+            if isinstance(total, int) and total > len(body[key]):
+                raise GhError(f"commit {sha}: got {len(body[key])} of {total} {key}")
+        state['changed'] = changed or runs_changed or status_changed
+        checks = normalize_checks(runs, status)
+        for name, check in checks.items():
+            old = state['checks'].get(name)
+            if old and (old['status'], old['conclusion']) == (check['status'], check['conclusion']):
+                continue
+            self.emit('check', pr, name=name, status=check['status'],
+                      conclusion=check['conclusion'], url=check['url'])
+            if check['status'] == 'completed':
+                self.durations.record(name, check)
+                if check['conclusion'] in FAILED_CONCLUSIONS:
+                    log = None
+                    if self.fetch_logs and check['job']:
+                        log = await client.failed_log(check['job'])
+                    self.emit('check_failed', pr, name=name, conclusion=check['conclusion'],
+                              url=check['url'], log=log)
+        state['checks'] = checks
+
+        pending = {n: c for n, c in checks.items() if c['status'] != 'completed'}
+        if checks and not pending:
+            failed = sorted(n for n, c in checks.items() if c['conclusion'] in FAILED_CONCLUSIONS)
+            result = 'failed' if failed else 'passed'
+            self.emit('completed', pr, result=result, failed=failed, checks=len(checks))
+            return result
+        if not checks and time.monotonic() - state['first_seen'] > NO_CHECKS_GRACE:
+            self.emit('completed', pr, result='no_checks', failed=[], checks=0)
+            return 'no_checks'
+        state['pending'] = pending
+        return None
+
+    async def watch(self, pr: int) -> str:
+        state: dict = {'interval': BASE_INTERVAL}
+        errors = 0
+        while True:
+            try:
+                result = await self.poll(pr, state)
+                errors = 0
+            except RateLimited as e:
+                result, delay = None, e.wait
+                self.emit('rate_limited', pr, wait=round(delay))
+            except GhError as e:
+                errors += 1
+                if errors >= MAX_ERRORS or self.once or e.permanent:
+                    self.emit('error', pr, message=str(e))
+                    return 'error'
+                result, delay = None, BASE_INTERVAL * errors
+            else:
+                if result is None:
+                    delay = next_delay(state.get('pending', {}), self.durations,
+                                       state['interval'], state.get('changed', True))
+            if result is not None:
+                return result
+            if self.once:
+                self.emit('pending', pr, pending=sorted(state.get('pending', {})))
+                return 'timeout'
+            if time.monotonic() + delay > self.deadline:
+                self.emit('timeout', pr, pending=sorted(state.get('pending', {})))
+                return 'timeout'
+            state['interval'] = delay
+            await asyncio.sleep(delay)
+
+
+async def watch_all(prs: list[int], watcher: Watcher) -> list[str]:
+    return await asyncio.gather(*(watcher.watch(pr) for pr in prs))
+
+
+def durations_path() -> str | None:
+    root = get_main_repo_root()
+    if not root or not os.path.isdir(os.path.join(root, '.claude')):
+        return None
+    return os.path.join(root, '.claude', DURATIONS_FILE)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Watch CI checks of PRs")
+    parser.add_argument('prs', nargs='+', type=int, metavar='PR')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f"seconds to wait for checks (default {DEFAULT_TIMEOUT})")
+    parser.add_argument('--no-logs', action='store_true', help="do not fetch failed-step logs")
+    parser.add_argument('--once', action='store_true', help="poll once and report")
+    parser.add_argument('--repo', help="OWNER/REPO (default: the current repository)")
+    parser.add_argument('--gh', default=os.environ.get('YUX_LINEAR_GH', 'gh'),
+                        help="gh executable to run")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+
+    async def run() -> list[str]:
+        client = GhClient(args.gh, args.repo)
+        durations = Durations(durations_path())
+        watcher = Watcher(client, durations, args.timeout, not args.no_logs, args.once)
+        try:
+            return await watch_all(list(dict.fromkeys(args.prs)), watcher)
+        finally:
+            durations.save()
+            print(json.dumps({"time": now_iso(), "event": "summary",
+                              "requests": client.requests,
+                              "not_modified": client.not_modified}), flush=True)
+
+    try:
+        results = asyncio.run(run())
+    except KeyboardInterrupt:
+        sys.exit(2)
+    sys.exit(max(RESULT_CODES.get(result, 3) for result in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Collect the state of every registered task in one pass, for
+/yux-linear-status tasks mode.
+
+Per task: its worktree, commits ahead of the base branch, uncommitted
+changes, upstream tracking, PR and CI status. Instead of several git and
+gh calls per worktree, run one after another:
+- worktrees come from a single `git worktree list --porcelain`
+- ahead counts for all task branches come from one batched git call
+  (`for-each-ref %(ahead-behind:BASE)` on git >= 2.41, else one
+  `rev-list --parents` walk of everything not on the base)
+- the open PRs of the repo come from a single `gh pr list`
+- dirty checks, and PR lookups for tasks whose PR is no longer open, run
+  on a bounded thread pool
+
+The base is resolved like sync_progress.py (linear-config.json
+`base_branch`, else main/master/develop).
+
+Usage:
+  collect_tasks.py [--root DIR] [--jobs N] [--no-gh] [--gh PATH]
+
+Prints a single JSON document: {"base", "active_task", "tasks": [...],
+"other_worktrees": [...], "errors": [...], "elapsed_ms"}.
+
+Exit codes:
+  0 - Success (gh failures are reported in "errors", not fatal)
+  1 - Not inside a git repository
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _git_state import find_git_dir, get_main_repo_root
+from _task_registry import RegistryError, open_registry
+from sync_progress import resolve_base_branch
+
+MAX_JOBS = 8
+GIT_TIMEOUT = 10
+GH_TIMEOUT = 30
+PR_LIST_LIMIT = 200
+PR_FIELDS = 'number,headRefName,state,url,isDraft,reviewDecision,statusCheckRollup'
+FAILED_CONCLUSIONS = {'FAILURE', 'TIMED_OUT', 'CANCELLED', 'ACTION_REQUIRED',
+                      'STARTUP_FAILURE', 'ERROR'}
+
+
+def run_cmd(cmd: list[str], cwd: str | None = None, timeout: float = GIT_TIMEOUT) -> str | None:
+    """stdout of cmd, or None when it cannot run, fails or times out."""
+    try:
+        proc = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True,
+                              errors='replace', timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return proc.stdout if proc.returncode == 0 else None
+
+
+def list_worktrees(root: str) -> list[dict]:
+    """Parse `git worktree list --porcelain` into {path, head, branch, prunable}."""
+    out = run_cmd(['git', '-C', root, 'worktree', 'list', '--porcelain'])
+    worktrees = []
+    current = None
+    for line in (out or '').splitlines():
+        if line.startswith('worktree '):
+            current = {"path": line[len('worktree '):], "head": None,
+                       "branch": None, "prunable": False}
+            worktrees.append(current)
+        elif current is None:
+            continue
+        elif line.startswith('HEAD '):
+            current["head"] = line[len('HEAD '):]
+        elif line.startswith('branch '):
+            current["branch"] = line[len('branch '):].removeprefix('refs/heads/')
+        elif line.startswith('prunable'):
+            current["prunable"] = True
+    return worktrees
+
+
+def _parse_track(track: str) -> dict:
+    """`%(upstream:track,nobracket)` ("ahead 2, behind 1", "gone") as counts."""
+    result = {"unpushed": 0, "unpulled": 0, "gone": track == 'gone'}
+    for part in track.split(','):
+        word, _, num = part.strip().partition(' ')
+        if word == 'ahead' and num.isdigit():
+            result["unpushed"] = int(num)
+        elif word == 'behind' and num.isdigit():
+            result["unpulled"] = int(num)
+    return result
+
+
+def branch_refs(root: str, branches: list[str], base_sha: str | None) -> dict:
+    """Tip, upstream and (when git can) ahead count of each existing branch,
+    from one `git for-each-ref`."""
+    if not branches:
+        return {}
+    fields = ['%(refname:short)', '%(objectname)', '%(upstream:short)',
+              '%(upstream:track,nobracket)']
+    patterns = [f'refs/heads/{b}' for b in branches]
+    out = None
+    if base_sha:
+        out = run_cmd(['git', '-C', root, 'for-each-ref',
+                       '--format=' + '%00'.join(fields + [f'%(ahead-behind:{base_sha})'])]
+                      + patterns)
+    with_counts = out is not None
+    if out is None:
+        # git < 2.41 has no %(ahead-behind)
+        out = run_cmd(['git', '-C', root, 'for-each-ref', '--format=' + '%00'.join(fields)]
+                      + patterns)
+    refs = {}
+    for line in (out or '').splitlines():
+        parts = line.split('\0')
+        if len(parts) < 4 or parts[0] not in branches:
+            continue
+        info = {"sha": parts[1], "upstream": parts[2] or None, "ahead": None}
+        info.update(_parse_track(parts[3]) if parts[2] else
+                    {"unpushed": None, "unpulled": None, "gone": False})
+        if with_counts and len(parts) > 4 and parts[4].split(' ')[0].isdigit():
+            info["ahead"] = int(parts[4].split(' ')[0])
+        refs[parts[0]] = info
+    return refs
+
+
+def count_ahead(root: str, tips: dict[str, str], base_sha: str) -> dict[str, int]:
+    """Commits ahead of base_sha for every branch tip, from one
+    `git rev-list --parents <tips> ^base` walk of the commits not on base."""
+    if not tips:
+        return {}
+    out = run_cmd(['git', '-C', root, 'rev-list', '--parents', *sorted(set(tips.values())),
+                   f'^{base_sha}'])
+    if out is None:
+        return {}
+    parents = {}
+    for line in out.splitlines():
+        sha, *rest = line.split()
+        parents[sha] = rest
+    counts = {}
+    for branch, tip in tips.items():
+        seen = set()
+        stack = [tip] if tip in parents else []
+        while stack:
+            sha = stack.pop()
+            if sha in seen:
+                continue
+            seen.add(sha)
+            stack.extend(p for p in parents[sha] if p in parents)
+        counts[branch] = len(seen)
+    return counts
+
+
+def dirty_count(path: str) -> int | None:
+    """Number of changed or untracked paths in a worktree."""
+    out = run_cmd(['git', '-C', path, 'status', '--porcelain', '--untracked-files=normal'])
+    if out is None:
+        return None
+    return sum(1 for line in out.splitlines() if line.strip())
+
+
+def ci_summary(rollup: list | None) -> str:
+    """passed / failed / pending / none from a PR's statusCheckRollup."""
+    if not rollup:
+        return 'none'
+    pending = False
+    for check in rollup:
+        if check.get('__typename') == 'StatusContext':
+            state = (check.get('state') or '').upper()
+            if state in ('FAILURE', 'ERROR'):
+                return 'failed'
+            pending = pending or state in ('PENDING', 'EXPECTED')
+        else:
+            if (check.get('status') or '').upper() != 'COMPLETED':
+                pending = True
+            elif (check.get('conclusion') or '').upper() in FAILED_CONCLUSIONS:
+                return 'failed'
+    return 'pending' if pending else 'passed'
+
+
+def pr_info(pr: dict) -> dict:
+    return {
+        "number": pr.get('number'),
+        "state": (pr.get('state') or '').lower() or None,
+        "url": pr.get('url'),
+        "draft": bool(pr.get('isDraft')),
+        "review": (pr.get('reviewDecision') or '').lower() or None,
+        "ci": ci_summary(pr.get('statusCheckRollup')),
+    }
+
+
+def gh_json(gh: str, args: list[str], root: str):
+    out = run_cmd([gh, *args], cwd=root, timeout=GH_TIMEOUT)
+    if out is None:
+        return None
+    try:
+        return json.loads(out)
+    except json.JSONDecodeError:
+        return None
+
+
+def open_prs(gh: str, root: str) -> dict[str, dict] | None:
+    """Open PRs keyed by head branch, from one `gh pr list`."""
+    prs = gh_json(gh, ['pr', 'list', '--state', 'open', '--limit', str(PR_LIST_LIMIT),
+                       '--json', PR_FIELDS], root)
+    if not isinstance(prs, list):
+        return None
+    return {pr.get('headRefName'): pr for pr in prs if isinstance(pr, dict)}
+
+
+def view_pr(gh: str, root: str, number: int) -> dict | None:
+    pr = gh_json(gh, ['pr', 'view', str(number), '--json', PR_FIELDS], root)
+    return pr if isinstance(pr, dict) else None
+
+
+def collect(root: str, jobs: int = MAX_JOBS, gh: str | None = 'gh') -> dict:
+    """Gather the state of every registered task (see module docstring)."""
+    start = time.perf_counter()
+    errors = []
+    registry = open_registry(root)
+    tasks = registry.tasks()
+    active = registry.active_task()
+
+    git_dir = find_git_dir(root)
+    base, base_sha = resolve_base_branch(root, git_dir) if git_dir else (None, None)
+    if base is None:
+        errors.append("no base branch found (set base_branch in linear-config.json)")
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        # gh is the slowest call: start it before the git work
+        prs_future = pool.submit(open_prs, gh, root) if gh else None
+
+        worktrees = list_worktrees(root)
+        by_branch = {wt["branch"]: wt for wt in worktrees if wt["branch"]}
+        dirty_futures = {wt["path"]: pool.submit(dirty_count, wt["path"])
+                         for wt in worktrees if not wt["prunable"]}
+
+        branches = sorted({t.get('branch') for t in tasks.values() if t.get('branch')})
+        refs = branch_refs(root, branches, base_sha)
+        missing = {b: info["sha"] for b, info in refs.items() if info["ahead"] is None}
+        if base_sha and missing:
+            for branch, count in count_ahead(root, missing, base_sha).items():
+                refs[branch]["ahead"] = count
+
+        prs = prs_future.result() if prs_future else None
+        # Tasks whose PR is merged or closed are not in the open list
+        view_futures = {}
+        if prs is None and gh:
+            errors.append(f"{gh} pr list failed (not authenticated or no GitHub remote?)")
+        elif prs is not None:
+            for task in tasks.values():
+                number = task.get('pr_number')
+                if number and task.get('branch') not in prs:
+                    view_futures[number] = pool.submit(view_pr, gh, root, number)
+
+        prs = prs or {}
+        dirty = {path: f.result() for path, f in dirty_futures.items()}
+        viewed = {number: f.result() for number, f in view_futures.items()}
+
+    rows = []
+    task_branches = set()
+    for tid, task in tasks.items():
+        branch = task.get('branch')
+        task_branches.add(branch)
+        wt = by_branch.get(branch)
+        ref = refs.get(branch)
+        pr = prs.get(branch) or viewed.get(task.get('pr_number'))
+        rows.append({
+            "issue_id": tid,
+            "title": task.get('title'),
+            "branch": branch,
+            "active": tid == active,
+            "status": task.get('status'),
+            "linear_status": task.get('linear_status'),
+            "last_active_at": task.get('last_active_at'),
+            "branch_exists": ref is not None,
+            "worktree": wt["path"] if wt else None,
+            "dirty": dirty.get(wt["path"]) if wt else None,
+            "ahead": ref["ahead"] if ref else None,
+            "upstream": ref["upstream"] if ref else None,
+            "unpushed": ref["unpushed"] if ref else None,
+            "upstream_gone": ref["gone"] if ref else False,
+            "pr": pr_info(pr) if pr else (
+                {"number": task['pr_number'], "state": None, "url": None, "draft": False,
+                 "review": None, "ci": None} if task.get('pr_number') else None),
+        })
+    rows.sort(key=lambda r: r["last_active_at"] or '', reverse=True)
+
+    others = [{"path": wt["path"], "branch": wt["branch"], "dirty": dirty.get(wt["path"]),
+               "prunable": wt["prunable"]}
+              for wt in worktrees
+              if wt["branch"] not in task_branches and os.path.normpath(wt["path"]) != root]
+
+    return {
+        "root": root,
+        "base": base,
+        "active_task": active,
+        "tasks": rows,
+        "other_worktrees": others,
+        "errors": errors,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Collect task/worktree/PR state as JSON")
+    parser.add_argument('--root', help="main repo root (default: detected from cwd)")
+    parser.add_argument('--jobs', type=int, default=MAX_JOBS,
+                        help=f"parallel git/gh calls (default: {MAX_JOBS})")
+    parser.add_argument('--no-gh', action='store_true', help="skip PR and CI lookups")
+    parser.add_argument('--gh', default=os.environ.get('YUX_LINEAR_GH', 'gh'),
+                        help="gh executable (default: $YUX_LINEAR_GH or gh)")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    root = get_main_repo_root(args.root)
+    if root is None:
+        print("[yux-linear] not inside a git repository", file=sys.stderr)
+        sys.exit(1)
+    try:
+        result = collect(os.path.normpath(root), args.jobs, None if args.no_gh else args.gh)
+    except RegistryError as e:
+        print(f"[yux-linear] {e}", file=sys.stderr)
+        sys.exit(1)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
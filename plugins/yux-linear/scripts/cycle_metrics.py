@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Cycle progress, burndown, velocity and capacity from the local cycle
+metrics (stored in .claude/linear-mirror.db and kept current by
+linear_mirror.py ingest/sync, see _cycle_metrics.py).
+
+Usage:
+  cycle_metrics.py show [CYCLE]               progress of the current (or given) cycle
+  cycle_metrics.py burndown [CYCLE]           remaining effort per business day
+  cycle_metrics.py velocity [--cycles 3]      done effort over the last closed cycles
+  cycle_metrics.py capacity --days N [--cycles 3] [--buffer 0.2]
+  cycle_metrics.py history [--limit N]        closed cycles, newest first
+  cycle_metrics.py cycles <FILE|->            store cycle numbers and dates
+  cycle_metrics.py snapshot                   record today's point for every open cycle
+  cycle_metrics.py rebuild                    recompute the totals from the mirrored issues
+  cycle_metrics.py stats
+
+`cycles` takes the result of mcp__linear__list_cycles (a list, or
+{"cycles": [...]} / {"nodes": [...]}); issues that only carry a cycle id
+need it before their cycle has dates. `capacity` is the effective days
+for a cycle of --days business days: measured throughput when at least
+one cycle has closed, else --days minus the --buffer share. All commands
+accept --json, --root (main repo root, default: detected from cwd) and
+--today (YYYY-MM-DD) before the command name.
+
+Exit codes:
+  0 - Success
+  1 - Unknown cycle, or no cycle data
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _cycle_metrics import DEFAULT_BUFFER, DEFAULT_CYCLES, utc_today
+from _issue_mirror import open_mirror
+from _issue_scoring import parse_date
+
+
+def print_json(data) -> None:
+    print(json.dumps(data, indent=2, ensure_ascii=False))
+
+
+def read_input(path: str):
+    if path == '-':
+        return json.load(sys.stdin)
+    with open(path) as f:
+        return json.load(f)
+
+
+def cycle_title(progress: dict) -> str:
+    name = f"Cycle {progress['number']}" if progress['number'] is not None else progress['cycle']
+    starts, ends = parse_date(progress['starts']), parse_date(progress['ends'])
+    if starts and ends:
+        name += f" ({starts:%b %-d} - {ends:%b %-d})"
+    return name
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Cycle burndown, velocity and capacity")
+    parser.add_argument('--root', help="main repo root (default: detected from cwd)")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    parser.add_argument('--today', help="date to report for (YYYY-MM-DD)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('show', help="progress of a cycle").add_argument('cycle', nargs='?')
+    sub.add_parser('burndown', help="remaining effort per day").add_argument('cycle', nargs='?')
+    p = sub.add_parser('velocity', help="done effort over the last closed cycles")
+    p.add_argument('--cycles', type=int, default=DEFAULT_CYCLES)
+    p = sub.add_parser('capacity', help="effective days for the next cycle")
+    p.add_argument('--days', type=float, required=True, help="business days in the cycle")
+    p.add_argument('--cycles', type=int, default=DEFAULT_CYCLES)
+    p.add_argument('--buffer', type=float, default=DEFAULT_BUFFER,
+                   help=f"fallback buffer share (default {DEFAULT_BUFFER})")
+    sub.add_parser('history', help="closed cycles").add_argument('--limit', type=int)
+    sub.add_parser('cycles', help="store cycle numbers and dates").add_argument('input')
+    sub.add_parser('snapshot', help="record today's point for every open cycle")
+    sub.add_parser('rebuild', help="recompute the totals from the mirrored issues")
+    sub.add_parser('stats', help="metrics size")
+    return parser
+
+
+def run(args, mirror) -> int:
+    metrics = mirror.cycles
+    today = parse_date(args.today) or utc_today()
+    command = args.command
+
+    if command in ('show', 'burndown'):
+        cycle = args.cycle or metrics.current(today)
+        progress = metrics.progress(cycle) if cycle else None
+        if progress is None:
+            print(f"[yux-linear] no metrics for cycle {cycle or '(none current)'}", file=sys.stderr)
+            return 1
+        points = metrics.burndown(cycle, today)
+        if args.json:
+            print_json(progress if command == 'show' else points)
+            return 0
+        if command == 'show':
+            print(f"{'Cycle' if args.cycle else 'Current Cycle'}: {cycle_title(progress)}")
+            print(f"Progress: {progress['progress']:.0%} ({progress['done_issues']}/"
+                  f"{progress['issues']} issues, {progress['done_days']:g}/"
+                  f"{progress['scope_days']:g} days)")
+            if points:
+                last = points[-1]
+                print(f"Remaining: {progress['remaining_days']:g} days "
+                      f"(ideal today: {last['ideal_days']:g})")
+            return 0
+        for point in points:
+            print(f"{point['day']}  remaining {point['remaining_days']:>7g}  "
+                  f"ideal {point['ideal_days']:>7g}  done {point['done_days']:g}")
+    elif command == 'velocity':
+        velocity = metrics.velocity(args.cycles)
+        if args.json:
+            print_json(velocity)
+        elif not velocity['cycles']:
+            print("No closed cycles yet.")
+        else:
+            print(f"Velocity: {velocity['per_cycle_days']:g} days per cycle, "
+                  f"{velocity['per_business_day']:g} per business day "
+                  f"(last {velocity['cycles']} cycles)")
+    elif command == 'capacity':
+        suggestion = metrics.suggest_capacity(args.days, args.cycles, args.buffer)
+        if args.json:
+            print_json(suggestion)
+        elif suggestion['source'] == 'measured':
+            print(f"Capacity: {suggestion['capacity_days']:g} effective days ({args.days:g} "
+                  f"business days at {suggestion['per_business_day']:g} done per day over "
+                  f"{suggestion['cycles']} cycles)")
+        else:
+            print(f"Capacity: {suggestion['capacity_days']:g} effective days ({args.days:g} "
+                  f"business days, {args.buffer:.0%} buffer; no closed cycles yet)")
+    elif command == 'history':
+        history = metrics.history(args.limit)
+        if args.json:
+            print_json(history)
+            return 0
+        for row in history:
+            number = row['number'] if row['number'] is not None else row['cycle']
+            print(f"Cycle {number}  ended {row['ends']}  done {row['done_days']:g}"
+                  f"/{row['scope_days']:g} days in {row['business_days']} business days")
+    elif command == 'cycles':
+        data = read_input(args.input)
+        if isinstance(data, dict):
+            data = data.get('cycles') or data.get('nodes') or []
+        metrics.set_cycles(data if isinstance(data, list) else [])
+        metrics.snapshot(today)
+    elif command == 'snapshot':
+        metrics.snapshot(today, everything=True)
+        print_json(metrics.stats())
+    elif command == 'rebuild':
+        mirror.rebuild_cycles()
+        print_json(metrics.stats())
+    elif command == 'stats':
+        print_json(metrics.stats())
+    return 0
+
+
+def main():
+    args = build_parser().parse_args()
+    mirror = open_mirror(args.root)
+    try:
+        sys.exit(run(args, mirror))
+    finally:
+        mirror.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Fast-start hook entry point used by hooks.json.
+
+  python3 -I -S ${CLAUDE_PLUGIN_ROOT}/scripts/hook_entry.py <EventName>
+
+A script run as __main__ is recompiled on every start, so this stub stays
+tiny and everything else comes from linear_hook's cached bytecode.
+-I -S skips site initialisation, user site-packages and PYTHON* variables.
+"""
+import sys
+sys.path.insert(0, __file__.rpartition('/')[0] or '.')
+from linear_hook import main
+main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Opt-in hook daemon: keeps the Linear hook scripts loaded between events.
+
+One daemon serves one main repo root over a Unix socket in the per-user
+runtime directory. linear_hook.py forwards each event here; the checks stay
+imported and the task registry keeps its linear-tasks.json parse warm, so an event
+costs one socket round trip instead of a fresh interpreter plus imports.
+
+Usage:
+  python3 linear_daemon.py start [--idle-timeout SECS]   # from inside the repo
+  python3 linear_daemon.py stop
+  python3 linear_daemon.py status
+
+Protocol: one JSON line per connection.
+  request:  {"op": "run", "event": "PreToolUse", "cwd": "...", "stdin": "...",
+             "budget": 2.9, "env": {"YUX_LINEAR_TRACE": "1", ...}}
+  response: {"stdout": "...", "stderr": "...", "code": 0}
+
+"env" holds the client's LINEAR_* and YUX_* variables (FORWARDED_ENV in
+linear_hook.py). They replace the daemon's own for that one event, so a
+variable set or unset after the daemon started counts as it would
+in-process.
+
+The daemon exits after --idle-timeout seconds without requests (default
+1800) and whenever a hook script changes on disk, so a plugin update never
+keeps serving stale code; clients then fall back to running in-process.
+"""
+
+import contextlib
+import fcntl
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+import _trace
+from _git_state import get_main_repo_root
+from _runtime import socket_path
+from linear_hook import CHECKS, FORWARDED_ENV, dispatch, time_budget
+
+DEFAULT_IDLE_TIMEOUT = 1800
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+
+def scripts_stamp() -> float:
+    """Newest mtime among the hook scripts."""
+    stamp = 0.0
+    for name in os.listdir(SCRIPTS_DIR):
+        if name.endswith('.py'):
+            try:
+                stamp = max(stamp, os.stat(os.path.join(SCRIPTS_DIR, name)).st_mtime)
+            except OSError:
+                pass
+    return stamp
+
+
+@contextlib.contextmanager
+def client_env(env: dict | None):
+    """Swap in the client's FORWARDED_ENV variables for one event (None, from
+    an older client: keep the daemon's)."""
+    if env is None:
+        yield
+        return
+    saved = {name: value for name, value in os.environ.items()
+             if name.startswith(FORWARDED_ENV)}
+    for name in saved:
+        del os.environ[name]
+    os.environ.update({name: str(value) for name, value in env.items()
+                       if name.startswith(FORWARDED_ENV)})
+    try:
+        yield
+    finally:
+        for name in [name for name in os.environ if name.startswith(FORWARDED_ENV)]:
+            del os.environ[name]
+        os.environ.update(saved)
+
+
+def run_event(event: str, cwd: str, stdin: str, budget: float | None = None,
+              env: dict | None = None) -> dict:
+    """Dispatch one event from the client's working directory and
+    environment, within the client's remaining time budget."""
+    prev_cwd = os.getcwd()
+    with client_env(env):
+        try:
+            os.chdir(cwd)
+            repo_root = get_main_repo_root()
+            _trace.start(event, repo_root, daemon=True)
+            if budget is None:
+                # Older client: the daemon's own uptime says nothing about the event
+                budget = time_budget(event, repo_root, elapsed=0.0)
+            code, out, err = dispatch(event, stdin, budget)
+            _trace.finish(code)
+        finally:
+            os.chdir(prev_cwd)
+    return {"stdout": out, "stderr": err, "code": code}
+
+
+def read_request(conn: socket.socket) -> dict | None:
+    """Read one newline-terminated JSON request."""
+    chunks = []
+    size = 0
+    while True:
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size += len(chunk)
+        if chunk.endswith(b'\n') or size > MAX_REQUEST_BYTES:
+            break
+    try:
+        return json.loads(b''.join(chunks))
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+
+
+def serve(repo_root: str, idle_timeout: int) -> None:
+    """Bind the repo's socket and answer requests until idle or stale."""
+    path = socket_path(repo_root)
+
+    # One daemon per repo: concurrent autostarts lose this lock and exit
+    lock = open(path + '.lock', 'w')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return
+
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    os.chmod(path, 0o600)
+    server.listen(16)
+    server.settimeout(idle_timeout)
+
+    loaded_stamp = scripts_stamp()
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+            with conn:
+                conn.settimeout(5)
+                try:
+                    request = read_request(conn)
+                except OSError:
+                    continue
+                if not request:
+                    continue
+
+                op = request.get('op')
+                if op == 'shutdown':
+                    conn.sendall(b'{"ok": true}\n')
+                    break
+                if op == 'ping':
+                    reply = {"ok": True, "pid": os.getpid(), "root": repo_root}
+                    conn.sendall(json.dumps(reply).encode() + b'\n')
+                    continue
+                if op != 'run' or request.get('event') not in CHECKS:
+                    conn.sendall(b'{"error": "bad request"}\n')
+                    continue
+                if scripts_stamp() != loaded_stamp:
+                    # Plugin updated underneath us; let the client run it fresh
+                    conn.sendall(b'{"error": "stale"}\n')
+                    break
+
+                try:
+                    reply = run_event(
+                        request['event'],
+                        request.get('cwd') or repo_root,
+                        request.get('stdin') or '',
+                        request.get('budget') if isinstance(request.get('budget'), (int, float))
+                        else None,
+                        request.get('env') if isinstance(request.get('env'), dict) else None,
+                    )
+                except OSError:
+                    # cwd vanished (e.g. worktree removed): client runs it
+                    conn.sendall(b'{"error": "bad cwd"}\n')
+                    continue
+                with contextlib.suppress(OSError):
+                    conn.sendall(json.dumps(reply).encode() + b'\n')
+    finally:
+        server.close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+        lock.close()
+
+
+def request(repo_root: str, payload: dict, timeout: float = 2) -> dict | None:
+    """Send one control request to the daemon, None if it is not running."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path(repo_root))
+            sock.sendall(json.dumps(payload).encode() + b'\n')
+            data = b''
+            while not data.endswith(b'\n'):
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                data += chunk
+        return json.loads(data)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def start(repo_root: str, idle_timeout: int) -> int:
+    """Spawn a detached daemon for repo_root and wait for it to answer."""
+    status = request(repo_root, {"op": "ping"})
+    if status:
+        print(f"Hook daemon already running (pid {status['pid']}) for {repo_root}")
+        return 0
+
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), 'serve',
+         '--root', repo_root, '--idle-timeout', str(idle_timeout)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        status = request(repo_root, {"op": "ping"})
+        if status:
+            print(f"Hook daemon started (pid {status['pid']}) for {repo_root}")
+            print(f"Socket: {socket_path(repo_root)}")
+            return 0
+        time.sleep(0.05)
+    print("Hook daemon did not come up; hooks keep running in-process.", file=sys.stderr)
+    return 1
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ('start', 'stop', 'status', 'serve'):
+        print(__doc__.strip(), file=sys.stderr)
+        sys.exit(2)
+
+    command = args[0]
+    idle_timeout = DEFAULT_IDLE_TIMEOUT
+    repo_root = None
+    if '--idle-timeout' in args:
+        idle_timeout = int(args[args.index('--idle-timeout') + 1])
+    if '--root' in args:
+        repo_root = args[args.index('--root') + 1]
+    repo_root = repo_root or get_main_repo_root()
+    if not repo_root:
+        print("Not inside a git repository.", file=sys.stderr)
+        sys.exit(1)
+
+    if command == 'serve':
+        serve(repo_root, idle_timeout)
+        sys.exit(0)
+
+    if command == 'start':
+        sys.exit(start(repo_root, idle_timeout))
+
+    if command == 'stop':
+        if request(repo_root, {"op": "shutdown"}):
+            print(f"Hook daemon stopped for {repo_root}")
+        else:
+            print(f"No hook daemon running for {repo_root}")
+        sys.exit(0)
+
+    status = request(repo_root, {"op": "ping"})
+    if status:
+        print(f"Hook daemon running (pid {status['pid']}) for {repo_root}")
+    else:
+        print(f"No hook daemon running for {repo_root}")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Query and update the local issue dependency index (stored in
+.claude/linear-mirror.db and kept current by linear_mirror.py ingest/sync).
+
+Usage:
+  linear_deps.py show <ISSUE_ID>              state, blockers and dependents
+  linear_deps.py unblocks <ISSUE_ID>          open issues freed by closing it
+  linear_deps.py blockers <ISSUE_ID> [--transitive] [--open]
+  linear_deps.py waiting <ISSUE_ID>           open issues downstream of it
+  linear_deps.py set-state <ISSUE_ID> --done | --open [--in-progress]
+  linear_deps.py relate <BLOCKER> <BLOCKED> [--remove]
+  linear_deps.py set-parent <ISSUE_ID> <PARENT_ID|->
+  linear_deps.py rebuild                      rebuild from the mirrored issues
+  linear_deps.py stats
+
+Skills call set-state / relate right after changing an issue in Linear,
+so the index stays current without waiting for the next sync. All
+commands accept --json (machine-readable output) and --root (main repo
+root, default: detected from cwd) before the command name.
+
+Exit codes:
+  0 - Success
+  1 - Unknown issue
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _issue_mirror import open_mirror
+
+
+def print_json(data) -> None:
+    print(json.dumps(data, indent=2, ensure_ascii=False))
+
+
+def print_keys(title: str, keys: list[str]) -> None:
+    print(f"{title}: {', '.join(keys) if keys else 'none'}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Local issue dependency index")
+    parser.add_argument('--root', help="main repo root (default: detected from cwd)")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('show', help="state, blockers and dependents").add_argument('issue_id')
+    sub.add_parser('unblocks', help="open issues freed by closing an issue").add_argument('issue_id')
+    p = sub.add_parser('blockers', help="direct or transitive blockers")
+    p.add_argument('issue_id')
+    p.add_argument('--transitive', action='store_true')
+    p.add_argument('--open', action='store_true', help="only blockers that are not done")
+    sub.add_parser('waiting', help="open issues downstream of an issue").add_argument('issue_id')
+
+    p = sub.add_parser('set-state', help="record an issue's state change")
+    p.add_argument('issue_id')
+    group = p.add_mutually_exclusive_group(required=True)
+    group.add_argument('--done', action='store_true')
+    group.add_argument('--open', action='store_true')
+    p.add_argument('--in-progress', action='store_true')
+
+    p = sub.add_parser('relate', help="record a blocks relation")
+    p.add_argument('blocker')
+    p.add_argument('blocked')
+    p.add_argument('--remove', action='store_true', help="remove the relation instead")
+
+    p = sub.add_parser('set-parent', help="record an issue's parent epic")
+    p.add_argument('issue_id')
+    p.add_argument('parent', help="parent issue id, or - for none")
+
+    sub.add_parser('rebuild', help="rebuild the index from the mirrored issues")
+    sub.add_parser('stats', help="index size")
+    return parser
+
+
+def run(args, mirror) -> int:
+    graph = mirror.graph
+    command = args.command
+    key = getattr(args, 'issue_id', None)
+    key = key.upper() if key else key
+
+    if command == 'show':
+        state = graph.state(key)
+        if state is None:
+            return 1
+        state.update(issue=key,
+                     blockers=[{"issue": k, "done": d} for k, d in graph.blockers(key)],
+                     dependents=[{"issue": k, "done": d} for k, d in graph.dependents(key)],
+                     unblocks=graph.unblocks(key))
+        if args.json:
+            print_json(state)
+            return 0
+        status = 'done' if state['done'] else 'in progress' if state['in_progress'] else 'open'
+        print(f"{key}: {status}, {state['open_blockers']} open blocker(s)"
+              f"{', parent ' + state['parent'] if state['parent'] else ''}")
+        print_keys("Blocked by", [f"{b['issue']}{' (done)' if b['done'] else ''}"
+                                  for b in state['blockers']])
+        print_keys("Blocks", [f"{b['issue']}{' (done)' if b['done'] else ''}"
+                              for b in state['dependents']])
+        print_keys("Closing it unblocks", state['unblocks'])
+    elif command in ('unblocks', 'blockers', 'waiting'):
+        if graph.state(key) is None:
+            return 1
+        if command == 'unblocks':
+            keys = graph.unblocks(key)
+        elif command == 'waiting':
+            keys = graph.waiting_on(key)
+        elif args.transitive:
+            keys = graph.transitive_blockers(key, open_only=args.open)
+        else:
+            keys = [k for k, done in graph.blockers(key) if not (args.open and done)]
+        if args.json:
+            print_json(keys)
+        else:
+            print('\n'.join(keys))
+    elif command == 'set-state':
+        graph.set_state(key, args.done, args.in_progress)
+        unblocked = [k for k, done in graph.dependents(key)
+                     if not done and graph.state(k)['open_blockers'] == 0] if args.done else []
+        if args.json:
+            print_json({"issue": key, "done": args.done, "unblocked": unblocked})
+        elif unblocked:
+            print_keys("Now unblocked", unblocked)
+    elif command == 'relate':
+        blocker, blocked = args.blocker.upper(), args.blocked.upper()
+        if args.remove:
+            graph.remove_relation(blocker, blocked)
+        else:
+            graph.add_relation(blocker, blocked)
+    elif command == 'set-parent':
+        graph.set_parent(key, None if args.parent == '-' else args.parent.upper())
+    elif command == 'rebuild':
+        mirror.rebuild_graph()
+        print_json(graph.stats())
+    elif command == 'stats':
+        print_json(graph.stats())
+    return 0
+
+
+def main():
+    args = build_parser().parse_args()
+    mirror = open_mirror(args.root)
+    try:
+        sys.exit(run(args, mirror))
+    finally:
+        mirror.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Single hook entry point: run every Linear check for one event in one process.
+
+Usage:
+  python3 ${CLAUDE_PLUGIN_ROOT}/scripts/linear_hook.py <EventName>
+
+hooks.json goes through hook_entry.py, which starts the same main() in
+isolated mode from cached bytecode. Keep module-level imports here to os
+and sys: everything else is imported where it is first needed, and
+bench/import_budget.py fails if the non-Linear path grows new imports.
+
+The payload is parsed once and the guard verdict and git state are shared
+by all checks through a HookContext. Each check declares the payload
+fields it reads; only those are extracted from stdin, so a multi-megabyte
+Write content or build log is skipped rather than loaded. Each check's stdout/stderr is passed
+through in registry order. The event goes to the hook daemon (see
+linear_daemon.py) when one is running for this repo, and runs in-process
+otherwise.
+
+Set YUX_LINEAR_HOOK_DAEMON=1 to start a daemon automatically the first
+time an event falls back; that event itself still runs in-process.
+
+Set YUX_LINEAR_TRACE=1 (or "trace": true in linear-config.json) to record
+per-event timing spans; see _trace.py and linear_hook_stats.py.
+
+Each event runs under a deadline of a fraction of its hooks.json timeout
+(YUX_LINEAR_HOOK_BUDGET or "hook_budget" in linear-config.json, default
+0.6), counted from process start. Subprocesses get only the time left,
+optional extras are dropped first, and a check that runs out of time is
+skipped with a note, so the hook answers before the harness kills it.
+
+Exit codes:
+  0 - Allow operation (checks may still print informational output)
+  2 - Block operation (any check returned 2)
+"""
+
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+import _trace
+from _git_state import get_main_repo_root
+from _hook_context import HookContext
+from _runtime import socket_path
+
+DAEMON_TIMEOUT = 4
+# Environment variables the checks read; forwarded with each daemon request
+# so an event behaves as it would in-process
+FORWARDED_ENV = ('LINEAR_', 'YUX_')
+
+# Harness timeouts per event, as in hooks/hooks.json (seconds)
+HOOK_TIMEOUTS = {'UserPromptSubmit': 5, 'PreToolUse': 5, 'PreCompact': 10, 'PostToolUse': 5}
+DEFAULT_BUDGET = 0.6
+
+
+# Keep at most this much of the head and of the tail of tool output
+OUTPUT_CAP = 64 * 1024
+
+
+class Check:
+    """A registered check: module name, the tools it applies to, the
+    payload fields it reads (dotted path -> cap, see _payload.py) and the
+    module function to call (default: check)."""
+
+    def __init__(self, module: str, tools: tuple[str, ...] | None = None,
+                 fields: dict[str, int | None] | None = None, entry: str = 'check'):
+        self.module = module
+        self.tools = tools
+        self.fields = fields or {}
+        self.entry = entry
+
+    @property
+    def name(self) -> str:
+        return self.module if self.entry == 'check' else f'{self.module}.{self.entry}'
+
+    def matches(self, ctx: HookContext) -> bool:
+        return self.tools is None or ctx.tool_name in self.tools
+
+
+# Event name -> checks, in the order their output is emitted
+CHECKS = {
+    'UserPromptSubmit': [
+        Check('verify_linear_task', fields={'session_id': None}),
+    ],
+    'PreToolUse': [
+        Check('check_branch', tools=('Write', 'Edit')),
+        Check('validate_commit', tools=('Bash',),
+              fields={'tool_input.command': None, 'cwd': None}),
+    ],
+    'PreCompact': [
+        Check('verify_linear_task', entry='forget', fields={'session_id': None}),
+        Check('sync_progress'),
+        Check('prompt_sync_reminder'),
+    ],
+    'PostToolUse': [
+        Check('post_command', tools=('Bash',),
+              fields={'tool_input.command': None, 'tool_output.stdout': OUTPUT_CAP}),
+    ],
+}
+
+
+def payload_fields(checks: list[Check]) -> dict[str, int | None]:
+    """Union of the fields the checks read, plus tool_name for matching."""
+    fields = {'tool_name': None}
+    for check in checks:
+        for path, cap in check.fields.items():
+            if path not in fields:
+                fields[path] = cap
+            elif fields[path] is not None:
+                fields[path] = None if cap is None else max(cap, fields[path])
+    return fields
+
+
+def budget_fraction(repo_root: str | None) -> float:
+    """Share of the harness timeout a hook may use: YUX_LINEAR_HOOK_BUDGET,
+    else linear-config.json "hook_budget", else DEFAULT_BUDGET."""
+    value = os.environ.get('YUX_LINEAR_HOOK_BUDGET')
+    if value is None and repo_root:
+        try:
+            with open(os.path.join(repo_root, '.claude', 'linear-config.json'), 'rb') as f:
+                data = f.read()
+        except OSError:
+            data = b''
+        if b'"hook_budget"' in data:
+            import json
+            try:
+                value = json.loads(data).get('hook_budget')
+            except (ValueError, AttributeError):
+                value = None
+    try:
+        fraction = float(value)
+    except (TypeError, ValueError):
+        return DEFAULT_BUDGET
+    return fraction if 0 < fraction <= 1 else DEFAULT_BUDGET
+
+
+def time_budget(event: str, repo_root: str | None, elapsed: float | None = None) -> float:
+    """Seconds left for this event: its share of the harness timeout, minus
+    elapsed (default: the time since this process started)."""
+    budget = HOOK_TIMEOUTS.get(event, 5) * budget_fraction(repo_root)
+    if elapsed is None:
+        elapsed = _trace.process_age() or 0.0
+    return budget - elapsed
+
+
+def run_check(check: Check, ctx: HookContext) -> tuple[int, str, str]:
+    """Run one check, capturing its output; a crash never blocks."""
+    import io
+    from _proc import DeadlineExceeded
+    out, err = io.StringIO(), io.StringIO()
+    saved = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = out, err
+    try:
+        code = getattr(__import__(check.module), check.entry)(ctx)
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 0
+    except DeadlineExceeded:
+        # Drop the partial output: what was printed may be half a result
+        out = io.StringIO()
+        print(f"[yux-linear] {check.name} skipped: hook time budget used up", file=err)
+        code = 0
+    except Exception as e:
+        print(f"[yux-linear] {check.name} failed: {e}", file=err)
+        code = 1
+    finally:
+        sys.stdout, sys.stderr = saved
+    return code or 0, out.getvalue(), err.getvalue()
+
+
+def dispatch(event: str, raw: str | None = None, budget: float | None = None,
+             one_shot: bool = False) -> tuple[int, str, str]:
+    """Run all checks registered for event. Returns (code, stdout, stderr).
+
+    budget is the seconds left for the event (default: time_budget()).
+    one_shot is set by a hook process that exits after this event."""
+    checks = CHECKS.get(event)
+    if not checks:
+        return 0, '', ''
+
+    ctx = HookContext(event, raw, payload_fields(checks))
+    # Every check is a no-op outside Linear projects; decide that once
+    with _trace.span('guard'):
+        linear_active = ctx.linear_active
+    if not linear_active:
+        return 0, '', ''
+    import _proc
+    _proc.set_deadline(budget if budget is not None else time_budget(event, ctx.repo_root))
+    if _trace.active() and any(check.tools or check.fields for check in checks):
+        # Parsed by the first check that looks at the payload anyway
+        with _trace.span('stdin'):
+            ctx.payload
+
+    code = 0
+    stdout, stderr = [], []
+    for check in checks:
+        if not check.matches(ctx):
+            continue
+        if not _proc.has_budget(0):
+            stderr.append(f"[yux-linear] {check.name} skipped: hook time budget used up\n")
+            continue
+        if one_shot and 'tool_input.command' in check.fields:
+            # The tokenizer allocates a segment per command and builds no
+            # reference cycles, so collecting meanwhile only costs time. Off
+            # for the rest of this process, which exits after the event; the
+            # daemon keeps the default
+            import gc
+            gc.disable()
+        with _trace.span('check:' + check.name):
+            check_code, out, err = run_check(check, ctx)
+        stdout.append(out)
+        stderr.append(err)
+        # Exit 2 blocks and wins; otherwise keep the highest code
+        if check_code == 2 or code == 2:
+            code = 2
+        else:
+            code = max(code, check_code)
+    return code, ''.join(stdout), ''.join(stderr)
+
+
+def forward(path: str, event: str, raw: str, budget: float) -> dict | None:
+    """Run the event through the daemon socket; None if it is unavailable."""
+    import json
+    import socket
+    env = {name: value for name, value in os.environ.items() if name.startswith(FORWARDED_ENV)}
+    request = {"op": "run", "event": event, "cwd": os.getcwd(), "stdin": raw,
+               "budget": budget, "env": env}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            # Leave the daemon its budget plus a little for the round trip
+            sock.settimeout(max(0.1, min(DAEMON_TIMEOUT, budget + 0.5)))
+            sock.connect(path)
+            sock.sendall(json.dumps(request).encode() + b'\n')
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                if chunk.endswith(b'\n'):
+                    break
+        reply = json.loads(b''.join(chunks))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(reply, dict) or 'code' not in reply:
+        return None
+    return reply
+
+
+def autostart(repo_root: str) -> None:
+    """Spawn a daemon in the background for the next event."""
+    import subprocess
+    from _proc import popen
+    try:
+        popen(
+            [sys.executable, os.path.join(SCRIPTS_DIR, 'linear_daemon.py'),
+             'serve', '--root', repo_root],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        pass
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in CHECKS:
+        sys.exit(0)
+    event = sys.argv[1]
+    # Only read stdin up front when a daemon needs it; in-process dispatch
+    # reads it lazily, and never for non-Linear projects
+    raw = None
+    reply = None
+
+    repo_root = get_main_repo_root()
+    _trace.start(event, repo_root)
+    if repo_root:
+        path = socket_path(repo_root)
+        if os.path.exists(path):
+            # Send the daemon only the fields the checks read
+            import json
+            with _trace.span('stdin'):
+                payload = HookContext(event, fields=payload_fields(CHECKS[event])).payload
+            raw = json.dumps(payload)
+            with _trace.span('forward'):
+                reply = forward(path, event, raw, time_budget(event, repo_root))
+        if reply is None and os.environ.get('YUX_LINEAR_HOOK_DAEMON') == '1':
+            autostart(repo_root)
+
+    if reply is not None:
+        code, out, err = reply['code'], reply.get('stdout', ''), reply.get('stderr', '')
+    else:
+        code, out, err = dispatch(event, raw, one_shot=True)
+
+    with _trace.span('output'):
+        sys.stdout.write(out)
+        sys.stderr.write(err)
+        sys.stdout.flush()
+    _trace.finish(code)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
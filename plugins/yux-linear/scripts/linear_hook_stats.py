@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Summarise the hook trace (.claude/linear-hook-trace.jsonl, see _trace.py).
+
+Per hook event (in-process and daemon runs separately): run count,
+p50/p95/max total time against the hooks.json timeout, and average forks.
+Per span (startup, stdin, guard, check:<name>, proc:<command>, ...):
+count, p50/p95/max and average forks, so a hook nearing its timeout shows
+where the time goes.
+
+Tracing is off by default: set YUX_LINEAR_TRACE=1 in the environment
+Claude Code runs in, or add "trace": true to .claude/linear-config.json.
+
+Usage:
+  linear_hook_stats.py [--event EVENT] [--last N] [--json] [--root DIR]
+  linear_hook_stats.py --clear
+
+Exit codes:
+  0 - Success
+  1 - No trace records
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+from _git_state import get_main_repo_root
+from _trace import TRACE_FILE
+
+HOOKS_JSON = os.path.join(os.path.dirname(SCRIPTS_DIR), 'hooks', 'hooks.json')
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def hook_timeouts() -> dict[str, float]:
+    """Event -> harness timeout in seconds, from hooks.json."""
+    try:
+        with open(HOOKS_JSON) as f:
+            hooks = json.load(f).get('hooks', {})
+    except (OSError, json.JSONDecodeError, AttributeError):
+        return {}
+    timeouts = {}
+    for event, groups in hooks.items():
+        for group in groups:
+            for hook in group.get('hooks', []):
+                if 'timeout' in hook:
+                    timeouts[event] = hook['timeout']
+    return timeouts
+
+
+def load_records(path: str, event: str | None, last: int | None) -> list[dict]:
+    records = []
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn line from a concurrent trim
+                if isinstance(record, dict) and (event is None or record.get('event') == event):
+                    records.append(record)
+    except OSError:
+        return []
+    return records[-last:] if last else records
+
+
+def summarise(values: list[float], forks: list[int]) -> dict:
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 50), 2),
+        "p95_ms": round(percentile(values, 95), 2),
+        "max_ms": round(values[-1], 2) if values else 0.0,
+        "avg_forks": round(sum(forks) / len(forks), 2) if forks else 0.0,
+    }
+
+
+def aggregate(records: list[dict]) -> dict:
+    """{"hooks": [...], "spans": [...]} rows, grouped by event (and daemon)."""
+    timeouts = hook_timeouts()
+    hooks, spans = {}, {}
+    for record in records:
+        key = (record.get('event', '?'), bool(record.get('daemon')))
+        totals = hooks.setdefault(key, ([], []))
+        totals[0].append(record.get('total_ms', 0.0))
+        totals[1].append(record.get('forks', 0))
+        for span in record.get('spans', []):
+            values = spans.setdefault(key + (span.get('name', '?'),), ([], []))
+            values[0].append(span.get('ms', 0.0))
+            values[1].append(span.get('forks', 0))
+
+    hook_rows = []
+    for (event, daemon), (values, forks) in sorted(hooks.items()):
+        row = {"event": event, "daemon": daemon, **summarise(values, forks)}
+        timeout = timeouts.get(event)
+        if timeout:
+            row["timeout_ms"] = timeout * 1000
+            row["max_of_timeout"] = round(row["max_ms"] / (timeout * 1000), 3)
+        hook_rows.append(row)
+    span_rows = [{"event": event, "daemon": daemon, "span": name, **summarise(values, forks)}
+                 for (event, daemon, name), (values, forks) in sorted(spans.items())]
+    return {"records": len(records), "hooks": hook_rows, "spans": span_rows}
+
+
+def print_report(stats: dict) -> None:
+    print(f"{stats['records']} traced hook runs\n")
+    print(f"{'hook':<28s} {'runs':>5s} {'p50':>8s} {'p95':>8s} {'max':>8s} {'forks':>6s}  timeout")
+    for row in stats['hooks']:
+        name = row['event'] + (' (daemon)' if row['daemon'] else '')
+        share = f"  {row['timeout_ms'] / 1000:g}s, max {row['max_of_timeout']:.0%}" \
+            if 'timeout_ms' in row else ''
+        print(f"{name:<28s} {row['count']:>5d} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} "
+              f"{row['max_ms']:>8.2f} {row['avg_forks']:>6.2f}{share}")
+
+    current = None
+    for row in stats['spans']:
+        key = (row['event'], row['daemon'])
+        if key != current:
+            current = key
+            print(f"\n{row['event']}{' (daemon)' if row['daemon'] else ''}")
+            print(f"  {'span':<32s} {'count':>5s} {'p50':>8s} {'p95':>8s} {'max':>8s} {'forks':>6s}")
+        print(f"  {row['span']:<32s} {row['count']:>5d} {row['p50_ms']:>8.2f} "
+              f"{row['p95_ms']:>8.2f} {row['max_ms']:>8.2f} {row['avg_forks']:>6.2f}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Hook timing report from the trace file")
+    parser.add_argument('--root', help="main repo root (default: detected from cwd)")
+    parser.add_argument('--event', help="only this hook event (e.g. PreToolUse)")
+    parser.add_argument('--last', type=int, help="only the newest N records")
+    parser.add_argument('--json', action='store_true', help="print the aggregate as JSON")
+    parser.add_argument('--clear', action='store_true', help="delete the trace file")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    root = args.root or get_main_repo_root()
+    if not root:
+        print("[yux-linear] not inside a git repository", file=sys.stderr)
+        sys.exit(1)
+    path = os.path.join(root, '.claude', TRACE_FILE)
+
+    if args.clear:
+        if os.path.exists(path):
+            os.unlink(path)
+        print(f"Cleared {path}")
+        sys.exit(0)
+
+    records = load_records(path, args.event, args.last)
+    if not records:
+        print(f"No trace records in {path}. Enable tracing with YUX_LINEAR_TRACE=1 "
+              f"or \"trace\": true in linear-config.json.", file=sys.stderr)
+        sys.exit(1)
+    stats = aggregate(records)
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        print_report(stats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Local, incrementally synced mirror of the project's Linear issues
+(.claude/linear-mirror.db), so dashboards read locally and only fetch
+what changed since the last sync.
+
+Usage:
+  linear_mirror.py watermark
+  linear_mirror.py ingest <FILE|->
+  linear_mirror.py sync [--endpoint URL] [--full]
+  linear_mirror.py query [--state S] [--assignee NAME] [--priority N] [--cycle ID]
+                         [--label L] [--text T] [--limit N] [--json]
+  linear_mirror.py get <ISSUE_ID>
+  linear_mirror.py stats
+
+`ingest` stores the result of `mcp__linear__list_issues(updatedAt: <watermark>)`
+with every page collected into one dump: it moves the watermark to the
+newest issue in it, so ingesting a single page of a newest-first result
+would skip the older pages for good.
+`sync` pages the GraphQL API itself (token from LINEAR_API_KEY), and
+--endpoint points it at a local stand-in for testing. --state, --priority
+and --label accept comma-separated lists. `query --json` output can be piped
+straight into score_issues.py.
+
+All commands accept --root (main repo root, default: detected from cwd) and
+--project (default: linear-config.json "project.id").
+
+Exit codes:
+  0 - Success
+  1 - Unknown issue, unreadable input or failed sync
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _issue_mirror import DEFAULT_ENDPOINT, MirrorError, open_mirror
+from _issue_scoring import priority_of, state_of
+
+PRIORITY_LABELS = {0: '-', 1: 'Urgent', 2: 'High', 3: 'Medium', 4: 'Low'}
+
+
+def print_json(data) -> None:
+    print(json.dumps(data, indent=2, ensure_ascii=False))
+
+
+def split_list(value: str | None) -> list[str]:
+    return [part.strip() for part in (value or '').split(',') if part.strip()]
+
+
+def configured_project(repo_root: str) -> str:
+    try:
+        with open(os.path.join(repo_root, '.claude', 'linear-config.json')) as f:
+            project = json.load(f).get('project') or {}
+    except (OSError, json.JSONDecodeError, AttributeError):
+        return ''
+    return project.get('id', '') if isinstance(project, dict) else ''
+
+
+def print_table(issues: list[dict]) -> None:
+    if not issues:
+        print("No matching issues.")
+        return
+    for issue in issues:
+        priority = PRIORITY_LABELS.get(priority_of(issue), '-')
+        status = state_of(issue)[0].title() or '-'
+        print(f"  {issue.get('identifier', '?'):<9s} {priority:<7s} {status:<12s} "
+              f"{issue.get('title', '')[:60]}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Local Linear issue mirror")
+    parser.add_argument('--root', help="main repo root (default: detected from cwd)")
+    parser.add_argument('--project', help="project id (default: from linear-config.json)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    sub.add_parser('watermark', help="print the updatedAt to fetch from (empty if never synced)")
+
+    p = sub.add_parser('ingest', help="store issues from a JSON dump")
+    p.add_argument('file', help="list_issues result ('-' for stdin)")
+
+    p = sub.add_parser('sync', help="fetch issues changed since the watermark over GraphQL")
+    p.add_argument('--endpoint', default=os.environ.get('LINEAR_API_URL', DEFAULT_ENDPOINT))
+    p.add_argument('--full', action='store_true', help="drop the mirror and fetch everything")
+    p.add_argument('--timeout', type=float, default=30)
+
+    p = sub.add_parser('query', help="list mirrored issues matching filters")
+    p.add_argument('--state', help="state names or types, comma-separated")
+    p.add_argument('--assignee', help="assignee name ('' for unassigned)")
+    p.add_argument('--priority', help="priority numbers, comma-separated")
+    p.add_argument('--cycle', help="cycle id")
+    p.add_argument('--label', help="labels, comma-separated (all must match)")
+    p.add_argument('--text', help="title substring or identifier")
+    p.add_argument('--archived', action='store_true', help="include archived issues")
+    p.add_argument('--limit', type=int)
+    p.add_argument('--json', action='store_true', help="print issues as JSON")
+
+    p = sub.add_parser('get', help="print one issue as JSON")
+    p.add_argument('issue_id')
+
+    sub.add_parser('stats', help="issue counts per state and the watermark")
+    return parser
+
+
+def run(args) -> int:
+    mirror = open_mirror(args.root)
+    root = os.path.dirname(os.path.dirname(mirror.path))
+    project = args.project if args.project is not None else configured_project(root)
+    command = args.command
+
+    if command == 'watermark':
+        print(mirror.watermark(project) or '')
+    elif command == 'ingest':
+        try:
+            if args.file == '-':
+                data = json.load(sys.stdin)
+            else:
+                with open(args.file) as f:
+                    data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[yux-linear] cannot read {args.file}: {e}", file=sys.stderr)
+            return 1
+        written = mirror.ingest(data, project)
+        print(f"{written} issues stored, watermark {mirror.watermark(project) or '-'}")
+    elif command == 'sync':
+        written = mirror.sync_graphql(args.endpoint, os.environ.get('LINEAR_API_KEY'),
+                                      project, full=args.full, timeout=args.timeout)
+        print(f"{written} issues stored, watermark {mirror.watermark(project) or '-'}")
+    elif command == 'query':
+        try:
+            priorities = [int(p) for p in split_list(args.priority)]
+        except ValueError:
+            print("--priority takes numbers (1 urgent .. 4 low, 0 none)", file=sys.stderr)
+            return 1
+        issues = mirror.query(project=project or None, states=split_list(args.state),
+                              assignee=args.assignee, priorities=priorities,
+                              cycle=args.cycle, labels=split_list(args.label),
+                              text=args.text, include_archived=args.archived,
+                              limit=args.limit)
+        if args.json:
+            print_json(issues)
+        else:
+            print_table(issues)
+    elif command == 'get':
+        issue = mirror.get(args.issue_id)
+        if issue is None:
+            return 1
+        print_json(issue)
+    elif command == 'stats':
+        print_json(mirror.stats(project or None))
+    return 0
+
+
+def main():
+    args = build_parser().parse_args()
+    try:
+        sys.exit(run(args))
+    except MirrorError as e:
+        print(f"[yux-linear] {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
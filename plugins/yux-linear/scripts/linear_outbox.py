@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Queue, inspect and flush pending Linear updates (.claude/linear-outbox.jsonl).
+
+Usage:
+  linear_outbox.py add <ISSUE_ID> --key KEY [--state S] [--note TEXT] [--kind K]
+  linear_outbox.py pending [--json]
+  linear_outbox.py flush [--issue ISSUE_ID] [--json]
+  linear_outbox.py ack <KEY>...
+  linear_outbox.py drop <ISSUE_ID>
+  linear_outbox.py stats
+
+Hooks and skills `add` status changes and notes; the same --key twice is
+queued once. `flush` coalesces what is pending into one batch per issue
+(latest status, merged notes, see _outbox.py) and prints it; post each
+batch, then `ack` its key:
+
+  1. retry: true  -> mcp__linear__list_comments(issueId); skip the comment
+                     if one already contains the batch marker
+  2. state        -> mcp__linear__update_issue(id, state)
+  3. comment      -> mcp__linear__create_comment(issueId, body: comment)
+  4. linear_outbox.py ack <key>
+
+An unacknowledged batch is returned again by the next flush with the same
+key and comment. `drop` discards everything queued for an issue. All
+commands accept --root (main repo root, default: detected from cwd).
+
+Exit codes:
+  0 - Success (flush: also when there is nothing to post)
+  1 - Unknown batch key or invalid arguments
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _outbox import open_outbox
+
+
+def print_json(data) -> None:
+    print(json.dumps(data, indent=2, ensure_ascii=False))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Outbox of pending Linear updates")
+    parser.add_argument('--root', help="main repo root (default: detected from cwd)")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('add', help="queue a status change and/or a note")
+    p.add_argument('issue_id')
+    p.add_argument('--key', required=True, help="idempotency key (e.g. commit:<sha>)")
+    p.add_argument('--state', help="target state, e.g. 'In Review'")
+    p.add_argument('--note', help="comment text")
+    p.add_argument('--kind', default='note',
+                   help="note kind; only the newest 'progress' note is kept")
+
+    p = sub.add_parser('pending', help="coalesced updates not yet flushed")
+    p.add_argument('--json', action='store_true')
+
+    p = sub.add_parser('flush', help="claim pending updates as batches and print them")
+    p.add_argument('--issue', help="only this issue")
+    p.add_argument('--json', action='store_true')
+
+    p = sub.add_parser('ack', help="mark batches as posted")
+    p.add_argument('keys', nargs='+')
+
+    p = sub.add_parser('drop', help="discard everything queued for an issue")
+    p.add_argument('issue_id')
+
+    sub.add_parser('stats', help="pending entries, open batches and file size")
+    return parser
+
+
+def run(args) -> int:
+    outbox = open_outbox(args.root)
+    command = args.command
+
+    if command == 'add':
+        if not args.state and not args.note:
+            print("[yux-linear] add needs --state or --note", file=sys.stderr)
+            return 1
+        outbox.add(args.issue_id.upper(), args.key, state=args.state, note=args.note,
+                   kind=args.kind)
+    elif command == 'pending':
+        pending = outbox.pending()
+        if args.json:
+            print_json(pending)
+            return 0
+        if not pending:
+            print("Nothing pending.")
+        for issue, update in pending.items():
+            state = f" -> {update['state']}" if update['state'] else ''
+            comment = ', comment' if update['comment'] else ''
+            print(f"{issue:<9s} {update['entries']} queued{state}{comment}")
+    elif command == 'flush':
+        batches = outbox.flush(args.issue.upper() if args.issue else None)
+        if args.json:
+            print_json(batches)
+            return 0
+        if not batches:
+            print("Nothing to post.")
+        for batch in batches:
+            retry = ' (retry: check comments for the marker first)' if batch['retry'] else ''
+            print(f"{batch['issue']}  key {batch['key']}{retry}")
+            if batch['state']:
+                print(f"  state -> {batch['state']}")
+            if batch['comment']:
+                print('  comment:\n' + '\n'.join('    ' + line
+                                                 for line in batch['comment'].splitlines()))
+    elif command == 'ack':
+        acked = outbox.ack(args.keys)
+        if acked < len(args.keys):
+            print(f"[yux-linear] {len(args.keys) - acked} unknown or already acked batch key(s)",
+                  file=sys.stderr)
+            return 1
+    elif command == 'drop':
+        print(f"Dropped {outbox.drop(args.issue_id.upper())} queued updates")
+    elif command == 'stats':
+        print_json(outbox.stats())
+    return 0
+
+
+def main():
+    sys.exit(run(build_parser().parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Read and update the shared task registry (.claude/linear-tasks.json).
+
+Skills call this instead of editing the registry file by hand: every write
+is locked and atomic, so parallel worktree sessions never lose updates.
+
+Usage:
+  linear_tasks.py get <ISSUE_ID> | --branch <BRANCH>
+  linear_tasks.py list [--json]
+  linear_tasks.py add <ISSUE_ID> --uuid U --title T --branch B [--linear-status S] [--no-activate]
+  linear_tasks.py update <ISSUE_ID> [--status S] [--linear-status S] [--pr N] [--title T] [--branch B]
+  linear_tasks.py touch <ISSUE_ID>
+  linear_tasks.py activate <ISSUE_ID>
+  linear_tasks.py remove <ISSUE_ID>
+  linear_tasks.py export [--output FILE]
+  linear_tasks.py import <FILE>
+
+All commands accept --root (main repo root, default: detected from cwd) and
+--backend json|sqlite (default: linear-config.json "registry.backend").
+
+Exit codes:
+  0 - Success
+  1 - Unknown task or invalid update
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _task_registry import BACKENDS, STATUSES, RegistryError, open_registry
+
+
+def print_json(data) -> None:
+    print(json.dumps(data, indent=2, ensure_ascii=False))
+
+
+def print_table(registry) -> None:
+    tasks = registry.tasks()
+    if not tasks:
+        print("No active tasks.")
+        return
+    active = registry.active_task()
+    for tid, task in sorted(tasks.items(), key=lambda kv: kv[1].get('last_active_at') or '',
+                            reverse=True):
+        marker = '*' if tid == active else ' '
+        pr_info = f"  PR #{task['pr_number']}" if task.get('pr_number') else ""
+        status = task.get('linear_status') or task.get('status', '?')
+        print(f"{marker} {tid:<9s} {task.get('branch', '?'):<40s} {status}{pr_info}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Linear task registry")
+    parser.add_argument('--root', help="main repo root (default: detected from cwd)")
+    parser.add_argument('--backend', choices=sorted(BACKENDS))
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('get', help="print one task as JSON")
+    p.add_argument('issue_id', nargs='?')
+    p.add_argument('--branch')
+
+    p = sub.add_parser('list', help="list tasks, most recently active first")
+    p.add_argument('--json', action='store_true', help="print the task map as JSON")
+
+    p = sub.add_parser('add', help="register a task")
+    p.add_argument('issue_id')
+    p.add_argument('--uuid', required=True)
+    p.add_argument('--title', required=True)
+    p.add_argument('--branch', required=True)
+    p.add_argument('--status', choices=STATUSES, default='in_progress')
+    p.add_argument('--linear-status')
+    p.add_argument('--pr', type=int)
+    p.add_argument('--no-activate', action='store_true')
+
+    p = sub.add_parser('update', help="set fields of a task and bump last_active_at")
+    p.add_argument('issue_id')
+    p.add_argument('--status', choices=STATUSES)
+    p.add_argument('--linear-status')
+    p.add_argument('--pr', type=int)
+    p.add_argument('--title')
+    p.add_argument('--branch')
+    p.add_argument('--no-touch', action='store_true', help="keep last_active_at")
+
+    for name, text in (('touch', "bump last_active_at"),
+                       ('activate', "make the task the active one"),
+                       ('remove', "drop a task and re-pick the active one")):
+        sub.add_parser(name, help=text).add_argument('issue_id')
+
+    p = sub.add_parser('export', help="write the registry as linear-tasks.json")
+    p.add_argument('--output', help="file to write (default: stdout)")
+
+    p = sub.add_parser('import', help="replace the registry with a linear-tasks.json document")
+    p.add_argument('file')
+    return parser
+
+
+def run(args) -> int:
+    registry = open_registry(args.root, args.backend)
+    command = args.command
+
+    if command == 'get':
+        if args.branch:
+            task = registry.find_by_branch(args.branch)
+        elif args.issue_id:
+            task = registry.get(args.issue_id.upper())
+        else:
+            print("get needs an issue id or --branch", file=sys.stderr)
+            return 1
+        if task is None:
+            return 1
+        print_json(task)
+    elif command == 'list':
+        if args.json:
+            print_json(registry.tasks())
+        else:
+            print_table(registry)
+    elif command == 'add':
+        task = {'issue_id': args.issue_id.upper(), 'issue_uuid': args.uuid,
+                'title': args.title, 'branch': args.branch, 'status': args.status,
+                'pr_number': args.pr}
+        if args.linear_status:
+            task['linear_status'] = args.linear_status
+        print_json(registry.add(task, activate=not args.no_activate))
+    elif command == 'update':
+        fields = {'status': args.status, 'linear_status': args.linear_status,
+                  'pr_number': args.pr, 'title': args.title, 'branch': args.branch}
+        fields = {k: v for k, v in fields.items() if v is not None}
+        print_json(registry.update(args.issue_id.upper(), touch=not args.no_touch, **fields))
+    elif command == 'touch':
+        registry.touch(args.issue_id.upper())
+    elif command == 'activate':
+        registry.set_active(args.issue_id.upper())
+    elif command == 'remove':
+        active = registry.remove(args.issue_id.upper())
+        print(f"Active task: {active or 'none'}")
+    elif command == 'export':
+        doc = registry.export()
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(doc, f, indent=2, ensure_ascii=False)
+                f.write('\n')
+        else:
+            print_json(doc)
+    elif command == 'import':
+        with open(args.file) as f:
+            doc = json.load(f)
+        if not isinstance(doc, dict) or not isinstance(doc.get('tasks'), dict):
+            print(f"{args.file}: not a linear-tasks.json document", file=sys.stderr)
+            return 1
+        registry.replace_document(doc)
+    return 0
+
+
+def main():
+    args = build_parser().parse_args()
+    try:
+        sys.exit(run(args))
+    except RegistryError as e:
+        print(f"[yux-linear] {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
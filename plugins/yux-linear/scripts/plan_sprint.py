@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Scope a sprint from a dump of Linear issues: score them, size them, and
+pick the dependency-respecting set with the highest total score that fits
+the capacity (see _sprint_solver.py).
+
+Usage:
+  plan_sprint.py issues.json --days 10 [--buffer 0.2] [--velocity-cycles 3] [--json]
+  plan_sprint.py issues.json --capacity 8 --current-cycle ID --previous-cycle ID --cycle-end 2026-03-28
+  ... | plan_sprint.py - [options]
+
+Issues are scored as `score_issues.py --plan` does. Effort comes from the
+issue's effort/size field or its T-shirt estimate (XS/S/M/L/XL, see the
+effort map in yux-pm-plan), else --default-size. An issue is only planned
+together with its open blockers; one whose blocker is open but not in the
+dump cannot be planned and is listed as excluded. Because the plan already
+orders blockers first, the "blocked" penalty is not applied to issues whose
+blockers are all plannable. --deps takes relations from the local
+dependency index (linear_deps.py) instead of the dump.
+
+Capacity is --capacity effective days, or --days business days minus the
+--buffer share. With --velocity-cycles N, --days is instead multiplied by
+the throughput measured over the last N closed cycles (cycle_metrics.py);
+the buffer stays the fallback while no cycle has closed. Must Complete is
+the best part of the plan within --must-fraction of capacity, Should
+Complete the rest of the plan, and Stretch Goals the best extra work for
+--stretch-fraction more capacity.
+
+Exit codes:
+  0 - Success
+  1 - Input could not be read or no capacity given
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _issue_scoring import (
+    ScoringOptions, blockers_of, cycle_id, is_done, issue_key, load_issues, parse_date,
+    score_issues,
+)
+from _sprint_solver import (
+    DEFAULT_DEADLINE, EFFORT_DAYS, UNITS_PER_DAY, Item, days_to_units, effort_days,
+    plan_buckets, size_of, units_to_days,
+)
+
+BUCKET_TITLES = (('must', "Must Complete"), ('should', "Should Complete"),
+                 ('stretch', "Stretch Goals"))
+
+
+def read_input(path: str):
+    if path == '-':
+        return json.load(sys.stdin)
+    with open(path) as f:
+        return json.load(f)
+
+
+def dump_cycle(data, key: str) -> dict | None:
+    cycle = data.get(key) if isinstance(data, dict) else None
+    return cycle if isinstance(cycle, dict) else None
+
+
+def build_items(issues: list[dict], table, default_size: str, graph=None):
+    """(items, sizes by key, done keys) for the open issues."""
+    by_key = dict(zip(table.keys, issues))
+    done = {key for key, issue in by_key.items() if is_done(issue)}
+    open_keys = {key for key in by_key if key not in done}
+    items, sizes = [], {}
+    for i, (key, issue) in enumerate(zip(table.keys, issues)):
+        if key not in open_keys:
+            continue
+        if graph is not None and graph.state(key) is not None:
+            blockers = graph.blockers(key)
+        else:
+            blockers = []
+            for ref, embedded in blockers_of(issue):
+                blocker = by_key.get(ref, embedded)
+                blockers.append((ref, blocker is not None and is_done(blocker)))
+        requires = []
+        for ref, ref_done in blockers:
+            if ref_done:
+                done.add(ref)
+            else:
+                requires.append(ref)
+        value = table.scores[i]
+        if requires and all(ref in open_keys for ref in requires):
+            value -= table.columns['blocked'][i]
+        sizes[key] = size_of(issue, default_size)
+        items.append(Item(key, days_to_units(effort_days(sizes[key])), value, requires))
+    return items, sizes, done
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Scope a sprint by score, effort and dependencies")
+    parser.add_argument('input', help="JSON dump of issues ('-' for stdin)")
+    parser.add_argument('--capacity', type=float, help="effective capacity in days")
+    parser.add_argument('--days', type=float, help="business days in the cycle")
+    parser.add_argument('--buffer', type=float, default=0.2, help="buffer share (default 0.2)")
+    parser.add_argument('--velocity-cycles', type=int, metavar='N',
+                        help="size --days by the velocity of the last N closed cycles")
+    parser.add_argument('--must-fraction', type=float, default=0.6)
+    parser.add_argument('--stretch-fraction', type=float, default=0.25)
+    parser.add_argument('--default-size', choices=list(EFFORT_DAYS), default='M',
+                        help="size of issues without an estimate (default M)")
+    parser.add_argument('--deadline', type=float, default=DEFAULT_DEADLINE,
+                        help=f"solver time budget in seconds (default {DEFAULT_DEADLINE})")
+    parser.add_argument('--today', help="date for due-date urgency (YYYY-MM-DD)")
+    parser.add_argument('--current-cycle', help="id of the cycle being planned")
+    parser.add_argument('--previous-cycle', help="previous cycle id (carry-over bonus)")
+    parser.add_argument('--cycle-end', help="end date of the planned cycle")
+    parser.add_argument('--deps', action='store_true',
+                        help="use the local dependency index for relations")
+    parser.add_argument('--json', action='store_true', help="print the plan as JSON")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    if args.capacity is None and args.days is None:
+        print("[yux-linear] give --capacity or --days", file=sys.stderr)
+        sys.exit(1)
+    try:
+        data = read_input(args.input)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[yux-linear] cannot read {args.input}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    current = dump_cycle(data, 'current_cycle')
+    previous = dump_cycle(data, 'previous_cycle')
+    options = ScoringOptions(
+        today=parse_date(args.today),
+        current_cycle=args.current_cycle or cycle_id(current),
+        previous_cycle=args.previous_cycle or cycle_id(previous),
+        cycle_end=parse_date(args.cycle_end or (current or {}).get('endsAt')),
+        plan=True,
+    )
+    issues = load_issues(data)
+    graph = relations = mirror = None
+    if args.deps or (args.velocity_cycles and args.capacity is None):
+        from _issue_mirror import open_mirror
+        mirror = open_mirror()
+    if args.deps:
+        graph = mirror.graph
+        relations = graph.relation_terms([issue_key(issue) for issue in issues])
+    table = score_issues(issues, options, relations)
+    items, sizes, done = build_items(issues, table, args.default_size, graph)
+    by_key = dict(zip(table.keys, issues))
+    values = {item.key: item.value for item in items}
+
+    capacity_days = args.capacity
+    source = ""
+    if capacity_days is None and args.velocity_cycles:
+        suggestion = mirror.cycles.suggest_capacity(args.days, args.velocity_cycles, args.buffer)
+        capacity_days = suggestion['capacity_days']
+        if suggestion['source'] == 'measured':
+            source = (f" ({args.days:g} business days at {suggestion['per_business_day']:g}"
+                      f" done per day over {suggestion['cycles']} cycles)")
+        else:
+            source = (f" ({args.days:g} business days, {args.buffer:.0%} buffer;"
+                      f" no closed cycles yet)")
+    elif capacity_days is None:
+        capacity_days = args.days * (1 - args.buffer)
+        source = f" ({args.days:g} business days, {args.buffer:.0%} buffer)"
+    capacity = int(capacity_days * UNITS_PER_DAY + 1e-9) if capacity_days > 0 else 0
+    buckets = plan_buckets(items, capacity, args.must_fraction, args.stretch_fraction,
+                           done, args.deadline)
+    plan = buckets['plan']
+
+    if args.json:
+        print(json.dumps({
+            "capacity_days": units_to_days(capacity),
+            "planned_days": units_to_days(plan.units),
+            "total_score": plan.value,
+            "exact": plan.exact and buckets['must'].exact,
+            "excluded": plan.excluded,
+            **{name: [{
+                "identifier": key,
+                "title": by_key[key].get('title', ''),
+                "size": sizes[key],
+                "days": effort_days(sizes[key]),
+                "score": values[key],
+            } for key in buckets[name].keys] for name, _ in BUCKET_TITLES},
+        }, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Capacity: {units_to_days(capacity):g} effective days{source}")
+    print(f"Planned: {units_to_days(plan.units):g} days, total score {plan.value}"
+          f"{'' if plan.exact else ' (heuristic)'}")
+    for name, title in BUCKET_TITLES:
+        bucket = buckets[name]
+        print(f"\n{title} ({units_to_days(bucket.units):g} days):")
+        if not bucket.keys:
+            print("  -")
+        for key in bucket.keys:
+            size = sizes[key] if isinstance(sizes[key], str) else f"{sizes[key]:g}d"
+            print(f"  {key:<9s} [{size}] {by_key[key].get('title', '')[:40]:<40s} "
+                  f"score: {values[key]}")
+    if plan.excluded:
+        shown = ', '.join(plan.excluded[:10])
+        more = f" and {len(plan.excluded) - 10} more" if len(plan.excluded) > 10 else ""
+        print(f"\nNot plannable (open blockers outside the backlog): {shown}{more}")
+
+
+if __name__ == "__main__":
+    main()
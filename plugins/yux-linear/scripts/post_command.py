@@ -3,7 +3,13 @@
 Post-command hook to detect PR/merge operations and remind about Linear status updates.
 
 This hook analyzes the output of gh commands and provides guidance
-for updating Linear issue status accordingly.
+for updating Linear issue status accordingly. Commands are recognised per
+simple command of the Bash line (see _shell_tokens.py), not by substring.
+
+The status change (In Review, Done) and the PR link are queued in the
+Linear outbox (_outbox.py) rather than requested as separate calls; the
+skills flush it once per issue. Keys name the issue and PR, so the entries
+the skills queue for the same event are not queued twice.
 
 Exit codes:
   0 - Always allow (this is informational only)
@@ -12,27 +18,10 @@ Exit codes:
 import json
 import os
 import re
-import subprocess
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from _linear_guard import is_linear_project
-
-
-def get_current_branch() -> str | None:
-    """Get the current git branch name."""
-    try:
-        result = subprocess.run(
-            ['git', 'branch', '--show-current'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
-    return None
+from _hook_context import HookContext
 
 
 def extract_linear_id(branch: str) -> str | None:
@@ -43,9 +32,22 @@ def extract_linear_id(branch: str) -> str | None:
     return None
 
 
-def detect_pr_create(command: str, output: str) -> dict | None:
+def ran(segments: list, *words: str) -> bool:
+    """True when a segment runs `gh <words>` or, for words[0] == 'git', `git <words[1]>`."""
+    from _shell_tokens import gh_call, git_call
+    for seg in segments:
+        if words[0] == 'git':
+            call = git_call(seg)
+            if call and call[0] == words[1]:
+                return True
+        elif gh_call(seg)[:len(words) - 1] == list(words[1:]):
+            return True
+    return False
+
+
+def detect_pr_create(segments: list, output: str) -> dict | None:
     """Detect if a PR was created and extract info."""
-    if 'gh pr create' not in command:
+    if not ran(segments, 'gh', 'pr', 'create'):
         return None
 
     # Extract PR URL from output
@@ -61,9 +63,9 @@ def detect_pr_create(command: str, output: str) -> dict | None:
     return None
 
 
-def detect_pr_merge(command: str, output: str) -> dict | None:
+def detect_pr_merge(segments: list, output: str) -> dict | None:
     """Detect if a PR was merged."""
-    if 'gh pr merge' not in command:
+    if not ran(segments, 'gh', 'pr', 'merge'):
         return None
 
     # Check for successful merge indicators
@@ -74,9 +76,9 @@ def detect_pr_merge(command: str, output: str) -> dict | None:
     return None
 
 
-def detect_git_push(command: str, output: str) -> dict | None:
+def detect_git_push(segments: list, output: str) -> dict | None:
     """Detect git push operations."""
-    if 'git push' not in command:
+    if not ran(segments, 'git', 'push'):
         return None
 
     return {
@@ -84,61 +86,97 @@ def detect_git_push(command: str, output: str) -> dict | None:
     }
 
 
-def main():
-    # Read input from stdin (PostToolUse payload)
+def queue_update(ctx: HookContext, issue_id: str, key: str, state: str,
+                 note: str | None = None) -> bool:
+    """Queue a status change (and note) in the outbox; False if it cannot be written."""
+    from _outbox import Outbox
     try:
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError:
-        sys.exit(0)
+        Outbox(os.path.join(ctx.repo_root or os.getcwd(), '.claude')).add(
+            issue_id, key, state=state, note=note)
+    except OSError:
+        return False
+    return True
+
+
+def flush_hint(issue_id: str) -> str:
+    return (f"Queued in the Linear outbox; post it with "
+            f"`linear_outbox.py flush --issue {issue_id}` (then `ack` the batch key).")
+
 
+def check(ctx: HookContext) -> int:
+    """Recommend Linear status updates after gh/git commands."""
     # Skip if not a Linear-active project
-    if not is_linear_project():
-        sys.exit(0)
+    if not ctx.linear_active:
+        return 0
 
-    tool_name = input_data.get("tool_name", "")
+    # PostToolUse payload
+    input_data = ctx.payload
+    if input_data is None:
+        return 0
 
     # Only process Bash commands
-    if tool_name != "Bash":
-        sys.exit(0)
+    if ctx.tool_name != "Bash":
+        return 0
 
     command = input_data.get("tool_input", {}).get("command", "")
     output = input_data.get("tool_output", {}).get("stdout", "")
 
+    # Nothing to detect without gh or git; otherwise split the command so
+    # quoted text (`echo "gh pr create"`) does not count as running it
+    if 'gh' not in command and 'git' not in command:
+        return 0
+    from _proc import alarm
+    from _shell_tokens import gh_call, git_call, split_commands
+    # A huge command is skipped at the deadline rather than killed; only
+    # gh/git segments are kept, so the detectors below scan a handful
+    with alarm():
+        segments = [seg for seg in split_commands(command) if git_call(seg) or gh_call(seg)]
+
     # Get branch and Linear ID
-    branch = get_current_branch()
+    branch = ctx.branch
     issue_id = extract_linear_id(branch) if branch else None
 
     # Detect command type
     result = None
 
-    if pr_info := detect_pr_create(command, output):
+    if pr_info := detect_pr_create(segments, output):
         result = pr_info
         result["recommendation"] = (
             f"PR #{pr_info['pr_number']} created!\n"
             f"URL: {pr_info['pr_url']}\n"
         )
         if issue_id:
+            queued = queue_update(ctx, issue_id, f"pr-created:{issue_id}:{pr_info['pr_number']}",
+                                  "In Review", f"PR created: {pr_info['pr_url']}")
             result["recommendation"] += (
                 f"\n📋 Update Linear issue {issue_id}:\n"
                 f"  - Status → In Review\n"
                 f"  - Add PR link as comment\n"
+                + (flush_hint(issue_id) + "\n" if queued else "") +
                 f"Use /yux-linear-status to monitor CI."
             )
             result["issue_id"] = issue_id
+            result["queued"] = queued
 
-    elif merge_info := detect_pr_merge(command, output):
+    elif merge_info := detect_pr_merge(segments, output):
         result = merge_info
         result["recommendation"] = "PR merged successfully!\n"
         if issue_id:
+            number = re.search(r'#(\d+)', output)
+            queued = queue_update(ctx, issue_id,
+                                  f"merged:{issue_id}:{number.group(1) if number else branch}",
+                                  "Done")
             result["recommendation"] += (
                 f"\n✅ Complete Linear workflow for {issue_id}:\n"
                 f"  - Status → Done\n"
                 f"  - Add completion comment\n"
                 f"  - Delete local branch: git branch -d {branch}"
+                + ("\n" + flush_hint(issue_id) if queued else "")
             )
             result["issue_id"] = issue_id
+            result["queued"] = queued
 
-    elif push_info := detect_git_push(command, output):
+    elif push_info := detect_git_push(segments, output):
         result = push_info
         if issue_id:
             result["recommendation"] = (
@@ -151,7 +189,11 @@ def main():
     if result:
         print(json.dumps(result, indent=2))
 
-    sys.exit(0)
+    return 0
+
+
+def main():
+    sys.exit(check(HookContext('PostToolUse')))
 
 
 if __name__ == "__main__":
@@ -13,19 +13,24 @@ import os
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from _linear_guard import is_linear_project
+from _hook_context import HookContext
 
 
-def main():
-    if not is_linear_project():
-        sys.exit(0)
+def check(ctx: HookContext) -> int:
+    """Remind Claude to post progress before compaction."""
+    if not ctx.linear_active:
+        return 0
 
     print(
-        "If the sync_progress script returned an issue_id, consider posting "
-        "a progress summary to Linear using mcp__linear__create_comment "
-        "before context compaction."
+        "If the sync_progress script returned an issue_id without \"queued\": true, "
+        "consider posting a progress summary to Linear using mcp__linear__create_comment "
+        "before context compaction. Queued notes are posted by the next outbox flush."
     )
-    sys.exit(0)
+    return 0
+
+
+def main():
+    sys.exit(check(HookContext('PreCompact')))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Rank a dump of Linear issues with the scoring in references/issue-scoring.md.
+
+Usage:
+  score_issues.py issues.json [--top 10] [--explain] [--json]
+  score_issues.py issues.json --plan --current-cycle ID --previous-cycle ID --cycle-end 2026-03-28
+  ... | score_issues.py - [options]
+
+The input is a list of issues, {"issues": [...]}, or a GraphQL response.
+A top-level "current_cycle" / "previous_cycle" object ({"id", "endsAt"})
+in the dump is used when the matching option is not given.
+
+--plan adds the yux-pm-plan bonuses; --explain prints each issue's
+per-term breakdown; --today pins the date used for due-date urgency.
+--deps takes blockers, dependents and parent epics from the local
+dependency index (linear_deps.py) instead of the relations in the dump.
+
+Exit codes:
+  0 - Success
+  1 - Input could not be read
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _issue_scoring import (
+    ScoringOptions, cycle_id, issue_key, load_issues, parse_date, priority_of, score_issues,
+    state_of,
+)
+
+PRIORITY_LABELS = {0: '-', 1: 'Urgent', 2: 'High', 3: 'Medium', 4: 'Low'}
+
+
+def read_input(path: str):
+    if path == '-':
+        return json.load(sys.stdin)
+    with open(path) as f:
+        return json.load(f)
+
+
+def dump_cycle(data, key: str) -> dict | None:
+    cycle = data.get(key) if isinstance(data, dict) else None
+    return cycle if isinstance(cycle, dict) else None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Rank Linear issues by score")
+    parser.add_argument('input', help="JSON dump of issues ('-' for stdin)")
+    parser.add_argument('--top', type=int, default=10, help="issues to show (default 10)")
+    parser.add_argument('--all', action='store_true', help="show every issue")
+    parser.add_argument('--plan', action='store_true', help="add yux-pm-plan bonuses")
+    parser.add_argument('--today', help="date for due-date urgency (YYYY-MM-DD)")
+    parser.add_argument('--current-cycle', help="current cycle id")
+    parser.add_argument('--previous-cycle', help="previous cycle id (carry-over bonus)")
+    parser.add_argument('--cycle-end', help="end date of the planned cycle")
+    parser.add_argument('--deps', action='store_true',
+                        help="use the local dependency index for relation terms")
+    parser.add_argument('--explain', action='store_true', help="print per-term breakdown")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    try:
+        data = read_input(args.input)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[yux-linear] cannot read {args.input}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    current = dump_cycle(data, 'current_cycle')
+    previous = dump_cycle(data, 'previous_cycle')
+    cycle_end = args.cycle_end or (current or {}).get('endsAt')
+    options = ScoringOptions(
+        today=parse_date(args.today),
+        current_cycle=args.current_cycle or cycle_id(current),
+        previous_cycle=args.previous_cycle or cycle_id(previous),
+        cycle_end=parse_date(cycle_end),
+        plan=args.plan,
+    )
+    issues = load_issues(data)
+    relations = None
+    if args.deps:
+        from _issue_mirror import open_mirror
+        mirror = open_mirror()
+        relations = mirror.graph.relation_terms([issue_key(issue) for issue in issues])
+        mirror.close()
+    table = score_issues(issues, options, relations)
+    ranked = table.top(None if args.all else max(args.top, 0))
+
+    if args.json:
+        print(json.dumps([{
+            "identifier": table.keys[i],
+            "title": issues[i].get('title', ''),
+            "score": table.scores[i],
+            "breakdown": dict(table.breakdown(i)),
+        } for i in ranked], indent=2, ensure_ascii=False))
+        return
+
+    print(f"{len(issues)} issues scored{' (plan bonuses)' if args.plan else ''}")
+    for i in ranked:
+        issue = issues[i]
+        priority = PRIORITY_LABELS.get(priority_of(issue), '-')
+        status = state_of(issue)[0].title() or '-'
+        print(f"  {table.keys[i]:<9s} {table.scores[i]:>5d}  {priority:<7s} {status:<12s} "
+              f"{issue.get('title', '')[:50]}")
+        if args.explain:
+            terms = ', '.join(f"{term} {points:+d}" for term, points in table.breakdown(i))
+            print(f"            {terms or 'no scoring terms'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,29 +8,22 @@ Usage in settings.json:
 
 Receives JSON on stdin from Claude Code with session data.
 Outputs one line of text to display in the status bar.
+
+The rendered line is cached per cwd in the runtime directory, keyed by
+branch and the mtime/size of both .claude JSON files, so an unchanged
+refresh costs two stats and one small read instead of a repo lookup and
+two JSON parses.
 """
 
 import json
 import os
 import re
-import subprocess
 import sys
 
-
-def get_main_repo_root(cwd=None):
-    """Get main repo root, even when inside a worktree."""
-    try:
-        result = subprocess.run(
-            ['git', 'rev-parse', '--git-common-dir'],
-            capture_output=True, text=True, timeout=3,
-            cwd=cwd
-        )
-        if result.returncode == 0:
-            git_common = os.path.abspath(os.path.join(cwd or '.', result.stdout.strip()))
-            return os.path.dirname(git_common)
-    except Exception:
-        pass
-    return None
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _git_state import get_main_repo_root
+from _runtime import repo_key, runtime_dir
+from _task_registry import DB_FILE, TASKS_FILE, open_registry
 
 
 def get_branch(session_data):
@@ -60,28 +53,62 @@ def read_json_file(path):
         return None
 
 
-def main():
-    # Read session data from stdin
+def file_stamp(path):
+    """(mtime_ns, size) of a file, or None if it does not exist."""
     try:
-        session_data = json.loads(sys.stdin.read())
-    except Exception:
-        session_data = {}
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
 
-    cwd = session_data.get('cwd', None)
-    branch = get_branch(session_data)
-    linear_id = extract_linear_id(branch)
-    repo_root = get_main_repo_root(cwd)
 
-    if not linear_id or not repo_root:
-        # No Linear task — show minimal info
-        display_branch = branch if branch else 'unknown'
-        print(f"No Linear task · {display_branch}")
-        return
+def data_stamp(repo_root):
+    """Stamps of the config and of every task registry backend's files."""
+    claude_dir = os.path.join(repo_root, '.claude')
+    names = ('linear-config.json', TASKS_FILE, DB_FILE, DB_FILE + '-wal')
+    return [file_stamp(os.path.join(claude_dir, name)) for name in names]
 
-    # Read task details
-    tasks_file = os.path.join(repo_root, '.claude', 'linear-tasks.json')
-    tasks_data = read_json_file(tasks_file)
 
+def cache_path(cwd):
+    """Render cache file for one working directory."""
+    try:
+        return os.path.join(runtime_dir(), f'statusline-{repo_key(cwd)}.json')
+    except OSError:
+        return None
+
+
+def load_cached_line(path, cwd, branch):
+    """Return (line, repo_root) from the cache; line is None on a miss."""
+    entry = read_json_file(path) if path else None
+    if not isinstance(entry, dict) or entry.get('cwd') != cwd:
+        return None, None
+    repo_root = entry.get('repo_root')
+    if not repo_root or not os.path.isdir(repo_root):
+        return None, None
+    if entry.get('branch') == branch and entry.get('stamp') == data_stamp(repo_root):
+        return entry.get('line'), repo_root
+    # Branch or data changed, but the cwd still maps to the same repo
+    return None, repo_root
+
+
+def save_cached_line(path, cwd, branch, repo_root, stamp, line):
+    """Write the cache entry atomically; failures are ignored."""
+    entry = {'cwd': cwd, 'branch': branch, 'repo_root': repo_root,
+             'stamp': stamp, 'line': line}
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def render(repo_root, branch, linear_id):
+    """Build the status line for a LIN-xxx branch."""
     # Read project config
     config_file = os.path.join(repo_root, '.claude', 'linear-config.json')
     config_data = read_json_file(config_file)
@@ -102,9 +129,7 @@ def main():
                 project_name = config_data.get('team_name', '')
 
     # Find task info
-    task = None
-    if tasks_data and isinstance(tasks_data.get('tasks'), dict):
-        task = tasks_data['tasks'].get(linear_id)
+    task = open_registry(repo_root).get(linear_id)
 
     if task:
         title = task.get('title', '')
@@ -116,14 +141,52 @@ def main():
             parts.append(f"PR #{pr}")
         if project_name:
             parts.append(project_name)
-
-        print(' · '.join(parts))
     else:
         # Branch has LIN-xxx but no task in tasks.json
         parts = [linear_id, branch]
         if project_name:
             parts.append(project_name)
-        print(' · '.join(parts))
+    return ' · '.join(parts)
+
+
+def main():
+    # Read session data from stdin
+    try:
+        session_data = json.loads(sys.stdin.read())
+    except Exception:
+        session_data = {}
+    if not isinstance(session_data, dict):
+        session_data = {}
+
+    cwd = session_data.get('cwd', None)
+    branch = get_branch(session_data)
+    linear_id = extract_linear_id(branch)
+
+    if not linear_id:
+        # No Linear task — show minimal info
+        display_branch = branch if branch else 'unknown'
+        print(f"No Linear task · {display_branch}")
+        return
+
+    cwd = os.path.abspath(cwd or os.getcwd())
+    path = cache_path(cwd)
+    line, repo_root = load_cached_line(path, cwd, branch)
+    if line is not None:
+        print(line)
+        return
+
+    if not repo_root:
+        repo_root = get_main_repo_root(cwd)
+    if not repo_root:
+        print(f"No Linear task · {branch}")
+        return
+
+    # Stamp before reading, so a write racing with the render invalidates it
+    stamp = data_stamp(repo_root)
+    line = render(repo_root, branch, linear_id)
+    if path:
+        save_cached_line(path, cwd, branch, repo_root, stamp, line)
+    print(line)
 
 
 if __name__ == '__main__':
@@ -5,6 +5,21 @@ Sync progress to Linear before context compaction.
 This hook extracts the Linear issue ID from the current branch and
 outputs a JSON instruction for Claude to post a progress summary.
 
+Progress (commit count, recent subjects and diffstat totals against the
+base branch) comes from one `git log --shortstat` stream and is cached per
+branch in .claude/linear-progress.json, keyed by base, base sha and HEAD.
+A repeated compaction on an unchanged branch runs no git command at all;
+new commits on top of the snapshot are walked incrementally. When the
+hook's time budget (see _proc.py) is nearly used up, the walk is skipped
+and the last snapshot, if any, is reported as "partial".
+
+The progress note is queued in the Linear outbox (_outbox.py) under a key
+of the issue and HEAD, replacing any older progress note still pending,
+and is posted with the issue's next flush instead of as its own comment.
+
+The base is `base_branch` from linear-config.json, else the first of
+main/master/develop that exists.
+
 Exit codes:
   0 - Always allow (this is informational only)
 """
@@ -14,111 +29,294 @@ import os
 import re
 import subprocess
 import sys
+import time
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from _linear_guard import is_linear_project
+import _trace
+from _git_state import branch_sha, find_git_dir, resolve_ref
+from _hook_context import HookContext
+from _linear_guard import linear_id_re
+from _proc import DeadlineExceeded, alarm, clamp, has_budget, label, popen
 
+BASE_CANDIDATES = ['main', 'master', 'develop']
+SNAPSHOT_FILE = 'linear-progress.json'
+MAX_SNAPSHOTS = 50
+RECENT_COUNT = 5
+GIT_TIMEOUT = 5
 
-def get_current_branch() -> str | None:
-    """Get the current git branch name."""
-    try:
-        result = subprocess.run(
-            ['git', 'branch', '--show-current'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
-    return None
+SHORTSTAT_RE = re.compile(
+    r'(\d+) files? changed(?:, (\d+) insertions?\(\+\))?(?:, (\d+) deletions?\(-\))?'
+)
 
 
 def extract_linear_id(branch: str) -> str | None:
     """Extract Linear issue ID from branch name (e.g., LIN-123)."""
-    match = re.search(r'(LIN-\d+)', branch, re.IGNORECASE)
+    match = linear_id_re().search(branch)
     if match:
-        return match.group(1).upper()
+        return match.group(0).upper()
     return None
 
 
-def get_commit_count(base_branch: str = 'main') -> int:
-    """Get number of commits on current branch since diverging from base."""
+def read_json(path: str):
     try:
-        result = subprocess.run(
-            ['git', 'rev-list', '--count', f'{base_branch}..HEAD'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            return int(result.stdout.strip())
-    except (subprocess.TimeoutExpired, FileNotFoundError, ValueError):
-        pass
-    return 0
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
 
+def resolve_base_branch(repo_root: str, git_dir: str) -> tuple[str | None, str | None]:
+    """Base branch and its sha: linear-config.json `base_branch`, else the
+    first of BASE_CANDIDATES that exists locally."""
+    config = read_json(os.path.join(repo_root, '.claude', 'linear-config.json'))
+    configured = config.get('base_branch') if isinstance(config, dict) else None
+    candidates = BASE_CANDIDATES
+    if isinstance(configured, str) and configured:
+        candidates = [configured] + BASE_CANDIDATES
+    for name in candidates:
+        sha = branch_sha(git_dir, name)
+        if sha:
+            return name, sha
+    return None, None
 
-def get_recent_commits(count: int = 5) -> list[str]:
-    """Get recent commit messages."""
+
+def walk_log(rev_args: list[str], boundary: bool = False) -> dict | None:
+    """Stream `git log --shortstat` once: commit count, newest subjects,
+    diffstat totals and (with boundary) the boundary commits."""
+    cmd = ['git', 'log', '--shortstat', '--no-color', '--format=%x1e%m%x1f%H%x1f%s']
+    if boundary:
+        cmd.append('--boundary')
+    with _trace.span(label(cmd)):
+        try:
+            return _walk_log(cmd + rev_args)
+        except DeadlineExceeded:
+            return None
+
+
+def _walk_log(cmd: list[str]) -> dict | None:
     try:
-        result = subprocess.run(
-            ['git', 'log', f'-{count}', '--pretty=format:%s'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            return result.stdout.strip().split('\n')
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
-    return []
+        timeout = clamp(GIT_TIMEOUT)
+        proc = popen(cmd, stdout=subprocess.PIPE,
+                     stderr=subprocess.DEVNULL, text=True, errors='replace')
+    except OSError:
+        return None
 
+    deadline = time.monotonic() + timeout
+    result = {"count": 0, "subjects": [], "files": 0, "insertions": 0,
+              "deletions": 0, "boundary": []}
+    in_boundary = False
+    # alarm() ends a read that blocks past the deadline (git stuck on I/O)
+    with proc, alarm(proc):
+        for line in proc.stdout:
+            if line.startswith('\x1e'):
+                mark, _, rest = line[1:].rstrip('\n').partition('\x1f')
+                sha, _, subject = rest.partition('\x1f')
+                in_boundary = mark == '-'
+                if in_boundary:
+                    result["boundary"].append(sha)
+                else:
+                    result["count"] += 1
+                    if len(result["subjects"]) < RECENT_COUNT:
+                        result["subjects"].append(subject)
+            elif not in_boundary and (stat := SHORTSTAT_RE.search(line)):
+                result["files"] += int(stat.group(1))
+                result["insertions"] += int(stat.group(2) or 0)
+                result["deletions"] += int(stat.group(3) or 0)
+            if time.monotonic() > deadline:
+                proc.kill()
+                return None
+    if proc.returncode != 0:
+        return None
+    return result
 
-def main():
-    # Read input from stdin (PreCompact payload)
+
+def load_snapshots(path: str) -> dict:
+    data = read_json(path)
+    return data if isinstance(data, dict) else {}
+
+
+def save_snapshots(path: str, snapshots: dict) -> None:
+    """Write the snapshot cache atomically, keeping the newest entries."""
+    if len(snapshots) > MAX_SNAPSHOTS:
+        newest = sorted(snapshots, key=lambda b: snapshots[b].get('updated', 0), reverse=True)
+        snapshots = {b: snapshots[b] for b in newest[:MAX_SNAPSHOTS]}
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, 'w') as f:
+            json.dump(snapshots, f, indent=2)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def partial_progress(base: str, snap: dict | None) -> dict:
+    """What is known without walking: the older snapshot, or nothing."""
+    if snap:
+        return dict(snap, partial=True)
+    return {"base": base, "commit_count": None, "recent_commits": [], "diffstat": None,
+            "partial": True}
+
+
+def get_progress(repo_root: str, branch: str) -> dict:
+    """Progress of branch against its base, reusing the cached snapshot.
+
+    Unchanged HEAD: no git call. HEAD moved forward: only the new commits
+    are walked. Otherwise (rebase, base moved, no snapshot): one full walk.
+    """
+    git_dir = find_git_dir()
+    head = resolve_ref(git_dir, 'HEAD') if git_dir else None
+    base, base_sha = resolve_base_branch(repo_root, git_dir) if git_dir else (None, None)
+    if not head or not base:
+        walked = (walk_log([f'-{RECENT_COUNT}', 'HEAD']) if has_budget() else None) or {}
+        return {"base": base, "commit_count": 0,
+                "recent_commits": walked.get("subjects", []),
+                "diffstat": None}
+
+    cache_path = os.path.join(repo_root, '.claude', SNAPSHOT_FILE)
+    snapshots = load_snapshots(cache_path)
+    snap = snapshots.get(branch)
+    if not (isinstance(snap, dict) and snap.get('base') == base and snap.get('base_sha') == base_sha):
+        snap = None
+
+    if snap and snap.get('head') == head:
+        return snap
+    if not has_budget():
+        return partial_progress(base, snap)
+
+    walked = None
+    if snap:
+        walked = walk_log([head, f'^{base_sha}', f'^{snap["head"]}'], boundary=True)
+        if walked and walked["count"] and snap["head"] in walked["boundary"]:
+            snap = {
+                "base": base,
+                "base_sha": base_sha,
+                "head": head,
+                "commit_count": snap["commit_count"] + walked["count"],
+                "recent_commits": (walked["subjects"] + snap["recent_commits"])[:RECENT_COUNT],
+                "diffstat": {
+                    "files": snap["diffstat"]["files"] + walked["files"],
+                    "insertions": snap["diffstat"]["insertions"] + walked["insertions"],
+                    "deletions": snap["diffstat"]["deletions"] + walked["deletions"],
+                },
+            }
+        else:
+            walked = None
+
+    if walked is None:
+        walked = walk_log([head, f'^{base_sha}'])
+        if walked is None:
+            if not has_budget(0):
+                return partial_progress(base, snap)
+            return {"base": base, "commit_count": 0, "recent_commits": [], "diffstat": None}
+        snap = {
+            "base": base,
+            "base_sha": base_sha,
+            "head": head,
+            "commit_count": walked["count"],
+            "recent_commits": walked["subjects"],
+            "diffstat": {"files": walked["files"], "insertions": walked["insertions"],
+                         "deletions": walked["deletions"]},
+        }
+
+    snap["updated"] = int(time.time())
+    snapshots[branch] = snap
+    save_snapshots(cache_path, snapshots)
+    return snap
+
+
+def queue_progress(repo_root: str, issue_id: str, progress: dict, note: str) -> bool:
+    """Queue the progress note in the outbox; False when there is nothing
+    worth posting or the outbox cannot be written."""
+    if progress.get("partial") or not progress.get("commit_count"):
+        return False
+    from _outbox import Outbox
+    head = progress.get("head") or progress["commit_count"]
     try:
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError:
-        input_data = {}
+        Outbox(os.path.join(repo_root, '.claude')).add(
+            issue_id, f"progress:{issue_id}:{head}", note=note, kind='progress')
+    except OSError:
+        return False
+    return True
 
+
+def check(ctx: HookContext) -> int:
+    """Emit a sync_to_linear instruction for the current Linear branch."""
     # Skip if not a Linear-active project
-    if not is_linear_project():
-        sys.exit(0)
+    if not ctx.linear_active:
+        return 0
 
     # Get current branch
-    branch = get_current_branch()
+    branch = ctx.branch
     if not branch:
-        sys.exit(0)
+        return 0
 
     # Extract Linear issue ID
     issue_id = extract_linear_id(branch)
     if not issue_id:
         # Not on a Linear branch, skip sync
-        sys.exit(0)
+        return 0
 
     # Gather progress info
-    commit_count = get_commit_count()
-    recent_commits = get_recent_commits(5)
+    progress = get_progress(ctx.repo_root or os.getcwd(), branch)
+    commit_count = progress["commit_count"]
+    recent_commits = progress["recent_commits"]
+    diffstat = progress["diffstat"]
+    partial = progress.get("partial", False)
+    changes = ""
+    if diffstat:
+        changes = f"Changes: +{diffstat['insertions']} -{diffstat['deletions']} lines\n"
+    commits = str(commit_count)
+    if commit_count is None:
+        commits = "unknown (git took too long; check `git log`)"
+    elif partial:
+        commits += " (from an older snapshot; git took too long)"
+
+    recent = "\n".join(f"  - {c}" for c in recent_commits if c)
+    queued = queue_progress(
+        ctx.repo_root or os.getcwd(), issue_id, progress,
+        f"**Progress** on `{branch}`: {commits} commits\n" + changes
+        + (f"Recent work:\n{recent}" if recent else ""))
+    if queued:
+        header = f"Before context compaction, queued progress for Linear issue {issue_id}.\n"
+        advice = (f"The progress note is queued in the Linear outbox and is posted with the "
+                  f"next flush for {issue_id} (/yux-linear-pr, the merge, or "
+                  f"`linear_outbox.py flush`); no comment is needed now.")
+    else:
+        header = f"Before context compaction, consider syncing progress to Linear issue {issue_id}.\n"
+        advice = ("Use mcp__linear__create_comment to post a progress summary "
+                  "if significant work was done.")
 
     # Output instruction for Claude
     output = {
         "action": "sync_to_linear",
         "issue_id": issue_id,
         "branch": branch,
+        "base_branch": progress["base"],
         "commit_count": commit_count,
         "recent_commits": recent_commits,
+        "diffstat": diffstat,
+        "partial": partial,
+        "queued": queued,
         "instruction": (
-            f"Before context compaction, consider syncing progress to Linear issue {issue_id}.\n"
+            header +
             f"Branch: {branch}\n"
-            f"Commits: {commit_count}\n"
-            f"Recent work:\n" + "\n".join(f"  - {c}" for c in recent_commits if c) + "\n\n"
-            f"Use mcp__linear__create_comment to post a progress summary if significant work was done."
+            f"Commits: {commits}\n"
+            + changes +
+            f"Recent work:\n{recent}\n\n"
+            + advice
         )
     }
 
     print(json.dumps(output, indent=2))
-    sys.exit(0)
+    return 0
+
+
+def main():
+    sys.exit(check(HookContext('PreCompact')))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Classify Triage inbox issues and flag likely duplicates of mirrored issues.
+
+Usage:
+  triage_issues.py check <FILE|-> [--threshold 0.5] [--limit 3] [--include-done]
+  triage_issues.py similar <TEXT> [--description TEXT] [--threshold 0.5] [--limit 5]
+  triage_issues.py rebuild
+  triage_issues.py stats
+
+`check` reads an inbox dump (the result of
+`mcp__linear__list_issues(state: "Triage")`) and prints, per issue, the
+keyword-detected type and the mirrored issues it most likely duplicates,
+by estimated text similarity (MinHash, see _dup_index.py). Candidates come
+from the local mirror (.claude/linear-mirror.db), which linear_mirror.py
+ingest/sync keeps indexed; done issues are skipped unless --include-done.
+`rebuild` re-indexes every mirrored issue. All commands accept --json and
+--root (main repo root, default: detected from cwd) before the command name.
+
+Exit codes:
+  0 - Success
+  1 - Input could not be read
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from _dup_index import DEFAULT_THRESHOLD
+from _issue_mirror import open_mirror
+from _issue_scoring import load_issues
+from _issue_triage import triage
+
+
+def print_json(data) -> None:
+    print(json.dumps(data, indent=2, ensure_ascii=False))
+
+
+def print_duplicates(duplicates: list[dict], indent: str = '  ') -> None:
+    for dup in duplicates:
+        done = ' (done)' if dup['done'] else ''
+        print(f"{indent}~{dup['similarity']:.0%}  {dup['key']:<9s} {dup['title'][:60]}{done}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Inbox type detection and duplicate lookup")
+    parser.add_argument('--root', help="main repo root (default: detected from cwd)")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def lookup_options(p, limit: int):
+        p.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                       help=f"minimum estimated similarity (default {DEFAULT_THRESHOLD})")
+        p.add_argument('--limit', type=int, default=limit, help="candidates per issue")
+        p.add_argument('--include-done', action='store_true',
+                       help="also match completed and canceled issues")
+
+    p = sub.add_parser('check', help="classify inbox issues and flag duplicates")
+    p.add_argument('file', help="list_issues result ('-' for stdin)")
+    lookup_options(p, 3)
+
+    p = sub.add_parser('similar', help="mirrored issues similar to a text")
+    p.add_argument('text', help="title or summary to look up")
+    p.add_argument('--description', default='')
+    lookup_options(p, 5)
+
+    sub.add_parser('rebuild', help="re-index every mirrored issue")
+    sub.add_parser('stats', help="indexed issue counts")
+    return parser
+
+
+def run(args) -> int:
+    mirror = open_mirror(args.root)
+    command = args.command
+
+    if command == 'check':
+        try:
+            if args.file == '-':
+                data = json.load(sys.stdin)
+            else:
+                with open(args.file) as f:
+                    data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[yux-linear] cannot read {args.file}: {e}", file=sys.stderr)
+            return 1
+        if not mirror.dups.stats()['indexed']:
+            print("[yux-linear] duplicate index is empty; ingest the backlog with "
+                  "linear_mirror.py first", file=sys.stderr)
+        rows = triage(load_issues(data), mirror.dups, threshold=args.threshold,
+                      limit=args.limit, include_done=args.include_done)
+        if args.json:
+            print_json(rows)
+            return 0
+        for row in rows:
+            print(f"{row['key'] or '?':<9s} [{row['type'] or '?'}] {row['title'][:60]}")
+            print_duplicates(row['duplicates'], indent='    possible duplicate ')
+    elif command == 'similar':
+        matches = mirror.dups.similar(args.text, args.description, threshold=args.threshold,
+                                      limit=args.limit, include_done=args.include_done)
+        if args.json:
+            print_json(matches)
+        elif matches:
+            print_duplicates(matches)
+        else:
+            print("No similar issues.")
+    elif command == 'rebuild':
+        mirror.rebuild_dups()
+        stats = mirror.dups.stats()
+        print(f"Indexed {stats['indexed']} issues ({stats['open']} open)")
+    elif command == 'stats':
+        print_json(mirror.dups.stats())
+    return 0
+
+
+def main():
+    sys.exit(run(build_parser().parse_args()))
+
+
+if __name__ == "__main__":
+    main()
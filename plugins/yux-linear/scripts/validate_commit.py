@@ -6,18 +6,30 @@ Supports two formats:
 1. Standard: <type>(<scope>): <description>
 2. Extended: <emoji> <type>(<scope>): <subject (中文支持)>
 
+As a hook it checks the subject of every `git commit` in a Bash command
+(its -m message, or the file given with -F), split with _shell_tokens.
+Run directly with a range, it checks existing history instead:
+
+  validate_commit.py --range main..HEAD
+  validate_commit.py --all [--jobs N] [--batch-size N]
+
+History mode streams `git log -z` subjects and validates them in batches
+(across N worker processes with --jobs), so memory stays bounded on very
+long histories. Violations are printed as they are found, followed by a
+summary.
+
 Exit codes:
-  0 - Allow operation
-  2 - Block operation (invalid commit message)
+  0 - Allow operation / history is clean
+  1 - History mode: invalid subjects found
+  2 - Block operation (invalid commit message); history mode: git failed
 """
 
-import json
 import os
 import re
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from _linear_guard import is_linear_project
+from _hook_context import HookContext
 
 # Emoji mapping for commit types
 VALID_EMOJIS = ['✨', '🐛', '📝', '💄', '♻️', '⚡️', '✅', '📦', '👷', '🔧']
@@ -33,42 +45,59 @@ COMMIT_PATTERN = re.compile(
     re.UNICODE
 )
 
-# Pattern to extract commit message from git commit command
-COMMIT_MSG_PATTERNS = [
-    r'-m\s+"([^"]+)"',      # -m "message"
-    r"-m\s+'([^']+)'",      # -m 'message'
-    r'-m\s+([^\s]+)',       # -m message (no quotes, single word)
-]
-
-# Pattern for HEREDOC format: -m "$(cat <<'EOF' ... EOF )"
-HEREDOC_PATTERN = re.compile(
-    r'-m\s+"\$\(cat\s+<<[\'"]?EOF[\'"]?\s*\n(.*?)\nEOF\s*\)"',
-    re.DOTALL
-)
+# Bytes of a -F message file read for its subject line
+MESSAGE_FILE_HEAD = 4096
+
+
+def read_subject_file(path: str, cwd: str | None) -> str | None:
+    """Subject of a `git commit -F` file that already exists (not stdin)."""
+    if path == '-':
+        return None
+    try:
+        with open(os.path.join(cwd or '.', path), encoding='utf-8', errors='replace') as f:
+            return f.read(MESSAGE_FILE_HEAD)
+    except OSError:
+        return None
+
+
+def extract_commit_messages(command: str, cwd: str | None = None) -> list[str]:
+    """Subject of every `git commit` in the command that names its message.
+
+    The command is split by _shell_tokens, so quoting, `&&` chains, `git -C`
+    and -m "$(cat <<'EOF' ... EOF)" heredocs are handled; a message given
+    with -F is read from the file. Commits using the editor are skipped.
+    """
+    from _shell_tokens import commit_args, git_call, split_commands
+    subjects = []
+    for seg in split_commands(command):
+        args = commit_args(seg)
+        if args is None:
+            continue
+        messages, files = args
+        if messages:
+            text = messages[0]
+        elif files:
+            directory = git_call(seg)[2]
+            if directory and not os.path.isabs(directory):
+                directory = os.path.join(cwd or '.', directory)
+            text = read_subject_file(files[0], directory or cwd)
+        else:
+            continue
+        subject = (text or '').strip().split('\n')[0]
+        if subject:
+            subjects.append(subject)
+    return subjects
 
 
 def extract_commit_message(command: str) -> str | None:
-    """Extract commit message from git commit command."""
-    # Try HEREDOC format first
-    heredoc_match = HEREDOC_PATTERN.search(command)
-    if heredoc_match:
-        # Return only the first line (subject) for validation
-        full_message = heredoc_match.group(1).strip()
-        return full_message.split('\n')[0]
-
-    # Try standard patterns
-    for pattern in COMMIT_MSG_PATTERNS:
-        match = re.search(pattern, command)
-        if match:
-            return match.group(1)
-    return None
+    """Subject of the first git commit in the command."""
+    subjects = extract_commit_messages(command)
+    return subjects[0] if subjects else None
 
 
 def is_git_commit_command(command: str) -> bool:
-    """Check if command is a git commit."""
-    # Normalize whitespace
-    cmd = ' '.join(command.split())
-    return 'git commit' in cmd and '-m' in cmd
+    """Check if command is a git commit (cheap pre-filter, before tokenizing)."""
+    return 'git' in command and 'commit' in command
 
 
 def validate_commit_message(message: str) -> tuple[bool, str]:
@@ -96,45 +125,161 @@ def validate_commit_message(message: str) -> tuple[bool, str]:
     return True, ""
 
 
-def main():
-    # Read input from stdin
-    try:
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError:
-        # If no valid JSON, allow operation
-        sys.exit(0)
-
+def check(ctx: HookContext) -> int:
+    """Block git commits whose message is not Conventional Commits."""
     # Skip if not a Linear-active project
-    if not is_linear_project():
-        sys.exit(0)
+    if not ctx.linear_active:
+        return 0
 
-    tool_name = input_data.get("tool_name", "")
+    # If no valid JSON, allow operation
+    if ctx.payload is None:
+        return 0
 
     # Only validate Bash commands
-    if tool_name != "Bash":
-        sys.exit(0)
+    if ctx.tool_name != "Bash":
+        return 0
 
-    command = input_data.get("tool_input", {}).get("command", "")
+    command = ctx.payload.get("tool_input", {}).get("command", "")
 
     # Check if it's a git commit command
     if not is_git_commit_command(command):
-        sys.exit(0)
+        return 0
 
-    # Extract commit message
-    message = extract_commit_message(command)
-    if not message:
-        # Can't extract message (might be using -F or editor)
-        sys.exit(0)
+    # Validate every commit whose message can be extracted (editor commits
+    # and `-F -` cannot be checked here). Tokenizing is linear but a
+    # megabyte command still takes seconds: past the hook's budget the
+    # alarm raises DeadlineExceeded and the commit is let through
+    from _proc import alarm
+    with alarm():
+        messages = extract_commit_messages(command, ctx.payload.get("cwd"))
+    for message in messages:
+        is_valid, error_msg = validate_commit_message(message)
+        if not is_valid:
+            print(f"❌ {error_msg}", file=sys.stderr)
+            return 2
 
-    # Validate message format
-    is_valid, error_msg = validate_commit_message(message)
+    # Valid commit message
+    return 0
 
-    if not is_valid:
-        print(f"❌ {error_msg}", file=sys.stderr)
-        sys.exit(2)
 
-    # Valid commit message
-    sys.exit(0)
+def iter_log_subjects(rev_args: list[str], chunk_size: int = 1 << 16):
+    """Yield (short sha, subject) from `git log -z`, reading in fixed chunks."""
+    import subprocess
+    from _proc import popen
+    proc = popen(
+        ['git', 'log', '-z', '--no-color', '--format=%h%x1f%s', *rev_args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    pending = b''
+    try:
+        while True:
+            chunk = proc.stdout.read(chunk_size)
+            if not chunk:
+                break
+            records = (pending + chunk).split(b'\0')
+            pending = records.pop()
+            for record in records:
+                sha, _, subject = record.decode('utf-8', 'replace').partition('\x1f')
+                yield sha, subject
+        if pending:
+            sha, _, subject = pending.decode('utf-8', 'replace').partition('\x1f')
+            yield sha, subject
+    finally:
+        proc.stdout.close()
+        err = proc.stderr.read().decode('utf-8', 'replace')
+        proc.stderr.close()
+        if proc.wait() != 0:
+            raise RuntimeError(err.strip() or f"git log exited with {proc.returncode}")
+
+
+def iter_batches(records, size: int):
+    """Group an iterable into lists of at most size items."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def validate_batch(batch: list[tuple[str, str]]) -> tuple[int, list[tuple[str, str]]]:
+    """Return (count, invalid records) for one batch of (sha, subject)."""
+    invalid = [(sha, subject) for sha, subject in batch
+               if not validate_commit_message(subject)[0]]
+    return len(batch), invalid
+
+
+def iter_results(batches, jobs: int):
+    """Validate batches in order, with at most 2*jobs batches in flight."""
+    if jobs <= 1:
+        for batch in batches:
+            yield validate_batch(batch)
+        return
+
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        in_flight = deque()
+        for batch in batches:
+            in_flight.append(pool.submit(validate_batch, batch))
+            if len(in_flight) >= 2 * jobs:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def validate_history(rev_args: list[str], jobs: int = 1, batch_size: int = 5000) -> int:
+    """Check every subject in a revision range; print violations and a summary."""
+    checked = violations = 0
+    try:
+        batches = iter_batches(iter_log_subjects(rev_args), batch_size)
+        for count, invalid in iter_results(batches, jobs):
+            checked += count
+            for sha, subject in invalid:
+                violations += 1
+                print(f"{sha}  {subject}")
+            if invalid:
+                sys.stdout.flush()
+    except RuntimeError as e:
+        print(f"❌ git log failed: {e}", file=sys.stderr)
+        return 2
+
+    if violations:
+        print(f"\n❌ {violations} of {checked} commits do not follow Conventional Commits",
+              file=sys.stderr)
+        print("Expected: [emoji] <type>(<scope>): <description>", file=sys.stderr)
+        return 1
+    print(f"✅ {checked} commits checked, all follow Conventional Commits", file=sys.stderr)
+    return 0
+
+
+def parse_history_args(argv: list[str]):
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Validate commit subjects in existing history")
+    scope = parser.add_mutually_exclusive_group(required=True)
+    scope.add_argument('--range', dest='rev_range', help="revision range, e.g. main..HEAD")
+    scope.add_argument('--all', action='store_true', help="every commit reachable from any ref")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="worker processes (0 = one per CPU, default 1)")
+    parser.add_argument('--batch-size', type=int, default=5000,
+                        help="subjects per validation batch (default 5000)")
+    args = parser.parse_args(argv)
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    args.batch_size = max(1, args.batch_size)
+    return args
+
+
+def main():
+    if len(sys.argv) > 1:
+        args = parse_history_args(sys.argv[1:])
+        rev_args = ['--all'] if args.all else [args.rev_range]
+        sys.exit(validate_history(rev_args, args.jobs, args.batch_size))
+    sys.exit(check(HookContext('PreToolUse')))
 
 
 if __name__ == "__main__":
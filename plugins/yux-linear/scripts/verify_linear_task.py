@@ -6,85 +6,179 @@ This hook runs on UserPromptSubmit to detect if:
 1. The current branch is a Linear branch (contains LIN-xxx)
 2. Display branch context and suggest Linear API lookup
 
+The block is printed only when it changed for the session: per
+`session_id` a small state file in the runtime dir remembers the branch,
+the (mtime, size) stamps of the registry and config files, and a checksum
+of the last block. An unchanged prompt costs a few stat calls and one
+small read; a registry write re-renders the block, which is printed only if
+its checksum differs. PreCompact forgets the session (forget()), so the
+block comes back after compaction. Without a session_id it is printed
+every time.
+
 Exit codes:
   0 - Always (informational only, never blocks)
 """
 
 import os
-import re
-import subprocess
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from _linear_guard import is_linear_project
+from _hook_context import HookContext
+from _linear_guard import linear_id_re
+from _proc import has_budget
+from _runtime import repo_key, runtime_dir
+
+# Files whose changes can change the block (registry backends + backend choice)
+WATCHED_FILES = ('linear-tasks.json', 'linear-tasks.db', 'linear-tasks.db-wal',
+                 'linear-config.json')
+STATE_PREFIX = 'prompt-'
+STATE_TTL = 7 * 86400
+
+
+def extract_linear_id(branch: str) -> str | None:
+    """Extract Linear issue ID from branch name (e.g., LIN-123)."""
+    match = linear_id_re().search(branch)
+    return match.group(0).upper() if match else None
+
 
+def state_path(repo_root: str, session_id: str | None) -> str | None:
+    """Per-session state file, None without a usable session id."""
+    session = ''.join(c for c in (session_id or '') if c.isalnum() or c in '-_')[:64]
+    if not session:
+        return None
+    return os.path.join(runtime_dir(), f'{STATE_PREFIX}{repo_key(repo_root)}-{session}')
 
-def get_current_branch() -> str | None:
-    """Get the current git branch name."""
+
+def context_stamp(repo_root: str, branch: str) -> str:
+    """Branch plus the stamps of every file the block is rendered from."""
+    parts = [branch]
+    claude_dir = os.path.join(repo_root, '.claude')
+    for name in WATCHED_FILES:
+        try:
+            st = os.stat(os.path.join(claude_dir, name))
+            parts.append(f'{st.st_mtime_ns}:{st.st_size}')
+        except OSError:
+            parts.append('-')
+    return ' '.join(parts)
+
+
+def read_state(path: str) -> tuple[str, str] | None:
+    """(stamp, checksum) stored for the session."""
     try:
-        result = subprocess.run(
-            ['git', 'branch', '--show-current'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+        with open(path, encoding='utf-8', errors='replace') as f:
+            stamp, _, checksum = f.read().partition('\n')
+    except OSError:
+        return None
+    return stamp, checksum.strip()
+
+
+def write_state(path: str, stamp: str, checksum: str, is_new: bool) -> None:
+    if is_new:
+        prune_states(os.path.dirname(path))
+    try:
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(f'{stamp}\n{checksum}\n')
+        os.replace(tmp, path)
+    except OSError:
         pass
-    return None
 
 
-def extract_linear_id(branch: str) -> str | None:
-    """Extract Linear issue ID from branch name (e.g., LIN-123)."""
-    match = re.search(r'(LIN-\d+)', branch, re.IGNORECASE)
-    return match.group(1).upper() if match else None
+def prune_states(directory: str) -> None:
+    """Drop state files of sessions idle for STATE_TTL (once per new session)."""
+    import time
+    cutoff = time.time() - STATE_TTL
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith(STATE_PREFIX) and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+    except OSError:
+        pass
 
 
-def main():
+def checksum(text: str) -> str:
+    import zlib
+    data = text.encode('utf-8', 'surrogateescape')
+    return f'{zlib.crc32(data):08x}{zlib.adler32(data):08x}'
+
+
+def render(repo_root: str, branch: str, linear_id: str) -> tuple[str, bool]:
+    """The context block, and whether it is complete (not cut for time)."""
+    lines = [
+        "[Linear Branch Detected]",
+        f"Branch: {branch}",
+        f"Issue:  {linear_id}",
+    ]
+
+    # Show multi-task context if available (the first extra to go when the
+    # hook is short of time)
+    from _task_registry import open_registry
+    registry = open_registry(repo_root)
+    complete = has_budget()
+    if complete and any(os.path.isfile(path) for path in registry.storage_paths()):
+        tasks = registry.tasks()
+        if len(tasks) > 1:
+            lines.append("")
+            lines.append(f"[{len(tasks)} Active Tasks]")
+            for tid, task in tasks.items():
+                pr_info = f"  PR #{task['pr_number']}" if task.get('pr_number') else ""
+                lines.append(f"  {tid}  {task.get('branch', '?'):<40s} "
+                             f"{task.get('linear_status', '?')}{pr_info}")
+    else:
+        lines.append("")
+        lines.append(f"To load full context: mcp__linear__get_issue(id: \"{linear_id}\")")
+    return '\n'.join(lines) + '\n', complete
+
+
+def check(ctx: HookContext) -> int:
+    """Print Linear branch context (and other active tasks) when it changed."""
     # Skip if not a Linear-active project
-    if not is_linear_project():
-        sys.exit(0)
+    if not ctx.linear_active:
+        return 0
 
     # Get current branch
-    branch = get_current_branch()
+    branch = ctx.branch
     if not branch:
-        sys.exit(0)
+        return 0
 
     # Check if this is a Linear branch
     linear_id = extract_linear_id(branch)
     if not linear_id:
-        sys.exit(0)
-
-    # Output branch context and suggest Linear API lookup
-    print(f"[Linear Branch Detected]")
-    print(f"Branch: {branch}")
-    print(f"Issue:  {linear_id}")
-
-    # Show multi-task context if available
-    from _linear_guard import get_main_repo_root
-    repo_root = get_main_repo_root()
-    config_base = repo_root if repo_root else os.getcwd()
-    tasks_file = os.path.join(str(config_base), '.claude', 'linear-tasks.json')
-    if os.path.isfile(tasks_file):
-        import json
+        return 0
+
+    repo_root = ctx.repo_root or os.getcwd()
+    path = state_path(repo_root, ctx.session_id)
+    stamp = context_stamp(repo_root, branch) if path else None
+    state = read_state(path) if path else None
+    if state and state[0] == stamp:
+        return 0
+
+    text, complete = render(repo_root, branch, linear_id)
+    digest = checksum(text)
+    if path and complete:
+        write_state(path, stamp, digest, is_new=state is None)
+    if state and state[1] == digest:
+        return 0
+    sys.stdout.write(text)
+    return 0
+
+
+def forget(ctx: HookContext) -> int:
+    """PreCompact: drop the session's state so the next prompt shows the block."""
+    if not ctx.linear_active:
+        return 0
+    path = state_path(ctx.repo_root or os.getcwd(), ctx.session_id)
+    if path:
         try:
-            with open(tasks_file) as f:
-                data = json.load(f)
-            tasks = data.get('tasks', {})
-            if len(tasks) > 1:
-                print()
-                print(f"[{len(tasks)} Active Tasks]")
-                for tid, task in tasks.items():
-                    pr_info = f"  PR #{task['pr_number']}" if task.get('pr_number') else ""
-                    print(f"  {tid}  {task.get('branch', '?'):<40s} {task.get('linear_status', '?')}{pr_info}")
-        except (json.JSONDecodeError, KeyError):
+            os.unlink(path)
+        except OSError:
             pass
-    else:
-        print(f"")
-        print(f"To load full context: mcp__linear__get_issue(id: \"{linear_id}\")")
+    return 0
+
 
-    sys.exit(0)
+def main():
+    sys.exit(check(HookContext('UserPromptSubmit', fields={'session_id': None})))
 
 
 if __name__ == "__main__":